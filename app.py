@@ -1,15 +1,57 @@
 import os
+import re
+import copy
 import json
+import asyncio
+import time
+import base64
+import hashlib
+from contextlib import asynccontextmanager
 from datetime import date, timedelta
-from typing import Any, Dict, List
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
 
+import httpx
 import uvicorn
-import requests
 from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse, JSONResponse
-from openai import OpenAI
+from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
+from openai import APIConnectionError, AsyncOpenAI, InternalServerError, RateLimitError
 from dotenv import load_dotenv
 
+from cache import ResultCache, TranslationCache, canonical_arguments
+from fanout import fetch_all_pages, iter_shard_results, shard_arguments
+from mcp_stream import iter_mcp_items
+from metrics import (
+    CONTENT_TYPE as METRICS_CONTENT_TYPE,
+    MetricsMiddleware,
+    Registry,
+    Stage,
+    Stopwatch,
+    request_timings,
+    server_timing_header,
+    timed_aiter,
+)
+from profiling import ProfileStore, is_admin, profiled, profiled_chunks, wants_profile
+from query_parser import parse_query
+from resilience import (
+    CircuitBreaker,
+    CircuitOpen,
+    DeadlineExceeded,
+    Hedger,
+    RetryPolicy,
+    UpstreamHTTPError,
+    call_timeout,
+    deadline_aiter,
+    deadline_scope,
+    is_transient_http_error,
+)
+from responses import json_response
+from singleflight import FlightAbandoned, SingleFlight
+from sync_worker import SyncWorker
+from tender_batch import TenderBatch
+from tender_index import ResultSetRegistry, tender_iso_date
+from tender_store import TenderStore
+from turkish import ascii_fold, normalize_query_text
+
 # --- ENV YÜKLE ---
 load_dotenv()
 
@@ -18,42 +60,286 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 if not OPENAI_API_KEY:
     raise RuntimeError("OPENAI_API_KEY env değişkeni bulunamadı. .env dosyasını kontrol et.")
 
-MCP_URL = "https://ihalemcp.fastmcp.app/mcp"
+# Yük testinde loadtest/ altındaki yerel taklit sunuculara yönlendirilebilir
+MCP_URL = os.getenv("MCP_URL", "https://ihalemcp.fastmcp.app/mcp")
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
 MCP_TOOL_NAME = "search_tenders"
+MCP_TIMEOUT = float(os.getenv("MCP_TIMEOUT", "30"))
+MCP_MAX_CONNECTIONS = int(os.getenv("MCP_MAX_CONNECTIONS", "100"))
+TRANSLATION_CACHE_SIZE = int(os.getenv("TRANSLATION_CACHE_SIZE", "512"))
+MCP_PAGE_SIZE = int(os.getenv("MCP_PAGE_SIZE", "100"))
+MCP_MAX_LIMIT = 2000
+STREAM_CHUNK_SIZE = int(os.getenv("STREAM_CHUNK_SIZE", "50"))
+# fanout: true ile geniş aramalar parçalara bölünüp paralel çalıştırılır
+FANOUT_MAX_SHARDS = int(os.getenv("FANOUT_MAX_SHARDS", "8"))
+FANOUT_CONCURRENCY = int(os.getenv("FANOUT_CONCURRENCY", "4"))
+# Parça başına okunacak en fazla MCP_MAX_LIMIT'lik sayfa; aşılırsa truncated_shards artar
+FANOUT_MAX_PAGES = int(os.getenv("FANOUT_MAX_PAGES", "10"))
+RESULT_SETS_MAX = int(os.getenv("RESULT_SETS_MAX", "32"))
+MCP_CACHE_TTL = float(os.getenv("MCP_CACHE_TTL", "300"))
+MCP_CACHE_STALE_GRACE = float(os.getenv("MCP_CACHE_STALE_GRACE", "600"))
+MCP_CACHE_MAX_BYTES = int(os.getenv("MCP_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+# Verilirse MCP ve EKAP sonuçları bu SQLite dosyasında birleştirilir
+TENDER_DB_PATH = os.getenv("TENDER_DB_PATH")
+# Depo açıkken arka plan senkronizasyonu (saniye; 0 kapalı)
+SYNC_INTERVAL = float(os.getenv("SYNC_INTERVAL", "0"))
+SYNC_WINDOW_DAYS = int(os.getenv("SYNC_WINDOW_DAYS", "7"))
+# Kapsanan bir tarih aralığı bu kadar saniye yerelden cevaplanır; sonra yeniden MCP'ye gidilir
+COVERAGE_TTL = float(os.getenv("COVERAGE_TTL", str(max(600.0, 2 * SYNC_INTERVAL))))
+# Uçtan uca istek bütçesi (saniye; 0 sınırsız); MCP ve LLM zaman aşımları bununla kısılır
+REQUEST_DEADLINE = float(os.getenv("REQUEST_DEADLINE", "45"))
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "20"))
+UPSTREAM_RETRIES = int(os.getenv("UPSTREAM_RETRIES", "3"))
+RETRY_BASE_DELAY = float(os.getenv("RETRY_BASE_DELAY", "0.2"))
+RETRY_MAX_DELAY = float(os.getenv("RETRY_MAX_DELAY", "2"))
+# 1 ise yavaş kalan MCP aramaları son çağrıların p95 süresinden sonra ikinci kez gönderilir
+# (akış yolunda ilk ihale gelene kadar; sonrasında tek akış devam eder)
+MCP_HEDGE = os.getenv("MCP_HEDGE", "0") == "1"
+BREAKER_FAILURES = int(os.getenv("BREAKER_FAILURES", "5"))
+BREAKER_RESET = float(os.getenv("BREAKER_RESET", "30"))
+# Tanımlıysa bu token'la gelen "X-Profile: 1" istekleri cProfile ile profillenir
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+# Tekrar denemeleri llm_retry yönetir
+client = AsyncOpenAI(api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL, max_retries=0)
+
+# MCP için uzun ömürlü, bağlantı havuzlu HTTP client (lifespan içinde açılır/kapanır)
+mcp_http: Optional[httpx.AsyncClient] = None
+
+
+def create_mcp_http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=MCP_TIMEOUT,
+        limits=httpx.Limits(
+            max_connections=MCP_MAX_CONNECTIONS,
+            max_keepalive_connections=MCP_MAX_CONNECTIONS,
+        ),
+        headers={
+            "Content-Type": "application/json",
+            "Accept": "application/json, text/event-stream",
+        },
+    )
 
-client = OpenAI(api_key=OPENAI_API_KEY)
 
-app = FastAPI()
+def get_mcp_http() -> httpx.AsyncClient:
+    # Lifespan çalışmadan kullanılırsa (script, benchmark) tembel oluştur
+    global mcp_http
+    if mcp_http is None:
+        mcp_http = create_mcp_http_client()
+    return mcp_http
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global mcp_http, sync_worker
+    mcp_http = create_mcp_http_client()
+    if tender_store is not None and SYNC_INTERVAL > 0:
+        sync_worker = SyncWorker(
+            tender_store,
+            fetch_mcp_page,
+            normalize_sync_arguments,
+            interval=SYNC_INTERVAL,
+            window_days=SYNC_WINDOW_DAYS,
+            page_size=MCP_PAGE_SIZE,
+        )
+        sync_worker.start()
+    try:
+        yield
+    finally:
+        if sync_worker is not None:
+            await sync_worker.stop()
+            sync_worker = None
+        await mcp_http.aclose()
+        mcp_http = None
+
+
+app = FastAPI(lifespan=lifespan)
+
+translation_cache = TranslationCache(maxsize=TRANSLATION_CACHE_SIZE)
+result_cache = ResultCache(
+    ttl=MCP_CACHE_TTL,
+    stale_grace=MCP_CACHE_STALE_GRACE,
+    max_bytes=MCP_CACHE_MAX_BYTES,
+)
+
+# /api/filter için sorgu başına getirilmiş sayfaların birleşimi ve indeksleri
+result_sets = ResultSetRegistry(max_sets=RESULT_SETS_MAX)
+
+# Kapsanan tarih aralıkları için MCP'ye gitmeden cevap veren yerel depo (opsiyonel)
+tender_store: Optional[TenderStore] = TenderStore(TENDER_DB_PATH) if TENDER_DB_PATH else None
+sync_worker: Optional[SyncWorker] = None
+
+# Aynı anda gelen aynı sorgular tek bir LLM / MCP çağrısını paylaşır
+translation_flight = SingleFlight()
+mcp_flight = SingleFlight()
+
+
+def is_transient_llm_error(exc: BaseException) -> bool:
+    if isinstance(exc, (APIConnectionError, RateLimitError, InternalServerError)):
+        return True
+    return is_transient_http_error(exc)
+
+
+# Upstream sağlığı: tekrar politikaları, devre kesiciler ve MCP hedge
+mcp_breaker = CircuitBreaker("MCP", BREAKER_FAILURES, BREAKER_RESET)
+llm_breaker = CircuitBreaker("OpenAI", BREAKER_FAILURES, BREAKER_RESET)
+mcp_retry = RetryPolicy(UPSTREAM_RETRIES, RETRY_BASE_DELAY, RETRY_MAX_DELAY)
+llm_retry = RetryPolicy(UPSTREAM_RETRIES, RETRY_BASE_DELAY, RETRY_MAX_DELAY, retry_if=is_transient_llm_error)
+mcp_hedger = Hedger()
+# Akışlarda örnekler ilk ihaleye kadar geçen süredir; tam sayfa süreleriyle karışmasın diye ayrı
+mcp_stream_hedger = Hedger()
+# Upstream hatası yerine cache'ten sunulan eski sonuçlar
+degraded = {"stale_served": 0}
+
+# Sorguların hangi yoldan çözüldüğü: kural tabanlı parser, cache veya LLM
+translation_sources = {"rule": 0, "cache": 0, "llm": 0}
+
+# /metrics: aşama süreleri, sonuç boyutları, hatalar ve uçuştaki istekler
+metrics_registry = Registry()
+stage_seconds = metrics_registry.histogram("ihale_stage_seconds", "Arama aşamalarının süresi (saniye)", ["stage"])
+# İlk argüman Server-Timing'deki kısa addır
+STAGE_LLM = Stage("llm", stage_seconds.labels("llm_translation"))
+STAGE_MCP = Stage("mcp", stage_seconds.labels("mcp_call"))
+STAGE_PARSE = Stage("parse", stage_seconds.labels("mcp_parse"))
+STAGE_NORMALIZE = Stage("normalize", stage_seconds.labels("normalize"))
+STAGE_SERIALIZE = Stage("serialize", stage_seconds.labels("serialize"))
+result_tenders = metrics_registry.histogram(
+    "ihale_result_tenders", "Cevap başına ihale sayısı", ["endpoint"],
+    buckets=(0, 1, 10, 50, 100, 250, 500, 1000, 2000, 5000),
+)
+RESULT_RUN = result_tenders.labels("run")
+RESULT_STREAM = result_tenders.labels("stream")
+RESULT_FANOUT = result_tenders.labels("fanout")
+RESULT_FILTER = result_tenders.labels("filter")
+errors_total = metrics_registry.counter("ihale_errors_total", "Hatalar (uç nokta ve hata türüne göre)", ["endpoint", "type"])
+http_in_flight = metrics_registry.gauge("ihale_http_requests_in_flight", "İşlenmekte olan HTTP istekleri")
+http_seconds = metrics_registry.histogram(
+    "ihale_http_request_seconds", "HTTP istek süresi, akışlarda son parçaya kadar (saniye)", ["method", "path", "status"],
+)
+metrics_registry.callback(
+    "ihale_cache_requests_total", "Cache erişimleri (sonuca göre)",
+    lambda: {
+        ("translation", "hit"): translation_cache.hits,
+        ("translation", "miss"): translation_cache.misses,
+        ("result", "hit"): result_cache.hits,
+        ("result", "stale"): result_cache.stale_hits,
+        ("result", "miss"): result_cache.misses,
+    },
+    ["cache", "result"], kind="counter",
+)
+metrics_registry.callback("ihale_result_cache_bytes", "Sonuç cache'inin tahmini boyutu", lambda: result_cache.total_bytes)
+metrics_registry.callback(
+    "ihale_translation_source_total", "Sorgu çözüm yolu", lambda: dict(translation_sources), ["source"], kind="counter",
+)
+metrics_registry.callback(
+    "ihale_singleflight_collapsed_total", "Uçuştaki eş çağrıya katılan istekler",
+    lambda: {"translation": translation_flight.collapsed, "mcp": mcp_flight.collapsed}, ["flight"], kind="counter",
+)
+metrics_registry.callback(
+    "ihale_upstream_calls_total", "Upstream çağrıları (tekrar denemeler hariç)",
+    lambda: {"mcp": mcp_retry.calls, "llm": llm_retry.calls}, ["upstream"], kind="counter",
+)
+metrics_registry.callback(
+    "ihale_upstream_retries_total", "Upstream tekrar denemeleri",
+    lambda: {"mcp": mcp_retry.retries, "llm": llm_retry.retries}, ["upstream"], kind="counter",
+)
+metrics_registry.callback(
+    "ihale_upstream_failures_total", "Tekrar denemelerine rağmen başarısız upstream çağrıları",
+    lambda: {"mcp": mcp_retry.failures, "llm": llm_retry.failures}, ["upstream"], kind="counter",
+)
+metrics_registry.callback(
+    "ihale_circuit_open", "Devre kesici açık mı (1) kapalı mı (0)",
+    lambda: {"mcp": int(mcp_breaker.state == "open"), "llm": int(llm_breaker.state == "open")}, ["upstream"],
+)
+metrics_registry.callback(
+    "ihale_stale_served_total", "Upstream hatası yerine sunulan eski sonuçlar",
+    lambda: degraded["stale_served"], kind="counter",
+)
+
+# Yönetici profilleri (bellekte, son 20)
+profile_store = ProfileStore()
+
+app.add_middleware(
+    MetricsMiddleware,
+    in_flight=http_in_flight,
+    duration=http_seconds,
+    paths=lambda: [route.path for route in app.routes],
+)
+
+
+# Bozuk metinde her çok baytlı UTF-8 karakteri, baş baytın (0xC2-0xF4) latin1 karşılığı ve
+# ardından bir devam baytı (0x80-0xBF) olarak görünür. Bu ikili yoksa encode("latin1")
+# .decode("utf-8") ya hata verir ya da metni aynen döndürür; yani kontrol kesindir.
+# Düzgün Türkçe metin ("Çeşitli", "Üsküdar") bu kalıba uymaz.
+_MOJIBAKE_HINT_RE = re.compile("[\u00c2-\u00f4][\u0080-\u00bf]")
 
 
 def fix_mojibake(text: str) -> str:
     if not isinstance(text, str):
         return text
+    # Temiz metin (yaygın durum) encode/decode ve exception maliyetine girmez
+    if text.isascii() or not _MOJIBAKE_HINT_RE.search(text):
+        return text
     try:
         return text.encode("latin1").decode("utf-8")
     except Exception:
         return text
 
 
-def normalize_tender_item(item: Dict[str, Any]) -> Dict[str, Any]:
+def _fixed_and_folded(text: str, memo: Dict[str, Any]) -> Any:
+    # İl, tür, durum, idare gibi tekrar eden değerler parti başına bir kez düzeltilip katlanır
+    entry = memo.get(text)
+    if entry is None:
+        fixed = fix_mojibake(text)
+        entry = memo[text] = (fixed, ascii_fold(fixed or ""))
+    return entry
+
+
+def normalize_tender_item(item: Dict[str, Any], memo: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    if memo is None:
+        memo = {}
+    name = fix_mojibake(item.get("name", ""))
+    tender_type, type_key = _fixed_and_folded(item.get("type", {}).get("description", ""), memo)
+    status, status_key = _fixed_and_folded(item.get("status", {}).get("description", ""), memo)
+    authority, authority_key = _fixed_and_folded(item.get("authority", ""), memo)
+    province, province_key = _fixed_and_folded(item.get("province", ""), memo)
+    name_key = ascii_fold(name or "")
+    ikn = item.get("ikn")
     return {
         "id": item.get("id"),
-        "ikn": item.get("ikn"),
-        "name": fix_mojibake(item.get("name", "")),
-        "type": fix_mojibake(item.get("type", {}).get("description", "")),
-        "status": fix_mojibake(item.get("status", {}).get("description", "")),
-        "authority": fix_mojibake(item.get("authority", "")),
-        "province": fix_mojibake(item.get("province", "")),
+        "ikn": ikn,
+        "name": name,
+        "type": tender_type,
+        "status": status,
+        "authority": authority,
+        "province": province,
         "tender_datetime": fix_mojibake(item.get("tender_datetime", "")),
         "document_url": item.get("document_url"),
+        # tender_search_keys ile aynı sonuç; katlanmış parçalar birleştirilir
+        "name_key": name_key,
+        "search_key": " ".join((ascii_fold(str(ikn or "")), name_key, type_key, status_key, authority_key, province_key)),
     }
 
 
+def normalize_tenders(items: List[Dict[str, Any]], memo: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    # Aynı sorgunun parçaları arasında memo paylaşılabilir
+    if memo is None:
+        memo = {}
+    t0 = time.perf_counter()
+    tenders = [normalize_tender_item(item, memo) for item in items]
+    STAGE_NORMALIZE.observe(time.perf_counter() - t0)
+    return tenders
+
+
+def count_error(endpoint: str, exc: BaseException) -> None:
+    errors_total.labels(endpoint, type(exc).__name__).inc()
+
+
 def get_today_str() -> str:
     return date.today().isoformat()
 
 
-def build_mcp_arguments_with_gpt(user_query: str) -> dict:
+async def build_mcp_arguments_with_gpt(user_query: str) -> dict:
     today_str = get_today_str()
     today = date.today()
     
@@ -96,7 +382,7 @@ SADECE GEÇERLİ BİR JSON OBJESİ DÖN. Açıklama, markdown, backtick EKLEME.
       - announcement_date_start: "YYYY-MM-DD"
       - announcement_date_end: "YYYY-MM-DD"
 
-5. limit (int): Maksimum sonuç (varsayılan 100)
+5. limit / skip: Sayfalama sunucu tarafından yapılır, bu alanları EKLEME.
 
 === TARİH HESAPLAMA KURALLARI ===
 
@@ -135,17 +421,21 @@ DİĞER:
 
 Sadece gerekli alanları ekle, null olanları EKLEME:
 
-{{"search_text": "", "tender_types": [], "provinces": [], "limit": 2000}}
+{{"search_text": "", "tender_types": [], "provinces": []}}
 
 JSON dışında hiçbir şey yazma."""
 
-    resp = client.chat.completions.create(
-        model="gpt-4o",
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_query},
-        ],
-        temperature=0,
+    resp = await llm_retry.run(
+        lambda: client.chat.completions.create(
+            model="gpt-4o",
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_query},
+            ],
+            temperature=0,
+            timeout=call_timeout(LLM_TIMEOUT),
+        ),
+        llm_breaker,
     )
 
     raw_json_str = resp.choices[0].message.content
@@ -170,6 +460,36 @@ JSON dışında hiçbir şey yazma."""
     return normalize_mcp_arguments(arguments, user_query)
 
 
+async def translate_query(user_query: str) -> Dict[str, Any]:
+    # Hızlı yol: tarih/il/tür kurallarıyla çözülebilen sorgular LLM'e gitmez
+    parsed = parse_query(user_query)
+    if parsed is not None:
+        translation_sources["rule"] += 1
+        return normalize_mcp_arguments(parsed, user_query)
+
+    cached = translation_cache.get(user_query)
+    if cached is not None:
+        translation_sources["cache"] += 1
+        return cached
+
+    key = (date.today().isoformat(), normalize_query_text(user_query))
+    arguments = await translation_flight.do(key, lambda: translate_with_llm(user_query))
+    # Aynı sonucu paylaşan istekler birbirinin argümanlarını değiştirmesin
+    return copy.deepcopy(arguments)
+
+
+async def translate_with_llm(user_query: str) -> Dict[str, Any]:
+    t0 = time.perf_counter()
+    arguments = await build_mcp_arguments_with_gpt(user_query)
+    elapsed = time.perf_counter() - t0
+    translation_cache.record_llm_latency(elapsed)
+    STAGE_LLM.observe(elapsed)
+    translation_sources["llm"] += 1
+
+    translation_cache.put(user_query, arguments)
+    return arguments
+
+
 def normalize_mcp_arguments(arguments: Dict[str, Any], user_query: str) -> Dict[str, Any]:
     allowed_keys = {
         "search_text", "ikn_year", "ikn_number", "tender_types",
@@ -200,8 +520,17 @@ def normalize_mcp_arguments(arguments: Dict[str, Any], user_query: str) -> Dict[
             prov = [prov]
         cleaned["provinces"] = [int(x) for x in prov if str(x).isdigit() and 1 <= int(x) <= 81]
 
-    if not cleaned.get("limit"):
-        cleaned["limit"] = 2000
+    try:
+        limit = int(cleaned.get("limit") or MCP_PAGE_SIZE)
+    except (TypeError, ValueError):
+        limit = MCP_PAGE_SIZE
+    cleaned["limit"] = min(max(limit, 1), MCP_MAX_LIMIT)
+
+    try:
+        skip = int(cleaned["skip"]) if cleaned.get("skip") is not None else None
+    except (TypeError, ValueError):
+        skip = None
+    cleaned["skip"] = skip if skip and skip > 0 else None
 
     for key in ["tender_date_start", "tender_date_end", "announcement_date_start", "announcement_date_end"]:
         val = cleaned.get(key)
@@ -241,8 +570,13 @@ def normalize_mcp_arguments(arguments: Dict[str, Any], user_query: str) -> Dict[
     return cleaned
 
 
-def call_mcp_tool(tool_name: str, arguments: dict) -> dict:
-    payload = {
+def normalize_sync_arguments(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    # Senkronizasyon istekleri /api/run ile aynı biçimde gider: aynı varsayılanlar, limit sınırı ve cache anahtarı
+    return normalize_mcp_arguments(arguments, "")
+
+
+def mcp_tool_payload(tool_name: str, arguments: dict) -> dict:
+    return {
         "jsonrpc": "2.0",
         "id": 1,
         "method": "tools/call",
@@ -252,49 +586,151 @@ def call_mcp_tool(tool_name: str, arguments: dict) -> dict:
         },
     }
 
-    resp = requests.post(
-        MCP_URL,
-        json=payload,
-        timeout=30,
-        headers={
-            "Content-Type": "application/json",
-            "Accept": "application/json, text/event-stream",
-        },
-    )
-
-    text_body = resp.text
 
+def stream_mcp_tenders(mcp_args: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+    # İlk ihale gelmeden oluşan geçici hatalarda akış baştan açılır
+    if MCP_HEDGE:
+        # İlk ihale p95 içinde gelmezse ikinci bir akış açılır; ilk ihaleyi getiren devam eder
+        return mcp_retry.stream(
+            lambda: mcp_stream_hedger.stream(lambda: stream_mcp_tenders_once(mcp_args)), mcp_breaker
+        )
+    return mcp_retry.stream(lambda: stream_mcp_tenders_once(mcp_args), mcp_breaker)
+
+
+async def stream_mcp_tenders_once(mcp_args: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+    # Gövde tamamen belleğe alınmadan structuredContent.tenders elemanları tek tek gelir
+    payload = mcp_tool_payload(MCP_TOOL_NAME, mcp_args)
+    timeout = call_timeout(MCP_TIMEOUT)
+    t0 = time.perf_counter()
+    async with get_mcp_http().stream("POST", MCP_URL, json=payload, timeout=timeout) as resp:
+        if resp.status_code >= 400:
+            text_body = (await resp.aread()).decode("utf-8", "replace")
+            raise UpstreamHTTPError(resp.status_code, f"MCP HTTP error: {resp.status_code}, body={text_body[:500]}")
+
+        # Ağ beklemesi (başlıklar + gövde parçaları) ile ayrıştırma süresi parça başına ayrı
+        # ölçülür; tüketicinin (istemciye yazma) süresi ikisine de girmez
+        headers_seconds = time.perf_counter() - t0
+        network = Stopwatch()
+        parsing = Stopwatch()
+        content_type = resp.headers.get("Content-Type", "")
+        # Zaman aşımı okuma başınadır; toplam süre bütçesi parça parça kontrol edilir
+        body = deadline_aiter(timed_aiter(resp.aiter_bytes(), network))
+        async for item in iter_mcp_items(body, content_type, timer=parsing):
+            yield item
+    STAGE_MCP.observe(headers_seconds + network.total)
+    STAGE_PARSE.observe(parsing.total)
+
+
+async def fetch_mcp_page(mcp_args: Dict[str, Any]) -> List[Dict[str, Any]]:
+    if MCP_HEDGE:
+        # search_tenders idempotent: p95'i aşan çağrının yanına ikinci bir kopya gönderilir
+        return await mcp_retry.run(lambda: mcp_hedger.run(lambda: fetch_mcp_page_once(mcp_args)), mcp_breaker)
+    return await mcp_retry.run(lambda: fetch_mcp_page_once(mcp_args), mcp_breaker)
+
+
+async def fetch_mcp_page_once(mcp_args: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return normalize_tenders([item async for item in stream_mcp_tenders_once(mcp_args)])
+
+
+async def load_local_tenders(mcp_args: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+    # Tarih penceresi depoda eksiksiz ve taze ise sorgu SQLite'tan cevaplanır.
+    # Depoyu güncel tutan worker yoksa yeni ilanlar/durumlar hiç gelmeyeceğinden yerel yol kapalı.
+    if tender_store is None or sync_worker is None:
+        return None
+    if not await asyncio.to_thread(tender_store.covers, mcp_args, COVERAGE_TTL):
+        return None
+    return await asyncio.to_thread(tender_store.query, mcp_args)
+
+
+def is_complete_window(mcp_args: Dict[str, Any], page_len: int) -> bool:
+    # Filtresiz bir tarih aralığı aramasının ilk sayfası limit'ten kısa geldiyse o aralığın tamamı elimizdedir
+    if TenderStore.requested_window(mcp_args) is None:
+        return False
+    if mcp_args.get("search_text") or mcp_args.get("provinces") or mcp_args.get("tender_types"):
+        return False
+    return not mcp_args.get("skip") and page_len < mcp_args.get("limit", MCP_PAGE_SIZE)
+
+
+async def store_tenders(mcp_args: Dict[str, Any], tenders: Union[List[Dict[str, Any]], TenderBatch]) -> None:
+    if tender_store is None:
+        return
+    await asyncio.to_thread(tender_store.upsert_tenders, tenders, "mcp")
+    if is_complete_window(mcp_args, len(tenders)):
+        start, end = TenderStore.requested_window(mcp_args)
+        await asyncio.to_thread(tender_store.record_coverage, start, end)
+
+
+async def fetch_tenders(mcp_args: Dict[str, Any]) -> TenderBatch:
+    # Cache'te sütun tabanlı tutulur; dict'e çevirme kenarda (cevap/akış) yapılır
+    local = await load_local_tenders(mcp_args)
+    if local is not None:
+        return TenderBatch(local)
+    tenders = await fetch_mcp_page(mcp_args)
+    await store_tenders(mcp_args, tenders)
+    return TenderBatch(tenders)
+
+
+def encode_cursor(mcp_args: Dict[str, Any], skip: int) -> str:
+    payload = dict(mcp_args, skip=skip)
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
     try:
-        resp.raise_for_status()
-    except requests.HTTPError as e:
-        raise RuntimeError(f"MCP HTTP error: {e}, body={text_body[:500]}")
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw.decode("utf-8"))
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("geçersiz cursor")
+    if not isinstance(payload, dict):
+        raise ValueError("geçersiz cursor")
+    # Cursor istemciden geldiği için yeniden doğrulanır
+    return normalize_mcp_arguments(payload, "")
 
-    content_type = resp.headers.get("Content-Type", "")
 
-    try:
-        if "text/event-stream" in content_type:
-            json_chunks = []
-            for line in text_body.splitlines():
-                line = line.strip()
-                if line.startswith("data:"):
-                    json_part = line[len("data:"):].strip()
-                    if json_part:
-                        json_chunks.append(json_part)
-
-            if not json_chunks:
-                raise ValueError(f"SSE formatı ama data yok")
-
-            combined = "\n".join(json_chunks)
-            data = json.loads(combined)
-        else:
-            data = resp.json()
-    except json.JSONDecodeError as e:
-        raise ValueError(f"MCP JSON parse hatası: {e}")
+def first_page_arguments(mcp_args: Dict[str, Any]) -> Dict[str, Any]:
+    page_args = dict(mcp_args, limit=MCP_PAGE_SIZE)
+    page_args.pop("skip", None)
+    return page_args
 
-    if "error" in data:
-        raise RuntimeError(f"MCP error: {data['error']}")
 
-    return data.get("result", data)
+def next_page_cursor(page_args: Dict[str, Any], page_len: int) -> Optional[str]:
+    # Sayfa dolu geldiyse devamı olabilir
+    if page_len < page_args["limit"]:
+        return None
+    return encode_cursor(page_args, page_args.get("skip", 0) + page_len)
+
+
+def result_set_id(page_args: Dict[str, Any]) -> str:
+    # Aynı sorgunun tüm sayfaları aynı sonuç setine düşer
+    base = {k: v for k, v in page_args.items() if k not in ("limit", "skip")}
+    return hashlib.blake2b(canonical_arguments(base).encode("utf-8"), digest_size=12).hexdigest()
+
+
+def fetch_tenders_once(key: str, mcp_args: Dict[str, Any]):
+    # Aynı kanonik argümanlar için uçuşta bir MCP çağrısı varsa ona katılır
+    return lambda: mcp_flight.do(key, lambda: fetch_tenders(mcp_args))
+
+
+def stale_result(key: str, exc: BaseException) -> Optional[TenderBatch]:
+    # Upstream sağlıksızken süresi geçmiş de olsa cache'teki sonuç hata yerine sunulur
+    if not isinstance(exc, CircuitOpen) and not is_transient_http_error(exc):
+        return None
+    stale = result_cache.peek(key)
+    if stale is not None:
+        degraded["stale_served"] += 1
+    return stale
+
+
+async def get_tenders(mcp_args: Dict[str, Any]) -> TenderBatch:
+    key = canonical_arguments(mcp_args)
+    try:
+        return await result_cache.get_or_fetch(key, fetch_tenders_once(key, mcp_args))
+    except Exception as e:
+        stale = stale_result(key, e)
+        if stale is None:
+            raise
+        return stale
 
 
 # HTML template - backtick'ler escape edildi
@@ -357,6 +793,14 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
             color: white; padding: 12px 16px; text-align: left; font-weight: 600;
         }
         td { padding: 12px 16px; border-bottom: 1px solid #e2e8f0; }
+        /* Sanal tablo: sabit satır yüksekliği (ROW_HEIGHT), taşan metin kısaltılır */
+        table { table-layout: fixed; }
+        th:nth-child(1) { width: 12%; } th:nth-child(2) { width: 26%; } th:nth-child(3) { width: 8%; }
+        th:nth-child(4) { width: 12%; } th:nth-child(5) { width: 18%; } th:nth-child(6) { width: 8%; }
+        th:nth-child(7) { width: 10%; } th:nth-child(8) { width: 6%; }
+        tr.vrow { height: 44px; }
+        tr.vrow td { padding: 0 16px; white-space: nowrap; overflow: hidden; text-overflow: ellipsis; }
+        td.spacer { padding: 0; border: none; height: 0; }
         tbody tr:hover { background-color: #f7fafc; }
         a { color: #667eea; text-decoration: none; font-weight: 600; }
         a:hover { color: #764ba2; text-decoration: underline; }
@@ -370,6 +814,7 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
             font-size: 14px; cursor: pointer; width: 100%;
         }
         .clear-btn:hover { background: #cbd5e0; }
+        .load-more { text-align: center; padding: 16px; color: #718096; font-size: 14px; display: none; }
     </style>
 </head>
 <body>
@@ -429,6 +874,7 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
             <div class="table-container">
                 <div id="tendersTable"></div>
             </div>
+            <div class="load-more" id="loadMore">Daha fazla sonuç yükleniyor...</div>
         </div>
         
         <div id="error" class="error" style="display: none;"></div>
@@ -436,39 +882,128 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
 
     <script>
         var allTenders = [];
+        var rawCount = 0;
+        var nextCursor = null;
+        var loadingMore = false;
+        var searchText = '';
+        var queryId = 0;
         
         function toggleDebug() {
             var el = document.getElementById('debugInfo');
             el.style.display = el.style.display === 'none' ? 'block' : 'none';
         }
         
-        function renderTable(tenders) {
-            if (!tenders || !tenders.length) {
-                return '<div class="no-results">Sonuç bulunamadı.</div>';
-            }
+        // Sanal tablo: yalnızca ekranda görünen satırlar (± OVERSCAN) DOM'da bulunur.
+        // Satır düğümleri bir kez oluşturulur ve kaydırdıkça yeni verilerle yeniden kullanılır.
+        var ROW_HEIGHT = 44;
+        var OVERSCAN = 10;
+        var COLUMNS = ['ikn', 'name', 'type', 'status', 'authority', 'province', 'tender_datetime'];
+        var filteredTenders = [];
+        var rowPool = [];
+        var tableBody = null;
+        var topSpacer = null;
+        var bottomSpacer = null;
+        var scrollPending = false;
+
+        function createSpacer() {
+            var tr = document.createElement('tr');
+            var td = document.createElement('td');
+            td.colSpan = COLUMNS.length + 1;
+            td.className = 'spacer';
+            tr.appendChild(td);
+            return tr;
+        }
 
-            var html = '<table><thead><tr>' +
+        function ensureTable() {
+            if (tableBody) return;
+            var tableEl = document.getElementById('tendersTable');
+            tableEl.innerHTML = '<table><thead><tr>' +
                 '<th>İKN</th><th>İhale Adı</th><th>Tür</th><th>Durum</th>' +
                 '<th>İdare</th><th>İl</th><th>Tarih</th><th>Doküman</th>' +
-                '</tr></thead><tbody>';
-
-            for (var i = 0; i < tenders.length; i++) {
-                var t = tenders[i];
-                var link = t.document_url ? '<a href="' + t.document_url + '" target="_blank">Görüntüle</a>' : '';
-                html += '<tr>' +
-                    '<td>' + (t.ikn || '') + '</td>' +
-                    '<td>' + (t.name || '') + '</td>' +
-                    '<td>' + (t.type || '') + '</td>' +
-                    '<td>' + (t.status || '') + '</td>' +
-                    '<td>' + (t.authority || '') + '</td>' +
-                    '<td>' + (t.province || '') + '</td>' +
-                    '<td>' + (t.tender_datetime || '') + '</td>' +
-                    '<td>' + link + '</td>' +
-                    '</tr>';
+                '</tr></thead><tbody></tbody></table>';
+            tableBody = tableEl.querySelector('tbody');
+            topSpacer = createSpacer();
+            bottomSpacer = createSpacer();
+            tableBody.appendChild(topSpacer);
+            tableBody.appendChild(bottomSpacer);
+            rowPool = [];
+        }
+
+        function showTableMessage(html) {
+            tableBody = null;
+            rowPool = [];
+            document.getElementById('tendersTable').innerHTML = html;
+        }
+
+        function createRow() {
+            var tr = document.createElement('tr');
+            tr.className = 'vrow';
+            var cells = [];
+            for (var i = 0; i < COLUMNS.length; i++) {
+                var td = document.createElement('td');
+                tr.appendChild(td);
+                cells.push(td);
+            }
+            var linkCell = document.createElement('td');
+            var link = document.createElement('a');
+            link.target = '_blank';
+            link.textContent = 'Görüntüle';
+            linkCell.appendChild(link);
+            tr.appendChild(linkCell);
+            tableBody.insertBefore(tr, bottomSpacer);
+            return { tr: tr, cells: cells, link: link, tender: null };
+        }
+
+        function fillRow(row, t) {
+            row.tender = t;
+            for (var i = 0; i < COLUMNS.length; i++) {
+                var value = t[COLUMNS[i]] || '';
+                row.cells[i].textContent = value;
+                row.cells[i].title = value;
+            }
+            if (t.document_url) {
+                row.link.href = t.document_url;
+                row.link.style.display = '';
+            } else {
+                row.link.removeAttribute('href');
+                row.link.style.display = 'none';
             }
+        }
+
+        function renderVisible() {
+            if (!tableBody) return;
+            var n = filteredTenders.length;
+            // tbody'nin ekrandaki konumu ilk satırın konumudur (üst boşluk satırı dahil)
+            var offset = Math.max(0, -tableBody.getBoundingClientRect().top);
+            var first = Math.max(0, Math.min(n, Math.floor(offset / ROW_HEIGHT) - OVERSCAN));
+            var last = Math.min(n, first + Math.ceil(window.innerHeight / ROW_HEIGHT) + 2 * OVERSCAN);
 
-            html += '</tbody></table>';
-            return html;
+            while (rowPool.length < last - first) {
+                rowPool.push(createRow());
+            }
+            for (var j = 0; j < rowPool.length; j++) {
+                var row = rowPool[j];
+                var idx = first + j;
+                if (idx < last) {
+                    if (row.tender !== filteredTenders[idx]) fillRow(row, filteredTenders[idx]);
+                    row.tr.style.display = '';
+                } else if (row.tr.style.display !== 'none') {
+                    row.tr.style.display = 'none';
+                    row.tender = null;
+                }
+            }
+            topSpacer.firstChild.style.height = (first * ROW_HEIGHT) + 'px';
+            bottomSpacer.firstChild.style.height = ((n - last) * ROW_HEIGHT) + 'px';
+        }
+
+        function onScroll() {
+            if (scrollPending) return;
+            scrollPending = true;
+            requestAnimationFrame(function() {
+                scrollPending = false;
+                renderVisible();
+                maybeLoadMore();
+            });
         }
         
         function turkishLowerCase(str) {
@@ -479,26 +1014,41 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
                 .toLowerCase();
         }
 
-        function uniqueValues(key) {
-            var seen = {};
-            var result = [];
-            for (var i = 0; i < allTenders.length; i++) {
-                var val = (allTenders[i][key] || '').toString().trim();
-                if (val && !seen[val]) {
-                    seen[val] = true;
-                    result.push(val);
+        var ASCII_FOLD = { 'ç': 'c', 'ğ': 'g', 'ı': 'i', 'ö': 'o', 'ş': 's', 'ü': 'u', 'â': 'a', 'î': 'i', 'û': 'u' };
+
+        // Sunucudaki ascii_fold ile aynı; yalnızca aranan metne uygulanır,
+        // satırlar hazır name_key / search_key alanlarıyla gelir
+        function asciiFold(str) {
+            return turkishLowerCase(str).replace(/[çğıöşüâîû]/g, function(c) { return ASCII_FOLD[c]; });
+        }
+
+        // Tür ve il seçenekleri satırlar eklendikçe güncellenir; her çizimde tüm liste taranmaz
+        var facetValues = { type: {}, province: {} };
+        var facetsDirty = false;
+
+        function collectFacets(t) {
+            for (var key in facetValues) {
+                var val = (t[key] || '').toString().trim();
+                if (val && !facetValues[key][val]) {
+                    facetValues[key][val] = true;
+                    facetsDirty = true;
                 }
             }
-            return result.sort();
         }
 
         function populateSelect(id, values, placeholder) {
             var el = document.getElementById(id);
             if (!el) return;
-            el.innerHTML = '<option value="">' + placeholder + '</option>';
+            // Yeni sayfa geldiğinde kullanıcının seçimi korunur
+            var selected = el.value;
+            var fragment = document.createDocumentFragment();
+            fragment.appendChild(new Option(placeholder, ''));
             for (var i = 0; i < values.length; i++) {
-                el.innerHTML += '<option value="' + values[i] + '">' + values[i] + '</option>';
+                fragment.appendChild(new Option(values[i], values[i]));
             }
+            el.textContent = '';
+            el.appendChild(fragment);
+            el.value = selected;
         }
 
         function prepareFilters() {
@@ -507,9 +1057,12 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
             
             if (allTenders.length > 0) {
                 filterContainer.style.display = 'block';
-                countEl.textContent = 'Toplam ' + allTenders.length + ' sonuç';
-                populateSelect('filterType', uniqueValues('type'), 'Tür (hepsi)');
-                populateSelect('filterProvince', uniqueValues('province'), 'İl (hepsi)');
+                countEl.textContent = 'Toplam ' + allTenders.length + (nextCursor ? '+' : '') + ' sonuç';
+                if (facetsDirty) {
+                    facetsDirty = false;
+                    populateSelect('filterType', Object.keys(facetValues.type).sort(), 'Tür (hepsi)');
+                    populateSelect('filterProvince', Object.keys(facetValues.province).sort(), 'İl (hepsi)');
+                }
             } else {
                 filterContainer.style.display = 'none';
                 countEl.textContent = '';
@@ -517,15 +1070,17 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
         }
 
         function applyFilters() {
-            var tableEl = document.getElementById('tendersTable');
             var countEl = document.getElementById('resultsCount');
 
             if (allTenders.length === 0) {
-                tableEl.innerHTML = '<div class="no-results">Sonuç bulunamadı.</div>';
+                filteredTenders = [];
+                showTableMessage(nextCursor
+                    ? '<div class="loading">Aranıyor...</div>'
+                    : '<div class="no-results">Sonuç bulunamadı. (API ' + rawCount + ' sonuç döndürdü, search_text filtresi uygulandı)</div>');
                 return;
             }
 
-            var text = turkishLowerCase(document.getElementById('filterInput').value || '');
+            var text = asciiFold(document.getElementById('filterInput').value || '');
             var type = document.getElementById('filterType').value || '';
             var province = document.getElementById('filterProvince').value || '';
             var dateStart = document.getElementById('filterDateStart').value || '';
@@ -551,17 +1106,29 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
                 if (docFilter === 'yes' && !t.document_url) continue;
                 if (docFilter === 'no' && t.document_url) continue;
                 
-                if (text) {
-                    var haystack = turkishLowerCase([t.ikn, t.name, t.type, t.status, t.authority, t.province].join(' '));
-                    if (haystack.indexOf(text) === -1) continue;
-                }
+                if (text && t.search_key.indexOf(text) === -1) continue;
                 filtered.push(t);
             }
 
-            tableEl.innerHTML = renderTable(filtered);
+            filteredTenders = filtered;
+            if (filtered.length === 0) {
+                showTableMessage('<div class="no-results">Sonuç bulunamadı.</div>');
+            } else {
+                ensureTable();
+                renderVisible();
+            }
+            var more = nextCursor ? '+' : '';
             countEl.textContent = filtered.length === allTenders.length
-                ? 'Toplam ' + allTenders.length + ' sonuç'
-                : filtered.length + ' / ' + allTenders.length + ' sonuç';
+                ? 'Toplam ' + allTenders.length + more + ' sonuç'
+                : filtered.length + ' / ' + allTenders.length + more + ' sonuç';
+        }
+
+        var filterTimer = null;
+
+        // Yazarken her tuşta değil, yazma durunca filtrele
+        function debouncedApplyFilters() {
+            clearTimeout(filterTimer);
+            filterTimer = setTimeout(applyFilters, 150);
         }
 
         function clearFilters() {
@@ -574,6 +1141,114 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
             applyFilters();
         }
 
+        var renderPending = false;
+
+        // Akış sırasında her parça için değil, kare başına bir kez çiz
+        function scheduleRender() {
+            if (renderPending) return;
+            renderPending = true;
+            requestAnimationFrame(function() {
+                renderPending = false;
+                if (allTenders.length > 0) {
+                    prepareFilters();
+                }
+                applyFilters();
+            });
+        }
+
+        function appendTenders(rawTenders) {
+            rawCount += rawTenders.length;
+
+            // search_text varsa, İhale Adı'nda filtrele (Türkçe karakterler dahil)
+            for (var i = 0; i < rawTenders.length; i++) {
+                if (searchText && rawTenders[i].name_key.indexOf(searchText) === -1) continue;
+                allTenders.push(rawTenders[i]);
+                collectFacets(rawTenders[i]);
+            }
+            scheduleRender();
+        }
+
+        function finishPage(cursor) {
+            nextCursor = cursor || null;
+            document.getElementById('loadMore').style.display = nextCursor ? 'block' : 'none';
+            scheduleRender();
+            // Sayfa ekranı doldurmadıysa bir sonrakini hemen iste
+            requestAnimationFrame(maybeLoadMore);
+        }
+
+        // /api/run NDJSON akışını okur; her satır bir olaydır (meta, tenders, end, error)
+        function streamPage(body, onEvent) {
+            body.stream = true;
+            return fetch('/api/run', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json', 'Accept': 'application/x-ndjson' },
+                body: JSON.stringify(body)
+            }).then(function(resp) {
+                if (!resp.ok || !resp.body) {
+                    return resp.json().then(function(data) {
+                        if (data.error) {
+                            onEvent({ type: 'error', error: data.error });
+                            return;
+                        }
+                        onEvent({ type: 'meta', mcp_arguments: data.mcp_arguments });
+                        onEvent({ type: 'tenders', tenders: data.tenders || [] });
+                        onEvent({ type: 'end', next_cursor: data.next_cursor });
+                    });
+                }
+
+                var reader = resp.body.getReader();
+                var decoder = new TextDecoder();
+                var buffer = '';
+
+                function pump() {
+                    return reader.read().then(function(result) {
+                        if (result.value) {
+                            buffer += decoder.decode(result.value, { stream: true });
+                        }
+                        var lines = buffer.split('\\n');
+                        buffer = result.done ? '' : lines.pop();
+                        for (var i = 0; i < lines.length; i++) {
+                            if (lines[i]) onEvent(JSON.parse(lines[i]));
+                        }
+                        if (!result.done) return pump();
+                    });
+                }
+                return pump();
+            });
+        }
+
+        function showError(message) {
+            var errorEl = document.getElementById('error');
+            errorEl.textContent = message;
+            errorEl.style.display = 'block';
+            document.getElementById('results').style.display = 'none';
+        }
+
+        function maybeLoadMore() {
+            if (!nextCursor || loadingMore) return;
+            var rect = document.getElementById('loadMore').getBoundingClientRect();
+            if (rect.top > window.innerHeight + 400) return;
+
+            var myQuery = queryId;
+            loadingMore = true;
+            streamPage({ cursor: nextCursor }, function(ev) {
+                if (myQuery !== queryId) return;
+                if (ev.type === 'tenders') {
+                    appendTenders(ev.tenders);
+                } else if (ev.type === 'end') {
+                    loadingMore = false;
+                    finishPage(ev.next_cursor);
+                } else if (ev.type === 'error') {
+                    loadingMore = false;
+                    finishPage(null);
+                }
+            })
+            .catch(function() {
+                if (myQuery !== queryId) return;
+                loadingMore = false;
+            });
+        }
+
         function runQuery() {
             var q = document.getElementById('query').value.trim();
             if (!q) {
@@ -582,77 +1257,141 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
             }
             
             var resultsDiv = document.getElementById('results');
-            var tableEl = document.getElementById('tendersTable');
             var errorEl = document.getElementById('error');
             var debugEl = document.getElementById('debugInfo');
             var filterContainer = document.getElementById('filterContainer');
             
             errorEl.style.display = 'none';
             filterContainer.style.display = 'none';
+            document.getElementById('loadMore').style.display = 'none';
             debugEl.textContent = '';
             allTenders = [];
+            filteredTenders = [];
+            facetValues = { type: {}, province: {} };
+            facetsDirty = true;
+            window.scrollTo(0, 0);
+            rawCount = 0;
+            nextCursor = null;
+            loadingMore = false;
+            searchText = '';
+            var myQuery = ++queryId;
             
             resultsDiv.style.display = 'block';
-            tableEl.innerHTML = '<div class="loading">Aranıyor...</div>';
-
-            fetch('/api/run', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ query: q })
-            })
-            .then(function(resp) { return resp.json(); })
-            .then(function(data) {
-                if (data.error) {
-                    errorEl.textContent = 'Hata: ' + data.error;
-                    errorEl.style.display = 'block';
-                    resultsDiv.style.display = 'none';
-                    return;
+            showTableMessage('<div class="loading">Aranıyor...</div>');
+
+            streamPage({ query: q }, function(ev) {
+                if (myQuery !== queryId) return;
+                if (ev.type === 'error') {
+                    showError('Hata: ' + ev.error);
+                } else if (ev.type === 'meta') {
+                    debugEl.textContent = 'MCP Parametreleri:\\n' + JSON.stringify(ev.mcp_arguments, null, 2);
+                    searchText = ev.mcp_arguments.search_text ? asciiFold(ev.mcp_arguments.search_text) : '';
+                } else if (ev.type === 'tenders') {
+                    appendTenders(ev.tenders);
+                } else if (ev.type === 'end') {
+                    finishPage(ev.next_cursor);
                 }
+            })
+            .catch(function(err) {
+                if (myQuery !== queryId) return;
+                showError('Bağlantı hatası: ' + err.message);
+            });
+        }
+        
+        // Performans ölçümü için: sentetik n satır yükler, filtre ve kaydırma kare sürelerini döner.
+        // benchmarks/bench_ui_render.py tarafından çağrılır: benchVirtualTable(20000)
+        function benchVirtualTable(n) {
+            var types = ['Mal', 'Yapım', 'Hizmet', 'Danışmanlık'];
+            var provinces = ['İstanbul', 'Ankara', 'İzmir', 'Bursa', 'Antalya', 'Konya', 'Adana', 'Kocaeli'];
+            var rows = [];
+            for (var i = 0; i < n; i++) {
+                var day = ('0' + (i % 28 + 1)).slice(-2) + '.' + ('0' + (i % 12 + 1)).slice(-2) + '.2025 10:30';
+                var t = {
+                    id: i, ikn: '2025/' + (100000 + i),
+                    name: i + ' Kalem Çeşitli Tıbbi Sarf Malzemesi Alımı İşi',
+                    type: types[i % 4], status: 'Teklifler Alınıyor',
+                    authority: 'Sağlık Bakanlığı Şehir Hastanesi Müdürlüğü ' + (i % 50),
+                    province: provinces[i % provinces.length], tender_datetime: day,
+                    document_url: i % 2 ? 'https://ekap.kik.gov.tr/doc/' + i : null
+                };
+                t.name_key = asciiFold(t.name);
+                t.search_key = asciiFold([t.ikn, t.name, t.type, t.status, t.authority, t.province].join(' '));
+                rows.push(t);
+            }
 
-                if (data.mcp_arguments) {
-                    debugEl.textContent = 'MCP Parametreleri:\\n' + JSON.stringify(data.mcp_arguments, null, 2);
-                }
+            queryId++;
+            allTenders = [];
+            filteredTenders = [];
+            facetValues = { type: {}, province: {} };
+            searchText = '';
+            nextCursor = null;
+            document.getElementById('results').style.display = 'block';
+            window.scrollTo(0, 0);
+
+            var t0 = performance.now();
+            appendTenders(rows);
+            prepareFilters();
+            applyFilters();
+            document.body.offsetHeight;
+            var initialMs = performance.now() - t0;
+
+            var input = document.getElementById('filterInput');
+            var filterMs = [];
+            ['s', 'sa', 'sağ', 'sağl', 'sağlık 1', ''].forEach(function(text) {
+                input.value = text;
+                var f0 = performance.now();
+                applyFilters();
+                document.body.offsetHeight;
+                filterMs.push(performance.now() - f0);
+            });
 
-                var rawTenders = data.tenders || [];
-                
-                // search_text varsa, İhale Adı'nda filtrele (Türkçe karakterler dahil)
-                var searchText = (data.mcp_arguments && data.mcp_arguments.search_text) ? turkishLowerCase(data.mcp_arguments.search_text) : '';
-                if (searchText) {
-                    allTenders = [];
-                    for (var i = 0; i < rawTenders.length; i++) {
-                        var tenderName = turkishLowerCase(rawTenders[i].name || '');
-                        if (tenderName.indexOf(searchText) !== -1) {
-                            allTenders.push(rawTenders[i]);
-                        }
+            return new Promise(function(resolve) {
+                var frames = [];
+                var renderMs = [];
+                var step = 0;
+                var last = performance.now();
+                function frame(now) {
+                    frames.push(now - last);
+                    last = now;
+                    window.scrollBy(0, 900);
+                    var r0 = performance.now();
+                    renderVisible();
+                    document.body.offsetHeight;
+                    renderMs.push(performance.now() - r0);
+                    if (++step < 120) {
+                        requestAnimationFrame(frame);
+                        return;
                     }
-                } else {
-                    allTenders = rawTenders;
-                }
-                
-                if (allTenders.length > 0) {
-                    prepareFilters();
-                    applyFilters();
-                } else {
-                    tableEl.innerHTML = '<div class="no-results">Sonuç bulunamadı. (API ' + rawTenders.length + ' sonuç döndürdü, search_text filtresi uygulandı)</div>';
+                    frames.shift();
+                    function pct(list, p) {
+                        var sorted = list.slice().sort(function(a, b) { return a - b; });
+                        return sorted[Math.min(sorted.length - 1, Math.floor(sorted.length * p / 100))];
+                    }
+                    resolve({
+                        rows: n,
+                        dom_rows: tableBody ? tableBody.rows.length : 0,
+                        initial_render_ms: initialMs,
+                        filter_ms: filterMs,
+                        scroll_frame_ms: { p50: pct(frames, 50), p95: pct(frames, 95), max: pct(frames, 100) },
+                        scroll_render_ms: { p50: pct(renderMs, 50), p95: pct(renderMs, 95), max: pct(renderMs, 100) }
+                    });
                 }
-            })
-            .catch(function(err) {
-                errorEl.textContent = 'Bağlantı hatası: ' + err.message;
-                errorEl.style.display = 'block';
-                resultsDiv.style.display = 'none';
+                requestAnimationFrame(frame);
             });
         }
-        
+
         // Event listeners
         document.getElementById('searchBtn').addEventListener('click', runQuery);
         document.getElementById('debugToggle').addEventListener('click', toggleDebug);
-        document.getElementById('filterInput').addEventListener('input', applyFilters);
+        document.getElementById('filterInput').addEventListener('input', debouncedApplyFilters);
         document.getElementById('filterType').addEventListener('change', applyFilters);
         document.getElementById('filterProvince').addEventListener('change', applyFilters);
         document.getElementById('filterDateStart').addEventListener('change', applyFilters);
         document.getElementById('filterDateEnd').addEventListener('change', applyFilters);
         document.getElementById('filterDocument').addEventListener('change', applyFilters);
         document.getElementById('clearFiltersBtn').addEventListener('click', clearFilters);
+        window.addEventListener('scroll', onScroll, { passive: true });
+        window.addEventListener('resize', onScroll);
         
         // Enter key
         document.getElementById('query').addEventListener('keydown', function(e) {
@@ -666,37 +1405,374 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
 </html>'''
 
 
+async def iter_tender_chunks(page_args: Dict[str, Any]) -> AsyncIterator[List[Dict[str, Any]]]:
+    key = canonical_arguments(page_args)
+    cached = result_cache.get(key, fetch_tenders_once(key, page_args))
+    if cached is None:
+        joined = mcp_flight.join(key)
+        if joined is not None:
+            try:
+                cached = await joined
+            except FlightAbandoned:
+                cached = None
+    if cached is not None:
+        for i in range(0, len(cached), STREAM_CHUNK_SIZE):
+            yield cached.to_dicts(i, i + STREAM_CHUNK_SIZE)
+        return
+
+    local = await load_local_tenders(page_args)
+    if local is not None:
+        for i in range(0, len(local), STREAM_CHUNK_SIZE):
+            yield local[i:i + STREAM_CHUNK_SIZE]
+        result_cache.put(key, TenderBatch(local))
+        return
+
+    # Bu akış, aynı anda gelen eş isteklerin bekleyeceği çağrının lideridir
+    flight = mcp_flight.claim(key)
+    stale: Optional[TenderBatch] = None
+    try:
+        tenders = TenderBatch()
+        raw_chunk: List[Dict[str, Any]] = []
+        memo: Dict[str, Any] = {}
+        async for item in stream_mcp_tenders(page_args):
+            raw_chunk.append(item)
+            if len(raw_chunk) >= STREAM_CHUNK_SIZE:
+                chunk = normalize_tenders(raw_chunk, memo)
+                tenders.extend(chunk)
+                yield chunk
+                raw_chunk = []
+        if raw_chunk:
+            chunk = normalize_tenders(raw_chunk, memo)
+            tenders.extend(chunk)
+            yield chunk
+        # Akış sonuna kadar tüketildiyse cache'e ve depoya yaz (istemci koparsa yazılmaz)
+        result_cache.put(key, tenders)
+        flight.set_result(tenders)
+        await store_tenders(page_args, tenders)
+    except Exception as e:
+        # Henüz hiçbir parça gönderilmediyse eski sonuç hatanın yerine geçebilir
+        stale = stale_result(key, e) if not len(tenders) else None
+        if flight.done():
+            raise
+        if stale is None:
+            flight.set_exception(e)
+            raise
+        flight.set_result(stale)
+    finally:
+        # İstemci akışı kopardıysa bekleyenler çağrıyı kendileri yapar
+        mcp_flight.abandon(flight)
+
+    if stale is not None:
+        for i in range(0, len(stale), STREAM_CHUNK_SIZE):
+            yield stale.to_dicts(i, i + STREAM_CHUNK_SIZE)
+
+
+async def iter_fanout_chunks(page_args: Dict[str, Any], stats: Dict[str, Any]) -> AsyncIterator[List[Dict[str, Any]]]:
+    # Her parça kendi cache anahtarıyla getirilir; tamamlanan parçanın yeni satırları hemen üretilir
+    shards = shard_arguments(page_args, FANOUT_MAX_SHARDS)
+    stats["shards"] = len(shards)
+    stats["truncated_shards"] = 0
+
+    async def fetch_shard(shard: Dict[str, Any]) -> List[Dict[str, Any]]:
+        # Cevapta devam cursor'ı olmadığından her parça MCP_MAX_LIMIT'lik sayfalarla sonuna kadar okunur
+        rows, complete = await fetch_all_pages(
+            shard, get_tenders, MCP_MAX_LIMIT, FANOUT_MAX_PAGES,
+        )
+        if not complete:
+            stats["truncated_shards"] += 1
+        return rows
+
+    async for _, _, fresh in iter_shard_results(shards, fetch_shard, FANOUT_CONCURRENCY):
+        for i in range(0, len(fresh), STREAM_CHUNK_SIZE):
+            yield fresh[i:i + STREAM_CHUNK_SIZE]
+    stats["complete"] = not stats["truncated_shards"]
+
+
+def fanout_result_id(page_args: Dict[str, Any]) -> str:
+    return result_set_id(dict(page_args, fanout=True))
+
+
+def stream_format(request: Request, body: Dict[str, Any]) -> Optional[str]:
+    accept = request.headers.get("accept", "")
+    if "text/event-stream" in accept:
+        return "sse"
+    if "application/x-ndjson" in accept or body.get("stream"):
+        return "ndjson"
+    return None
+
+
+def format_stream_event(event: Dict[str, Any], fmt: str) -> bytes:
+    t0 = time.perf_counter()
+    data = json.dumps(event, ensure_ascii=False)
+    if fmt == "sse":
+        body = f"event: {event['type']}\ndata: {data}\n\n".encode("utf-8")
+    else:
+        body = (data + "\n").encode("utf-8")
+    STAGE_SERIALIZE.observe(time.perf_counter() - t0)
+    return body
+
+
+async def stream_run(
+    query: str,
+    page_args: Optional[Dict[str, Any]],
+    fmt: str,
+    fanout: bool = False,
+) -> AsyncIterator[bytes]:
+    # Olay sırası: meta (mcp_arguments) → tenders (parça parça) → end (next_cursor)
+    # Başlıklar akıştan önce gittiği için aşama süreleri end olayında taşınır
+    t0 = time.perf_counter()
+    try:
+        with deadline_scope(REQUEST_DEADLINE), request_timings() as timings:
+            if page_args is None:
+                page_args = first_page_arguments(await translate_query(query))
+            fanout = fanout and not page_args.get("skip")
+            rid = fanout_result_id(page_args) if fanout else result_set_id(page_args)
+            # JSON yolundaki gibi sonuç boş olsa da result_id /api/filter'da bulunsun
+            result_sets.add(rid, [])
+            yield format_stream_event({"type": "meta", "mcp_arguments": page_args, "result_id": rid}, fmt)
+
+            count = 0
+            stats: Dict[str, Any] = {}
+            chunks = iter_fanout_chunks(page_args, stats) if fanout else iter_tender_chunks(page_args)
+            async for chunk in chunks:
+                count += len(chunk)
+                result_sets.add(rid, chunk)
+                yield format_stream_event({"type": "tenders", "tenders": chunk}, fmt)
+
+            RESULT_STREAM.observe(count)
+            end = {"type": "end", "count": count}
+            end["server_timing"] = {name: round(v * 1000, 1) for name, v in timings.items()}
+            end["server_timing"]["total"] = round((time.perf_counter() - t0) * 1000, 1)
+            if fanout:
+                # Parçalı sonuç tek bir skip ile devam ettirilemez
+                end.update(next_cursor=None, fanout=stats)
+            else:
+                end["next_cursor"] = next_page_cursor(page_args, count)
+            yield format_stream_event(end, fmt)
+    except Exception as e:
+        count_error("stream", e)
+        yield format_stream_event({"type": "error", "error": str(e)}, fmt)
+
+
 @app.get("/", response_class=HTMLResponse)
 async def index():
     return HTMLResponse(content=HTML_TEMPLATE)
 
 
+async def fanout_response(request: Request, page_args: Dict[str, Any]):
+    stats: Dict[str, Any] = {}
+    tenders: List[Dict[str, Any]] = []
+    async for chunk in iter_fanout_chunks(page_args, stats):
+        tenders.extend(chunk)
+    # Parçalar tamamlanma sırasıyla geldiğinden cevap tarihe göre sıralanır
+    tenders.sort(key=lambda t: (tender_iso_date(t.get("tender_datetime")), t.get("ikn") or ""))
+    rid = fanout_result_id(page_args)
+    result_sets.add(rid, tenders)
+    RESULT_FANOUT.observe(len(tenders))
+    with STAGE_SERIALIZE.time():
+        return json_response(request, {
+            "mcp_arguments": page_args,
+            "result_id": rid,
+            "tenders": tenders,
+            "next_cursor": None,
+            "fanout": stats,
+        }, etag_seed=canonical_arguments(dict(page_args, fanout=True)))
+
+
+async def run_request(
+    request: Request,
+    query: str,
+    cursor: Optional[str],
+    fmt: Optional[str],
+    fanout: bool = False,
+):
+    profile_id = None
+    if wants_profile(request, ADMIN_TOKEN):
+        profile_id = profile_store.new_id({"path": request.url.path, "query": query, "stream": bool(fmt)})
+
+    t0 = time.perf_counter()
+    # Akışta asıl iş gövde üretilirken yapılır; profil orada açılır
+    with request_timings() as timings, profiled(profile_store, None if fmt else profile_id):
+        response = await handle_run(request, query, cursor, fmt, fanout)
+
+    if isinstance(response, StreamingResponse):
+        if profile_id is not None:
+            response.body_iterator = profiled_chunks(response.body_iterator, profile_store, profile_id)
+    else:
+        response.headers["Server-Timing"] = server_timing_header(timings, time.perf_counter() - t0)
+    if profile_id is not None:
+        response.headers["X-Profile-Id"] = profile_id
+    return response
+
+
+async def handle_run(
+    request: Request,
+    query: str,
+    cursor: Optional[str],
+    fmt: Optional[str],
+    fanout: bool = False,
+):
+    if not query and not cursor:
+        return JSONResponse({"error": "query boş"}, status_code=400)
+
+    page_args: Optional[Dict[str, Any]] = None
+    if cursor:
+        try:
+            page_args = decode_cursor(cursor)
+        except ValueError as e:
+            return JSONResponse({"error": str(e)}, status_code=400)
+
+    if fmt:
+        media_type = "text/event-stream" if fmt == "sse" else "application/x-ndjson"
+        return StreamingResponse(
+            stream_run(query, page_args, fmt, fanout),
+            media_type=media_type,
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    try:
+        with deadline_scope(REQUEST_DEADLINE):
+            if page_args is None:
+                page_args = first_page_arguments(await translate_query(query))
+            if fanout and not page_args.get("skip"):
+                return await fanout_response(request, page_args)
+            tenders = (await get_tenders(page_args)).to_dicts()
+        rid = result_set_id(page_args)
+        result_sets.add(rid, tenders)
+        RESULT_RUN.observe(len(tenders))
+
+        with STAGE_SERIALIZE.time():
+            return json_response(request, {
+                "mcp_arguments": page_args,
+                "result_id": rid,
+                "tenders": tenders,
+                "next_cursor": next_page_cursor(page_args, len(tenders)),
+            }, etag_seed=canonical_arguments(page_args))
+    except CircuitOpen as e:
+        count_error("run", e)
+        retry_after = max(mcp_breaker.retry_after(), llm_breaker.retry_after())
+        return JSONResponse({"error": str(e)}, status_code=503, headers={"Retry-After": str(int(retry_after) + 1)})
+    except DeadlineExceeded as e:
+        count_error("run", e)
+        return JSONResponse({"error": str(e)}, status_code=504)
+    except Exception as e:
+        count_error("run", e)
+        import traceback
+        return JSONResponse({"error": str(e), "traceback": traceback.format_exc()}, status_code=500)
+
+
 @app.post("/api/run")
 async def api_run(request: Request):
     body = await request.json()
-    query = body.get("query", "").strip()
+    query = (body.get("query") or "").strip()
+    return await run_request(
+        request, query, body.get("cursor"), stream_format(request, body), bool(body.get("fanout")),
+    )
 
-    if not query:
-        return JSONResponse({"error": "query boş"}, status_code=400)
+
+@app.get("/api/run")
+async def api_run_get(request: Request, query: str = "", cursor: Optional[str] = None, fanout: bool = False):
+    # GET varyantı: tarayıcı/HTTP cache'leri ETag ile yeniden doğrulayıp 304 alabilir
+    return await run_request(request, query.strip(), cursor, stream_format(request, {}), fanout)
+
+
+@app.post("/api/filter")
+async def api_filter(request: Request):
+    body = await request.json()
+    index = result_sets.index(body.get("result_id") or "")
+    if index is None:
+        return JSONResponse({"error": "sonuç seti bulunamadı, önce /api/run çağrılmalı"}, status_code=404)
 
     try:
-        mcp_args = build_mcp_arguments_with_gpt(query)
-        mcp_result = call_mcp_tool(MCP_TOOL_NAME, mcp_args)
-
-        tenders: List[Dict[str, Any]] = []
-        if isinstance(mcp_result, dict):
-            sc = mcp_result.get("structuredContent")
-            if isinstance(sc, dict) and isinstance(sc.get("tenders"), list):
-                for item in sc["tenders"]:
-                    tenders.append(normalize_tender_item(item))
-
-        return JSONResponse({
-            "mcp_arguments": mcp_args,
-            "tenders": tenders,
+        offset = max(int(body.get("offset") or 0), 0)
+        limit = min(max(int(body.get("limit") or 100), 1), MCP_MAX_LIMIT)
+    except (TypeError, ValueError):
+        return JSONResponse({"error": "offset/limit sayı olmalı"}, status_code=400)
+
+    t0 = time.perf_counter()
+    mask = index.filter(
+        text=body.get("text") or "",
+        tender_type=body.get("type") or "",
+        province=body.get("province") or "",
+        date_start=body.get("date_start") or "",
+        date_end=body.get("date_end") or "",
+        document=body.get("document") or "",
+    )
+    rows = index.select(mask, offset=offset, limit=limit)
+    took_ms = (time.perf_counter() - t0) * 1000
+    RESULT_FILTER.observe(len(rows))
+
+    with STAGE_SERIALIZE.time():
+        return json_response(request, {
+            "total": index.n,
+            "count": mask.bit_count(),
+            "offset": offset,
+            "tenders": rows,
+            "facets": index.facets(),
+            "took_ms": round(took_ms, 3),
         })
-    except Exception as e:
-        import traceback
-        return JSONResponse({"error": str(e), "traceback": traceback.format_exc()}, status_code=500)
+
+
+@app.get("/api/admin/profiles")
+async def api_profiles(request: Request):
+    if not is_admin(request, ADMIN_TOKEN):
+        return JSONResponse({"error": "yetkisiz"}, status_code=403)
+    return JSONResponse({"profiles": profile_store.list()})
+
+
+@app.get("/api/admin/profiles/{profile_id}")
+async def api_profile(request: Request, profile_id: str, format: str = "prof", sort: str = "cumulative"):
+    if not is_admin(request, ADMIN_TOKEN):
+        return JSONResponse({"error": "yetkisiz"}, status_code=403)
+    meta = profile_store.meta(profile_id)
+    if meta is None:
+        return JSONResponse({"error": "profil bulunamadı"}, status_code=404)
+    if meta["status"] != "ready":
+        return JSONResponse({"error": f"profil hazır değil ({meta['status']})", "profile": meta}, status_code=409)
+
+    if format == "text":
+        try:
+            text = profile_store.text(profile_id, sort)
+        except KeyError:
+            return JSONResponse({"error": f"geçersiz sıralama: {sort}"}, status_code=400)
+        return Response(text, media_type="text/plain; charset=utf-8")
+    return Response(
+        profile_store.dump(profile_id),
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": f'attachment; filename="profile-{profile_id}.prof"'},
+    )
+
+
+@app.get("/metrics")
+async def metrics():
+    return Response(metrics_registry.render(), media_type=METRICS_CONTENT_TYPE)
+
+
+@app.get("/api/stats")
+async def api_stats():
+    return JSONResponse({
+        "translation_cache": translation_cache.stats(),
+        "translation_sources": translation_sources,
+        "result_cache": result_cache.stats(),
+        "result_sets": result_sets.stats(),
+        "singleflight": {
+            "translation": translation_flight.stats(),
+            "mcp": mcp_flight.stats(),
+        },
+        "resilience": {
+            "request_deadline_seconds": REQUEST_DEADLINE,
+            "mcp": {
+                "breaker": mcp_breaker.stats(),
+                "retry": mcp_retry.stats(),
+                "hedge": mcp_hedger.stats() if MCP_HEDGE else None,
+                "stream_hedge": mcp_stream_hedger.stats() if MCP_HEDGE else None,
+            },
+            "llm": {"breaker": llm_breaker.stats(), "retry": llm_retry.stats()},
+            "stale_served": degraded["stale_served"],
+        },
+        "tender_store": tender_store.stats() if tender_store is not None else None,
+        "sync": sync_worker.stats() if sync_worker is not None else None,
+    })
 
 
 if __name__ == "__main__":
@@ -0,0 +1,86 @@
+"""
+/api/run eşzamanlılık benchmark'ı.
+
+Sahte LLM ve sahte MCP (httpx.MockTransport) sabit gecikmeyle cevap verir;
+aynı anda uçuşta olan istek sayısı arttıkça tek worker'ın throughput'u ölçülür.
+--blocking bayrağı eski senkron davranışı (event loop'u bloklayan çağrılar) taklit eder.
+
+Kullanım: python benchmarks/bench_concurrency.py [--requests 64] [--llm-delay 0.2] [--mcp-delay 0.1] [--blocking]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+
+from common import fake_openai_client, make_mcp_result, percentile
+
+import app as app_module
+
+
+def make_mcp_transport(delay: float, n_tenders: int, blocking: bool) -> httpx.MockTransport:
+    body = json.dumps(make_mcp_result(n_tenders), ensure_ascii=False).encode("utf-8")
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if blocking:
+            time.sleep(delay)
+        else:
+            await asyncio.sleep(delay)
+        return httpx.Response(200, content=body, headers={"Content-Type": "application/json"})
+
+    return httpx.MockTransport(handler)
+
+
+async def run_level(concurrency: int, total: int) -> dict:
+    transport = httpx.ASGITransport(app=app_module.app)
+    latencies = []
+    sem = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        async def one(i: int):
+            async with sem:
+                t0 = time.perf_counter()
+                resp = await http.post("/api/run", json={"query": f"benchmark sorgusu {concurrency}-{i}"})
+                resp.raise_for_status()
+                latencies.append(time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(total)))
+        elapsed = time.perf_counter() - t0
+
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        "throughput_rps": total / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--llm-delay", type=float, default=0.2)
+    parser.add_argument("--mcp-delay", type=float, default=0.1)
+    parser.add_argument("--tenders", type=int, default=100)
+    parser.add_argument("--levels", default="1,2,4,8,16,32")
+    parser.add_argument("--blocking", action="store_true")
+    args = parser.parse_args()
+
+    app_module.client = fake_openai_client(args.llm_delay, args.blocking)
+    app_module.mcp_http = httpx.AsyncClient(transport=make_mcp_transport(args.mcp_delay, args.tenders, args.blocking))
+
+    mode = "blocking" if args.blocking else "async"
+    print(f"mod={mode} llm={args.llm_delay}s mcp={args.mcp_delay}s istek={args.requests}")
+    print(f"{'eşzamanlılık':>12} {'req/s':>10} {'p50 ms':>10} {'p95 ms':>10}")
+    for level in [int(x) for x in args.levels.split(",")]:
+        r = await run_level(level, args.requests)
+        print(f"{r['concurrency']:>12} {r['throughput_rps']:>10.1f} {r['p50_ms']:>10.1f} {r['p95_ms']:>10.1f}")
+
+    await app_module.mcp_http.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,161 @@
+"""
+EKAP sonuç listesinden veri çıkarma: öğe başına locator'lar ve sayfa başına tek evaluate.
+
+make_ekap_row verisinden EKAP'taki ihale-liste-item yapısında bir sayfa üretilip
+Chromium'a set_content ile yüklenir (ağ yok). Aynı sayfa önce extract_ihale_data
+ile (ekap.py'nin eski, her öğe ve alan için ayrı locator sorgusu yapan çıkarıcısı;
+burada karşılaştırma tabanı olarak tutulur), sonra ekap.extract_page_items ile
+(tek page.evaluate) okunur; iki çıktının aynı olduğu doğrulanır ve saniyedeki öğe
+sayısı raporlanır.
+
+Gerekli: pip install playwright && playwright install chromium
+Kullanım: python benchmarks/bench_ekap_extract.py [--items 20] [--rounds 5]
+"""
+
+import argparse
+import html
+import time
+
+from common import make_ekap_row
+
+from playwright.sync_api import sync_playwright
+
+import ekap
+
+
+def render_item(row: dict) -> str:
+    durum_class = "badge--success" if row["katilim_durumu"].endswith("Katılıma Açık") else "badge--secondary"
+    return (
+        "<ihale-liste-item><div class='card'>"
+        f"<span class='ikn'>{html.escape(row['ikn'])}</span>"
+        f"<span class='ihale'>{html.escape(row['ihale'])}</span>"
+        f"<span class='il-saat'>{html.escape(row['il_saat'])}</span>"
+        f"<span class='badge badge--large badge--danger'>{html.escape(row['ihale_turu'])}</span>"
+        f"<span class='badge {durum_class}'>{html.escape(row['katilim_durumu'])}</span>"
+        "</div></ihale-liste-item>"
+    )
+
+
+def render_page(n: int) -> str:
+    items = "".join(render_item(make_ekap_row(i)) for i in range(n))
+    return f"<html><body><div class='ihale-liste'>{items}</div></body></html>"
+
+
+def extract_ihale_data(item):
+    """
+    Tek bir ihale-liste-item elementinden verileri çıkarır (ekap.py'nin eski çıkarıcısı;
+    karşılaştırma tabanı).
+    
+    Args:
+        item: Playwright locator (ihale-liste-item elementi)
+    
+    Returns:
+        Dict: İhale verileri
+    """
+    data = {}
+    
+    # İhale adı
+    ihale_loc = item.locator('span.ihale')
+    data['ihale'] = safe_get_text(ihale_loc)
+    
+    # IKN (İhale Kayıt Numarası)
+    ikn_loc = item.locator('span.ikn')
+    data['ikn'] = safe_get_text(ikn_loc)
+    
+    # İl ve Saat bilgisi
+    il_saat_loc = item.locator('span.il-saat')
+    data['il_saat'] = safe_get_text(il_saat_loc)
+    
+    # İhale Türü - TÜM badge'leri kontrol et (Hizmet, Mal, Yapım, Danışmanlık)
+    # badge--danger genelde ihale türünü gösterir
+    # Tüm span.badge elementlerini kontrol ediyoruz
+    ihale_turu = ''
+    
+    # Önce badge--large olanları dene (bunlar genelde tür bilgisi)
+    badge_large_locs = item.locator('span.badge.badge--large')
+    if badge_large_locs.count() > 0:
+        for i in range(badge_large_locs.count()):
+            badge_text = safe_get_text(badge_large_locs.nth(i))
+            # İhale türlerini kontrol et
+            if badge_text in ekap.IHALE_TURLERI:
+                ihale_turu = badge_text
+                break
+    
+    # Eğer bulunamadıysa tüm badge'lere bak
+    if not ihale_turu:
+        all_badges = item.locator('span.badge')
+        if all_badges.count() > 0:
+            for i in range(all_badges.count()):
+                badge_text = safe_get_text(all_badges.nth(i))
+                if badge_text in ekap.IHALE_TURLERI:
+                    ihale_turu = badge_text
+                    break
+    
+    data['ihale_turu'] = ihale_turu
+    
+    # Katılım durumu (badge--success olanlar genelde katılım bilgisi)
+    badge_success_loc = item.locator('span.badge.badge--success')
+    data['katilim_durumu'] = safe_get_text(badge_success_loc)
+    
+    # Tüm badge metinlerini de kaydedelim (debug için)
+    all_badges = item.locator('span.badge')
+    badge_texts = []
+    if all_badges.count() > 0:
+        for i in range(all_badges.count()):
+            text = safe_get_text(all_badges.nth(i))
+            if text:
+                badge_texts.append(text)
+    data['tum_badgeler'] = ' | '.join(badge_texts)
+    
+    return data
+
+
+def safe_get_text(locator):
+    """
+    Locator'dan güvenli şekilde text alır.
+    Element yoksa boş string döner.
+    """
+    try:
+        if locator.count() > 0:
+            return (locator.first.text_content() or '').strip()
+    except Exception:
+        pass
+    return ''
+
+
+def per_item(page):
+    return [extract_ihale_data(item) for item in page.locator("ihale-liste-item").all()]
+
+
+def measure(label: str, fn, page, rounds: int):
+    fn(page)  # ısınma
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        result = fn(page)
+    elapsed = time.perf_counter() - t0
+    rate = len(result) * rounds / elapsed
+    print(f"{label:<28}{elapsed / rounds * 1e3:>10.1f} ms/sayfa{rate:>12.0f} öğe/s")
+    return result, rate
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=20, help="sayfadaki ihale sayısı (EKAP sayfası 20)")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        page = browser.new_page()
+        page.set_content(render_page(args.items))
+        before, before_rate = measure("extract_ihale_data (öncesi)", per_item, page, args.rounds)
+        after, after_rate = measure("extract_page_items (sonrası)", ekap.extract_page_items, page, args.rounds)
+        browser.close()
+
+    if before != after:
+        raise SystemExit("HATA: iki çıkarıcının çıktısı farklı")
+    print(f"çıktılar aynı ({len(after)} öğe); hızlanma: {after_rate / before_rate:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
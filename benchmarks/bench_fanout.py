@@ -0,0 +1,92 @@
+"""
+Parçalı (fan-out) çalıştırmanın duvar saati süresine etkisi.
+
+Sahte MCP çağrısının süresi sabit bir gecikme ile dönen satır sayısıyla orantılı
+bir kısmın toplamıdır (büyük cevap = uzun sunucu işlemi + aktarım); limit ve skip
+uygulanır. Aynı geniş sorgu uygulamadaki gibi MCP_MAX_LIMIT'lik sayfalarla sonuna
+kadar okunur: bölünmeden sırayla ve shard_arguments parçaları paralel olarak.
+
+Kullanım: python benchmarks/bench_fanout.py [--days 90] [--per-day 40] [--concurrency 4]
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import date, timedelta
+
+import common  # noqa: F401  (sys.path ayarı)
+
+import app as app_module
+from fanout import fetch_all_pages, iter_shard_results, shard_arguments
+
+
+def make_fetch(per_day: int, base_latency: float, per_row: float):
+    async def fetch(args):
+        start = date.fromisoformat(args["tender_date_start"])
+        end = date.fromisoformat(args["tender_date_end"])
+        rows = [
+            {"ikn": f"{(start + timedelta(days=d)).isoformat()}/{i}"}
+            for d in range((end - start).days + 1)
+            for i in range(per_day)
+        ]
+        skip = args.get("skip") or 0
+        rows = rows[skip:skip + args["limit"]]
+        await asyncio.sleep(base_latency + per_row * len(rows))
+        return rows
+
+    return fetch
+
+
+async def run(shards, fetch, concurrency):
+    calls = {"mcp": 0, "truncated": 0}
+
+    async def counted(args):
+        calls["mcp"] += 1
+        return await fetch(args)
+
+    async def fetch_shard(shard):
+        # iter_fanout_chunks ile aynı sayfalama
+        rows, complete = await fetch_all_pages(shard, counted, app_module.MCP_MAX_LIMIT, app_module.FANOUT_MAX_PAGES)
+        calls["truncated"] += not complete
+        return rows
+
+    t0 = time.perf_counter()
+    total = 0
+    async for _, _, fresh in iter_shard_results(shards, fetch_shard, concurrency):
+        total += len(fresh)
+    return total, time.perf_counter() - t0, calls
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--per-day", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=app_module.FANOUT_CONCURRENCY)
+    parser.add_argument("--max-shards", type=int, default=app_module.FANOUT_MAX_SHARDS)
+    parser.add_argument("--base-latency", type=float, default=0.15)
+    parser.add_argument("--per-row", type=float, default=0.0005)
+    args = parser.parse_args()
+
+    today = date.today()
+    query = {
+        "tender_date_filter": "date_range",
+        "tender_date_start": today.isoformat(),
+        "tender_date_end": (today + timedelta(days=args.days - 1)).isoformat(),
+        # first_page_arguments ile aynı; fan-out parçaları bunu MCP_MAX_LIMIT ile değiştirir
+        "limit": app_module.MCP_PAGE_SIZE,
+    }
+    fetch = make_fetch(args.per_day, args.base_latency, args.per_row)
+    shards = shard_arguments(query, args.max_shards)
+
+    single_rows, single_s, single_calls = asyncio.run(run([query], fetch, 1))
+    fan_rows, fan_s, fan_calls = asyncio.run(run(shards, fetch, args.concurrency))
+    assert single_rows == fan_rows == args.days * args.per_day, (single_rows, fan_rows)
+
+    print(f"{single_rows} ihale, {len(shards)} parça, eşzamanlılık {args.concurrency}, "
+          f"sayfa {app_module.MCP_MAX_LIMIT}")
+    print(f"  bölünmeden: {single_s * 1e3:7.0f}ms  {single_calls['mcp']} MCP çağrısı")
+    print(f"  fan-out   : {fan_s * 1e3:7.0f}ms  {fan_calls['mcp']} MCP çağrısı ({single_s / fan_s:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+/api/filter indeksleri: arayüzdeki applyFilters'ın doğrusal taramasıyla
+TenderIndex bitmap sorgularının karşılaştırması.
+
+Kullanım: python benchmarks/bench_filter.py [--rows 50000]
+"""
+
+import argparse
+import time
+
+from common import make_raw_tender, percentile
+
+import app as app_module
+from tender_index import TEXT_FIELDS, TenderIndex, tender_iso_date
+from turkish import turkish_lower
+
+QUERIES = [
+    {},
+    {"text": "tıbbi"},
+    {"text": "sağlık müdürlüğü 12"},
+    {"tender_type": "Yapım", "province": "İzmir"},
+    {"date_start": "2025-03-01", "date_end": "2025-04-15"},
+    {"document": "yes", "text": "sarf"},
+    {"tender_type": "Hizmet", "date_start": "2025-06-01", "document": "no", "text": "hastane"},
+]
+
+
+def linear_filter(rows, text="", tender_type="", province="", date_start="", date_end="", document=""):
+    # applyFilters'ın Python karşılığı (haystack her satırda yeniden kurulur)
+    text = turkish_lower(text)
+    out = []
+    for t in rows:
+        if tender_type and t["type"] != tender_type:
+            continue
+        if province and t["province"] != province:
+            continue
+        if date_start or date_end:
+            iso = tender_iso_date(t["tender_datetime"])
+            if date_start and iso and iso < date_start:
+                continue
+            if date_end and iso and iso > date_end:
+                continue
+        if document == "yes" and not t["document_url"]:
+            continue
+        if document == "no" and t["document_url"]:
+            continue
+        if text and turkish_lower(" ".join(str(t.get(f) or "") for f in TEXT_FIELDS)).find(text) == -1:
+            continue
+        out.append(t)
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    rows = [app_module.normalize_tender_item(make_raw_tender(i)) for i in range(args.rows)]
+
+    t0 = time.perf_counter()
+    index = TenderIndex(rows[:-100])
+    build_ms = (time.perf_counter() - t0) * 1000
+    t0 = time.perf_counter()
+    index.add(rows[-100:])
+    add_ms = (time.perf_counter() - t0) * 1000
+    t0 = time.perf_counter()
+    index.filter(text="x")
+    first_ms = (time.perf_counter() - t0) * 1000
+    vocab = len(index._token_masks) + len(index._token_rows)
+    print(f"indeks kurulumu: {build_ms:.0f} ms ({args.rows} satır, {vocab} kelime), "
+          f"100 satırlık sayfa ekleme: {add_ms:.1f} ms, ilk metin sorgusu (sözlük sıralama): {first_ms:.1f} ms")
+
+    print(f"{'sorgu':<70} {'eşleşme':>8} {'doğrusal ms':>12} {'indeks p50 µs':>14} {'p99 µs':>8}")
+    for q in QUERIES:
+        t0 = time.perf_counter()
+        expected = linear_filter(rows, **q)
+        linear_ms = (time.perf_counter() - t0) * 1000
+
+        timings = []
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            mask = index.filter(**q)
+            index.select(mask, limit=100)
+            timings.append(time.perf_counter() - t0)
+
+        count = mask.bit_count()
+        if not q.get("text"):
+            assert count == len(expected), (q, count, len(expected))
+        print(f"{str(q):<70} {count:>8} {linear_ms:>12.1f} "
+              f"{percentile(timings, 50) * 1e6:>14.1f} {percentile(timings, 99) * 1e6:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Hedge edilmiş MCP çağrılarının kuyruk gecikmesine etkisi.
+
+Sahte upstream çağrıların çoğu hızlı, küçük bir kısmı çok yavaş döner (ağır
+kuyruk). Aynı çağrı dizisi doğrudan ve Hedger üzerinden çalıştırılır; p50, p95,
+p99 ve upstream'e giden toplam çağrı sayısı (hedge maliyeti) raporlanır.
+
+Kullanım: python benchmarks/bench_hedging.py [--calls 400] [--slow-ratio 0.05] [--slow 1.0]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from common import percentile
+
+from resilience import Hedger
+
+
+def make_upstream(fast: float, slow: float, slow_ratio: float, seed: int):
+    rng = random.Random(seed)
+    counter = {"calls": 0}
+
+    async def call():
+        counter["calls"] += 1
+        delay = slow if rng.random() < slow_ratio else fast * rng.uniform(0.8, 1.5)
+        await asyncio.sleep(delay)
+        return delay
+
+    return call, counter
+
+
+async def measure(run, calls: int, concurrency: int):
+    latencies = []
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with sem:
+            t0 = time.perf_counter()
+            await run()
+            latencies.append(time.perf_counter() - t0)
+
+    await asyncio.gather(*(one() for _ in range(calls)))
+    return latencies
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--fast", type=float, default=0.05)
+    parser.add_argument("--slow", type=float, default=1.0)
+    parser.add_argument("--slow-ratio", type=float, default=0.05)
+    args = parser.parse_args()
+
+    print(f"{args.calls} çağrı, %{args.slow_ratio * 100:.0f}'i {args.slow}s, kalanı ~{args.fast}s")
+    print(f"{'':>10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'upstream':>9}")
+    for label in ("doğrudan", "hedge"):
+        call, counter = make_upstream(args.fast, args.slow, args.slow_ratio, seed=1)
+        if label == "hedge":
+            hedger = Hedger()
+            # Isınma: gecikme dağılımı öğrenilsin
+            await measure(lambda: hedger.run(call), 50, args.concurrency)
+            counter["calls"] = 0
+            run = lambda: hedger.run(call)  # noqa: E731
+        else:
+            run = call
+        latencies = await measure(run, args.calls, args.concurrency)
+        print(f"{label:>10} {percentile(latencies, 50) * 1e3:>8.0f} {percentile(latencies, 95) * 1e3:>8.0f} "
+              f"{percentile(latencies, 99) * 1e3:>8.0f} {counter['calls']:>9}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,77 @@
+"""
+MCP cevap ayrıştırma: eski yol (tüm gövde → splitlines → join → json.loads)
+ile artımlı ayrıştırıcının (mcp_stream.iter_mcp_items) süre ve tepe bellek karşılaştırması.
+
+Kullanım: python benchmarks/bench_mcp_parser.py [--sizes 100,2000,20000]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+
+from common import iter_mcp_body
+
+from mcp_stream import iter_mcp_items
+
+
+def old_parse(chunks, sse: bool) -> int:
+    # call_mcp_tool'un önceki davranışı: resp.text + satır satır data birleştirme
+    text_body = b"".join(chunks).decode("utf-8")
+    if sse:
+        json_chunks = []
+        for line in text_body.splitlines():
+            line = line.strip()
+            if line.startswith("data:"):
+                json_chunks.append(line[len("data:"):].strip())
+        data = json.loads("\n".join(json_chunks))
+    else:
+        data = json.loads(text_body)
+    count = 0
+    for _ in data["result"]["structuredContent"]["tenders"]:
+        count += 1
+    return count
+
+
+async def new_parse(chunks, sse: bool) -> int:
+    async def agen():
+        for chunk in chunks:
+            yield chunk
+
+    content_type = "text/event-stream" if sse else "application/json"
+    count = 0
+    async for _ in iter_mcp_items(agen(), content_type):
+        count += 1
+    return count
+
+
+def measure(fn):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="100,2000,20000")
+    args = parser.parse_args()
+
+    print(f"{'ihale':>7} {'çerçeve':>8} {'yol':>8} {'süre ms':>10} {'tepe KB':>10}")
+    for n in [int(x) for x in args.sizes.split(",")]:
+        for sse in (False, True):
+            frame = "sse" if sse else "json"
+            count, elapsed, peak = measure(lambda: old_parse(iter_mcp_body(n, sse=sse), sse))
+            assert count == n
+            print(f"{n:>7} {frame:>8} {'eski':>8} {elapsed * 1000:>10.1f} {peak / 1024:>10.0f}")
+            count, elapsed, peak = measure(lambda: asyncio.run(new_parse(iter_mcp_body(n, sse=sse), sse)))
+            assert count == n
+            print(f"{n:>7} {frame:>8} {'artımlı':>8} {elapsed * 1000:>10.1f} {peak / 1024:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
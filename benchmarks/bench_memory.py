@@ -0,0 +1,59 @@
+"""
+Cache'lenmiş sonuç setinin bellek kullanımı: dict listesi ile sütun tabanlı
+TenderBatch karşılaştırması (tracemalloc ile ölçülür) ve kenarda dict'e
+dönüşüm maliyeti.
+
+Kullanım: python benchmarks/bench_memory.py [--tenders 5000]
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+
+from common import make_raw_tender
+
+import app as app_module
+from tender_batch import TenderBatch
+
+
+def measure(build):
+    # Ham MCP verisi ölçüme girmesin diye JSON'dan yeniden üretilir
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    value = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return value, after - before
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tenders", type=int, default=5000)
+    args = parser.parse_args()
+
+    raw_json = json.dumps([make_raw_tender(i) for i in range(args.tenders)])
+
+    def as_dicts():
+        return app_module.normalize_tenders(json.loads(raw_json))
+
+    tenders, dict_bytes = measure(as_dicts)
+    # Ara dict'ler serbest kalır; yalnızca batch'in tuttuğu ölçülür
+    batch, batch_bytes = measure(lambda: TenderBatch(as_dicts()))
+    assert batch.to_dicts() == tenders
+
+    n = args.tenders
+    print(f"{n} ihale")
+    print(f"  dict listesi : {dict_bytes / 1024:8.0f} KiB ({dict_bytes / n:6.0f} B/ihale)")
+    print(f"  TenderBatch  : {batch_bytes / 1024:8.0f} KiB ({batch_bytes / n:6.0f} B/ihale, "
+          f"{dict_bytes / batch_bytes:.1f}x daha az)")
+    print(f"  nbytes() tahmini: {batch.nbytes() / n:.0f} B/ihale")
+
+    t0 = time.perf_counter()
+    batch.to_dicts()
+    convert = time.perf_counter() - t0
+    print(f"  to_dicts(): {convert * 1e3:.1f}ms ({convert / n * 1e6:.2f}µs/ihale)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+/metrics toplama maliyeti.
+
+1. Histogram.observe ve sayaç artırma başına maliyet.
+2. fetch_mcp_page (sahte MCP, N ihale) metrikler açıkken ve ölçüm noktaları
+   (gövde parçası bekleme, ayrıştırma süresi, aşama gözlemleri) devre dışıyken.
+3. Dolu bir registry için /metrics render süresi.
+
+Kullanım: python benchmarks/bench_metrics.py [--tenders 2000] [--repeat 20]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import timeit
+
+import httpx
+
+from common import make_mcp_result, percentile
+
+import app as app_module
+import metrics
+from mcp_stream import iter_mcp_items
+
+
+async def passthrough(source, watch):
+    async for item in source:
+        yield item
+
+
+def untimed_items(chunks, content_type, timer=None):
+    return iter_mcp_items(chunks, content_type)
+
+
+class NullStage:
+    def observe(self, value):
+        pass
+
+
+async def time_fetch(n_repeat: int, args) -> list:
+    timings = []
+    for _ in range(n_repeat):
+        t0 = time.perf_counter()
+        await app_module.fetch_mcp_page(args)
+        timings.append(time.perf_counter() - t0)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tenders", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    registry = metrics.Registry()
+    hist = registry.histogram("bench_seconds", "bench", ["stage"]).labels("x")
+    counter = registry.counter("bench_total", "bench", ["kind"]).labels("x")
+    n = 200000
+    print(f"Histogram.observe : {timeit.timeit(lambda: hist.observe(0.0123), number=n) / n * 1e9:.0f}ns")
+    print(f"Counter.inc       : {timeit.timeit(counter.inc, number=n) / n * 1e9:.0f}ns")
+
+    body = json.dumps(make_mcp_result(args.tenders), ensure_ascii=False).encode("utf-8")
+    app_module.mcp_http = httpx.AsyncClient(transport=httpx.MockTransport(
+        lambda request: httpx.Response(200, content=body, headers={"Content-Type": "application/json"})
+    ))
+    mcp_args = {"search_text": "", "limit": args.tenders}
+
+    saved = (app_module.timed_aiter, app_module.iter_mcp_items,
+             app_module.STAGE_MCP, app_module.STAGE_PARSE, app_module.STAGE_NORMALIZE)
+    with_metrics, without = [], []
+    asyncio.run(time_fetch(3, mcp_args))  # ısınma
+    # Sıra etkisini (ısınma, GC) dengelemek için iki mod dönüşümlü ölçülür
+    for _ in range(args.repeat):
+        with_metrics += asyncio.run(time_fetch(1, mcp_args))
+        app_module.timed_aiter = passthrough
+        app_module.iter_mcp_items = untimed_items
+        app_module.STAGE_MCP = app_module.STAGE_PARSE = app_module.STAGE_NORMALIZE = NullStage()
+        without += asyncio.run(time_fetch(1, mcp_args))
+        (app_module.timed_aiter, app_module.iter_mcp_items,
+         app_module.STAGE_MCP, app_module.STAGE_PARSE, app_module.STAGE_NORMALIZE) = saved
+
+    base = percentile(without, 50)
+    measured = percentile(with_metrics, 50)
+    print(f"fetch_mcp_page ({args.tenders} ihale) p50:")
+    print(f"  ölçümsüz : {base * 1e3:.2f}ms")
+    print(f"  metrikli : {measured * 1e3:.2f}ms ({(measured - base) / base * 100:+.1f}%)")
+
+    t0 = time.perf_counter()
+    text = app_module.metrics_registry.render()
+    print(f"/metrics render: {(time.perf_counter() - t0) * 1e3:.2f}ms, {len(text)} byte")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+MCP kayıtlarının normalize edilmesi: her alanda koşulsuz latin1/utf-8 gidiş-dönüşü
+yapan eski yol ile ön kontrollü, tekrar eden değerleri önbelleğe alan normalize_tenders.
+
+Kullanım: python benchmarks/bench_normalize.py [--tenders 5000]
+"""
+
+import argparse
+import time
+
+from common import make_raw_tender, percentile
+
+import app as app_module
+from tender_index import tender_search_keys
+
+
+def legacy_fix(text):
+    if not isinstance(text, str):
+        return text
+    try:
+        return text.encode("latin1").decode("utf-8")
+    except Exception:
+        return text
+
+
+def legacy_normalize(item):
+    tender = {
+        "id": item.get("id"),
+        "ikn": item.get("ikn"),
+        "name": legacy_fix(item.get("name", "")),
+        "type": legacy_fix(item.get("type", {}).get("description", "")),
+        "status": legacy_fix(item.get("status", {}).get("description", "")),
+        "authority": legacy_fix(item.get("authority", "")),
+        "province": legacy_fix(item.get("province", "")),
+        "tender_datetime": legacy_fix(item.get("tender_datetime", "")),
+        "document_url": item.get("document_url"),
+    }
+    tender.update(tender_search_keys(tender))
+    return tender
+
+
+def garble(item):
+    # Sunucunun UTF-8 metni latin1 sanıp yeniden kodladığı durum
+    def g(text):
+        return text.encode("utf-8").decode("latin1")
+
+    return dict(
+        item,
+        name=g(item["name"]),
+        authority=g(item["authority"]),
+        province=g(item["province"]),
+        type=dict(item["type"], description=g(item["type"]["description"])),
+        status=dict(item["status"], description=g(item["status"]["description"])),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tenders", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    clean = [make_raw_tender(i) for i in range(args.tenders)]
+    for label, items in (("temiz", clean), ("mojibake", [garble(t) for t in clean])):
+        assert app_module.normalize_tenders(items) == [legacy_normalize(t) for t in items]
+        assert app_module.normalize_tenders(items)[0]["name"] == clean[0]["name"]
+        for name, fn in (
+            ("eski (alan başına encode/decode)", lambda: [legacy_normalize(t) for t in items]),
+            ("normalize_tenders", lambda: app_module.normalize_tenders(items)),
+        ):
+            timings = []
+            for _ in range(args.repeat):
+                t0 = time.perf_counter()
+                fn()
+                timings.append(time.perf_counter() - t0)
+            print(f"{label:9} {name:34} p50={percentile(timings, 50) * 1e3:7.1f}ms "
+                  f"({percentile(timings, 50) / len(items) * 1e6:.1f}µs/kayıt)")
+
+
+if __name__ == "__main__":
+    main()
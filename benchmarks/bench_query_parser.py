@@ -0,0 +1,51 @@
+"""
+Kural tabanlı sorgu çözümleyicinin gecikmesi ve kapsama oranı.
+
+Kullanım: python benchmarks/bench_query_parser.py [--repeat 2000]
+"""
+
+import argparse
+import time
+
+from common import percentile
+
+from query_parser import parse_query
+
+SAMPLE_QUERIES = [
+    "İstanbul yapım ihaleleri önümüzdeki 1 hafta",
+    "İzmir'deki hizmet ihaleleri",
+    "Ankara'da son 1 ay yayınlanan",
+    "bugün yayınlanan ihaleler",
+    "önümüzdeki 10 gün Bursa ve Antalya mal alımı",
+    "tüm Türkiye önümüzdeki 3 ay danışmanlık",
+    "Şanlıurfa'daki yapım işleri",
+    "bugünkü ihaleler",
+    "son 3 ay Kocaeli ilanları",
+    "gelecek ihaleler Konya",
+    # LLM'e düşmesi beklenenler
+    "ameliyathane sarf malzemesi",
+    "okul binası onarımı Trabzon",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    parsed = [q for q in SAMPLE_QUERIES if parse_query(q) is not None]
+    print(f"kapsama: {len(parsed)}/{len(SAMPLE_QUERIES)} sorgu kural tabanlı çözüldü")
+
+    timings = []
+    for _ in range(args.repeat):
+        for q in SAMPLE_QUERIES:
+            t0 = time.perf_counter()
+            parse_query(q)
+            timings.append(time.perf_counter() - t0)
+
+    print(f"parse_query p50={percentile(timings, 50) * 1e6:.1f}µs "
+          f"p95={percentile(timings, 95) * 1e6:.1f}µs p99={percentile(timings, 99) * 1e6:.1f}µs")
+
+
+if __name__ == "__main__":
+    main()
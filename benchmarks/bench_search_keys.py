@@ -0,0 +1,90 @@
+"""
+Önceden hesaplanmış arama anahtarları (name_key / search_key) ile her tuşta
+Türkçe küçük harfe çevirme maliyetinin karşılaştırması.
+
+Arayüzdeki applyFilters ve search_text son filtresinin Python karşılığı ölçülür:
+eski yol her satırın alanlarını birleştirip turkish_lower uygular, yeni yol
+yalnızca aranan metni katlar ve hazır anahtarda substring arar.
+
+Kullanım: python benchmarks/bench_search_keys.py [--rows 10000]
+"""
+
+import argparse
+import time
+
+from common import make_raw_tender, percentile
+
+import app as app_module
+from tender_index import TEXT_FIELDS, tender_search_keys
+from turkish import ascii_fold, turkish_lower
+
+# Kullanıcı "SAĞLIK müdürlüğü" yazarken her tuşta bir filtre
+TYPED = "SAĞLIK müdürlüğü"
+KEYSTROKES = [TYPED[:i] for i in range(1, len(TYPED) + 1)]
+
+
+def old_filter(rows, text):
+    text = turkish_lower(text)
+    return [t for t in rows if turkish_lower(" ".join(str(t.get(f) or "") for f in TEXT_FIELDS)).find(text) != -1]
+
+
+def new_filter(rows, text):
+    text = ascii_fold(text)
+    return [t for t in rows if t["search_key"].find(text) != -1]
+
+
+def old_name_filter(rows, search_text):
+    search_text = turkish_lower(search_text)
+    return [t for t in rows if turkish_lower(t["name"]).find(search_text) != -1]
+
+
+def new_name_filter(rows, search_text):
+    search_text = ascii_fold(search_text)
+    return [t for t in rows if t["name_key"].find(search_text) != -1]
+
+
+def timed(fn, rows, inputs, repeat):
+    timings = []
+    for _ in range(repeat):
+        for text in inputs:
+            t0 = time.perf_counter()
+            fn(rows, text)
+            timings.append(time.perf_counter() - t0)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    raw = [make_raw_tender(i) for i in range(args.rows)]
+    t0 = time.perf_counter()
+    rows = [app_module.normalize_tender_item(item) for item in raw]
+    normalize_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for t in rows:
+        tender_search_keys(t)
+    keys_s = time.perf_counter() - t0
+    print(f"{args.rows} satır: normalize {normalize_s * 1e3:.1f}ms (anahtar hesaplama payı {keys_s * 1e3:.1f}ms, bir kez)")
+
+    # İki yol aynı satırları bulmalı (ASCII katlama yalnızca daha toleranslı)
+    for text in KEYSTROKES:
+        assert {id(t) for t in old_filter(rows, text)} <= {id(t) for t in new_filter(rows, text)}
+    assert len(new_filter(rows, "saglik mudurlugu")) == len(old_filter(rows, "sağlık müdürlüğü"))
+
+    for label, old, new, inputs in (
+        ("applyFilters (tuş başına)", old_filter, new_filter, KEYSTROKES),
+        ("search_text ad filtresi", old_name_filter, new_name_filter, ["tıbbi", "SARF", "çeşitli"]),
+    ):
+        before = timed(old, rows, inputs, args.repeat)
+        after = timed(new, rows, inputs, args.repeat)
+        print(f"{label}:")
+        print(f"  turkish_lower her satırda  p50={percentile(before, 50) * 1e3:.2f}ms p95={percentile(before, 95) * 1e3:.2f}ms")
+        print(f"  hazır anahtar              p50={percentile(after, 50) * 1e3:.2f}ms p95={percentile(after, 95) * 1e3:.2f}ms "
+              f"({percentile(before, 50) / percentile(after, 50):.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
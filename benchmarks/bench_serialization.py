@@ -0,0 +1,52 @@
+"""
+/api/run cevap serileştirme: starlette JSONResponse (stdlib json) ile
+responses.dumps_json (+gzip/brotli) karşılaştırması.
+
+Kullanım: python benchmarks/bench_serialization.py [--tenders 2000] [--repeat 20]
+"""
+
+import argparse
+import gzip
+import time
+
+from common import make_raw_tender
+
+from fastapi.responses import JSONResponse
+
+import app as app_module
+import responses
+
+
+def timed(fn, repeat: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - t0) / repeat * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tenders", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    payload = {
+        "mcp_arguments": {"search_text": "", "tender_types": [], "provinces": [34], "limit": args.tenders},
+        "tenders": [app_module.normalize_tender_item(make_raw_tender(i)) for i in range(args.tenders)],
+        "next_cursor": None,
+    }
+
+    ms, body = timed(lambda: JSONResponse(payload).body, args.repeat)
+    print(f"JSONResponse (stdlib)       {ms:8.2f} ms  {len(body) / 1024:8.0f} KB")
+    encoder = "orjson" if responses.orjson is not None else "stdlib"
+    ms, body = timed(lambda: responses.dumps_json(payload), args.repeat)
+    print(f"dumps_json ({encoder:<6})         {ms:8.2f} ms  {len(body) / 1024:8.0f} KB")
+    ms, gz = timed(lambda: gzip.compress(body, compresslevel=responses.GZIP_LEVEL), args.repeat)
+    print(f"  + gzip (seviye {responses.GZIP_LEVEL})          {ms:8.2f} ms  {len(gz) / 1024:8.0f} KB")
+    if responses.brotli is not None:
+        ms, br = timed(lambda: responses.brotli.compress(body, quality=responses.BROTLI_QUALITY), args.repeat)
+        print(f"  + brotli (kalite {responses.BROTLI_QUALITY})        {ms:8.2f} ms  {len(br) / 1024:8.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
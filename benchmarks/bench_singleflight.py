@@ -0,0 +1,108 @@
+"""
+Aynı anda gelen aynı sorguların upstream çağrı sayısına etkisi (single-flight).
+
+Sahte LLM ve sahte MCP sabit gecikmeyle cevap verir ve çağrı sayılarını tutar.
+N eş istek aynı anda /api/run'a (JSON ve NDJSON akışı) gönderilir; cache'ler
+her turdan önce boşaltılır. --no-coalesce birleştirmeyi kapatarak eski
+davranışı ölçer.
+
+Kullanım: python benchmarks/bench_singleflight.py [--requests 32] [--llm-delay 0.3] [--mcp-delay 0.2]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+
+from common import fake_openai_client, make_mcp_result, percentile
+
+import app as app_module
+from singleflight import SingleFlight
+
+QUERY = "ankara hastane tıbbi sarf malzemesi"
+
+
+class NoFlight(SingleFlight):
+    """Birleştirme kapalı: her çağıran kendi upstream çağrısını yapar."""
+
+    def join(self, key):
+        return None
+
+
+class CountingCompletions:
+    def __init__(self, inner):
+        self.inner = inner
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        return await self.inner.create(**kwargs)
+
+
+def make_mcp_transport(delay: float, n_tenders: int, counter: dict) -> httpx.MockTransport:
+    body = json.dumps(make_mcp_result(n_tenders), ensure_ascii=False).encode("utf-8")
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        counter["calls"] += 1
+        await asyncio.sleep(delay)
+        return httpx.Response(200, content=body, headers={"Content-Type": "application/json"})
+
+    return httpx.MockTransport(handler)
+
+
+async def run_round(total: int, fmt: str) -> list:
+    transport = httpx.ASGITransport(app=app_module.app)
+    latencies = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as http:
+        async def one():
+            body = {"query": QUERY}
+            if fmt:
+                body["stream"] = True
+            t0 = time.perf_counter()
+            resp = await http.post("/api/run", json=body)
+            resp.raise_for_status()
+            latencies.append(time.perf_counter() - t0)
+
+        await asyncio.gather(*(one() for _ in range(total)))
+    return latencies
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=32)
+    parser.add_argument("--llm-delay", type=float, default=0.3)
+    parser.add_argument("--mcp-delay", type=float, default=0.2)
+    parser.add_argument("--tenders", type=int, default=200)
+    parser.add_argument("--no-coalesce", action="store_true")
+    args = parser.parse_args()
+
+    completions = CountingCompletions(fake_openai_client(args.llm_delay).chat.completions)
+    app_module.client.chat.completions = completions
+    mcp_calls = {"calls": 0}
+    app_module.mcp_http = httpx.AsyncClient(transport=make_mcp_transport(args.mcp_delay, args.tenders, mcp_calls))
+    # Yerel depo ve rule parser devre dışı: her tur LLM ve MCP'ye gitmek zorunda
+    app_module.tender_store = None
+    app_module.parse_query = lambda query: None
+    if args.no_coalesce:
+        app_module.translation_flight = NoFlight()
+        app_module.mcp_flight = NoFlight()
+
+    mode = "kapalı" if args.no_coalesce else "açık"
+    print(f"birleştirme={mode} eş istek={args.requests} llm={args.llm_delay}s mcp={args.mcp_delay}s")
+    print(f"{'biçim':>8} {'LLM çağrısı':>12} {'MCP çağrısı':>12} {'p50 ms':>8} {'p95 ms':>8}")
+    for fmt in ("", "ndjson"):
+        app_module.translation_cache.clear()
+        app_module.result_cache.clear()
+        completions.calls = 0
+        mcp_calls["calls"] = 0
+        latencies = await run_round(args.requests, fmt)
+        print(f"{fmt or 'json':>8} {completions.calls:>12} {mcp_calls['calls']:>12} "
+              f"{percentile(latencies, 50) * 1e3:>8.0f} {percentile(latencies, 95) * 1e3:>8.0f}")
+
+    await app_module.mcp_http.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
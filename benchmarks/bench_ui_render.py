@@ -0,0 +1,41 @@
+"""
+Web arayüzündeki sanal tablonun kare süreleri (sentetik 20 bin satır).
+
+HTML_TEMPLATE sunucu olmadan Chromium'a yüklenir ve sayfadaki benchVirtualTable(n)
+çağrılır: ilk çizim, filtre tuşu başına süre ve kaydırma sırasında kare süreleri
+(p50/p95/max) ile DOM'daki satır sayısı raporlanır.
+
+Gerekli: pip install playwright && playwright install chromium
+Kullanım: python benchmarks/bench_ui_render.py [--rows 20000]
+"""
+
+import argparse
+import json
+
+import common  # noqa: F401  (sys.path ve OPENAI_API_KEY ayarı)
+
+from playwright.sync_api import sync_playwright
+
+from app import HTML_TEMPLATE
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20000)
+    args = parser.parse_args()
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        page = browser.new_page(viewport={"width": 1920, "height": 1080})
+        page.set_content(HTML_TEMPLATE)
+        result = page.evaluate(f"benchVirtualTable({args.rows})")
+        browser.close()
+
+    print(json.dumps(result, indent=2))
+    print(f"DOM'daki satır: {result['dom_rows']} / {result['rows']}")
+    print(f"filtre (tuş başına) max: {max(result['filter_ms']):.1f}ms, "
+          f"kaydırma karesi p95: {result['scroll_frame_ms']['p95']:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
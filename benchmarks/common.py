@@ -0,0 +1,139 @@
+"""
+Benchmark'lar için ortak yardımcılar.
+
+app.py import edilirken OPENAI_API_KEY zorunlu olduğundan sahte bir değer atanır;
+benchmark'lar gerçek OpenAI / MCP servislerine hiç istek atmaz.
+"""
+
+import os
+import sys
+import json
+import asyncio
+import time
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+PROVINCES = ["İstanbul", "Ankara", "İzmir", "Bursa", "Antalya", "Konya", "Adana", "Kocaeli"]
+TYPES = ["Mal", "Yapım", "Hizmet", "Danışmanlık"]
+STATUSES = ["Teklifler Alınıyor", "İhale Sonuçlandı", "İptal Edildi"]
+
+
+def to_mojibake(text: str) -> str:
+    """UTF-8 baytları latin1 sanılarak çözülmüş metin ("SaÄlÄ±k"); fix_mojibake'in girdisi."""
+    return text.encode("utf-8").decode("latin1")
+
+
+def make_raw_tender(i: int, mojibake: bool = False) -> dict:
+    """MCP structuredContent.tenders içindeki bir kaydın sentetik karşılığı."""
+    fix = to_mojibake if mojibake else str
+    return {
+        "id": 100000 + i,
+        "ikn": f"2025/{100000 + i}",
+        "name": fix(f"{i} Kalem Çeşitli Tıbbi Sarf Malzemesi Alımı İşi"),
+        "type": {"code": i % 4 + 1, "description": fix(TYPES[i % 4])},
+        "status": {"code": 1, "description": fix(STATUSES[i % 3])},
+        "authority": fix(f"Sağlık Bakanlığı Şehir Hastanesi Müdürlüğü {i % 50}"),
+        "province": fix(PROVINCES[i % len(PROVINCES)]),
+        "tender_datetime": f"{i % 28 + 1:02d}.{i % 12 + 1:02d}.2025 10:30",
+        "document_url": f"https://ekap.kik.gov.tr/doc/{i}" if i % 2 else None,
+    }
+
+
+def make_ekap_row(i: int) -> dict:
+    """ekap.extract_page_items çıktısındaki bir kaydın sentetik karşılığı (process_data girdisi)."""
+    day = date.today() + timedelta(days=i % 10)
+    return {
+        "ihale": f"{i} Kalem Çeşitli Tıbbi Sarf Malzemesi Alımı İşi",
+        "ikn": f"2025/{100000 + i}",
+        "il_saat": f"{PROVINCES[i % len(PROVINCES)]}, {day.strftime('%d.%m.%Y')} 10:30",
+        "ihale_turu": TYPES[i % 4],
+        "katilim_durumu": "Açık İhale, Katılıma Açık" if i % 5 else "Açık İhale, Katılıma Kapalı",
+        "tum_badgeler": f"{TYPES[i % 4]} | Açık İhale, Katılıma Açık",
+    }
+
+
+def make_mcp_result(n: int) -> dict:
+    return {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "result": {
+            "structuredContent": {"tenders": [make_raw_tender(i) for i in range(n)]},
+        },
+    }
+
+
+def iter_mcp_body(
+    n: int,
+    sse: bool = False,
+    chunk_size: int = 64 * 1024,
+    with_content: bool = True,
+    mojibake: bool = False,
+):
+    """
+    make_mcp_result(n) gövdesini belleğe almadan byte parçaları halinde üretir.
+    with_content=True ise gerçek FastMCP cevaplarındaki gibi aynı veri
+    result.content[0].text içinde kaçışlı JSON string olarak da bulunur.
+    """
+
+    def pieces():
+        if sse:
+            yield "event: message\ndata: "
+        yield '{"jsonrpc": "2.0", "id": 1, "result": {'
+        if with_content:
+            yield '"content": [{"type": "text", "text": "'
+            yield json.dumps('{"tenders": [')[1:-1]
+            for i in range(n):
+                sep = ", " if i else ""
+                yield json.dumps(sep + json.dumps(make_raw_tender(i, mojibake), ensure_ascii=False), ensure_ascii=False)[1:-1]
+            yield json.dumps("]}")[1:-1]
+            yield '"}], '
+        yield '"structuredContent": {"tenders": ['
+        for i in range(n):
+            yield (", " if i else "") + json.dumps(make_raw_tender(i, mojibake), ensure_ascii=False)
+        yield "]}}}"
+        if sse:
+            yield "\n\n"
+
+    buf = bytearray()
+    for piece in pieces():
+        buf += piece.encode("utf-8")
+        if len(buf) >= chunk_size:
+            yield bytes(buf)
+            buf.clear()
+    if buf:
+        yield bytes(buf)
+
+
+class FakeCompletions:
+    """AsyncOpenAI.chat.completions yerine geçen, sabit gecikmeli sahte LLM."""
+
+    def __init__(self, delay: float, blocking: bool = False):
+        self.delay = delay
+        self.blocking = blocking
+
+    async def create(self, model, messages, **kwargs):
+        if self.blocking:
+            time.sleep(self.delay)
+        else:
+            await asyncio.sleep(self.delay)
+        user_query = messages[-1]["content"]
+        content = json.dumps({"search_text": user_query, "tender_types": [], "provinces": [34]})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def fake_openai_client(delay: float, blocking: bool = False):
+    return SimpleNamespace(chat=SimpleNamespace(completions=FakeCompletions(delay, blocking)))
+
+
+def percentile(values, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[idx]
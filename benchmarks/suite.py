@@ -0,0 +1,276 @@
+"""
+İstek sıcak yolunun CPU'ya bağlı parçaları için mikro benchmark paketi.
+
+Sentetik fixture'lar: temiz ve mojibake'li (UTF-8 baytları latin1 sanılmış)
+100 / 2.000 / 20.000 ihalelik MCP cevapları, düz JSON ve SSE çerçevesiyle.
+Ölçülenler:
+
+- normalize_mcp_arguments (LLM / parser çıktısı örnekleri)
+- normalize_tenders (normalize_tender_item) ve fix_mojibake
+- MCP gövdesinin akış ayrıştırıcısı (iter_mcp_items) ve karşılaştırma tabanı olarak
+  eski tampon yol (tüm gövde → json.loads)
+- ekap.py process_data ve save_to_excel
+
+Sonuçlar makinece okunabilir bir JSON dosyasına yazılır; --compare ile önceki bir
+sonuç dosyasına göre yavaşlayan durumlar işaretlenir (varsa çıkış kodu 1).
+
+Kullanım:
+  python benchmarks/suite.py                               # benchmarks/results/latest.json
+  python benchmarks/suite.py --output base.json --sizes 100,2000
+  python benchmarks/suite.py --compare base.json           # çalıştır + karşılaştır
+  python benchmarks/suite.py --compare base.json --against new.json   # yalnızca karşılaştır
+"""
+
+import argparse
+import asyncio
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from common import ROOT, iter_mcp_body, make_ekap_row, make_raw_tender
+
+import app as app_module
+from mcp_stream import iter_mcp_items, parse_sse_messages
+
+try:
+    import ekap
+except ImportError:  # pragma: no cover - playwright / pandas kurulu değilse ekap benchmark'ları atlanır
+    ekap = None
+
+SCHEMA_VERSION = 1
+DEFAULT_SIZES = (100, 2000, 20000)
+DEFAULT_OUTPUT = os.path.join(ROOT, "benchmarks", "results", "latest.json")
+
+# LLM'in ve kural tabanlı parser'ın ürettiği tipik argümanlar (tip / değer karmaşası dahil)
+ARGUMENT_SAMPLES = [
+    {"search_text": "tıbbi sarf", "tender_types": [1], "provinces": [34]},
+    {"search_text": "", "tender_types": "2", "provinces": ["6", "35"], "limit": "50"},
+    {"search_text": None, "tender_types": [], "provinces": [], "tender_date_filter": "from_today"},
+    {"search_text": "asfalt", "tender_types": [2, 9], "provinces": [6],
+     "tender_date_start": "2025-06-01", "tender_date_end": "2025-06-30"},
+    {"search_text": "", "announcement_date_filter": "today", "limit": 5000, "skip": 0},
+    {"search_text": "temizlik", "tender_types": None, "provinces": None,
+     "announcement_date_start": "2025-05-01", "announcement_date_end": "bozuk-tarih"},
+    {"search_text": "", "ikn_year": 2025, "ikn_number": 123456, "extra": "silinir"},
+    {"search_text": "güvenlik", "tender_types": [3], "provinces": list(range(1, 82)), "skip": "200"},
+]
+
+
+def parse_buffered(text_body: str, content_type: str) -> Dict[str, Any]:
+    # Eski call_mcp_tool yolu: gövdenin tamamı belleğe alınıp tek seferde çözülür
+    if "text/event-stream" in content_type:
+        messages = [json.loads(m) for m in parse_sse_messages(text_body) if m.strip()]
+        data = next((m for m in messages if "result" in m or "error" in m), messages[-1])
+    else:
+        data = json.loads(text_body)
+    return data.get("result", data)
+
+
+def measure(fn: Callable[[], Any], min_time: float, min_repeats: int, max_repeats: int) -> List[float]:
+    fn()  # ısınma (memo, import, ilk ayırma)
+    gc.collect()
+    timings: List[float] = []
+    total = 0.0
+    while len(timings) < max_repeats and (len(timings) < min_repeats or total < min_time):
+        t0 = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - t0
+        timings.append(elapsed)
+        total += elapsed
+    return timings
+
+
+def build_cases(sizes: Tuple[int, ...], loop: asyncio.AbstractEventLoop, tmpdir: str) -> List[Tuple[str, int, Callable[[], Any]]]:
+    cases: List[Tuple[str, int, Callable[[], Any]]] = []
+
+    def normalize_arguments():
+        for sample in ARGUMENT_SAMPLES:
+            app_module.normalize_mcp_arguments(dict(sample), "")
+
+    cases.append(("normalize_mcp_arguments", len(ARGUMENT_SAMPLES), normalize_arguments))
+
+    for size in sizes:
+        for variant in ("clean", "mojibake"):
+            mojibake = variant == "mojibake"
+            raw = [make_raw_tender(i, mojibake) for i in range(size)]
+            texts = [
+                value
+                for t in raw
+                for value in (t["name"], t["type"]["description"], t["status"]["description"],
+                              t["authority"], t["province"], t["tender_datetime"])
+            ]
+            cases.append((f"normalize_tenders/{variant}/{size}", size, lambda raw=raw: app_module.normalize_tenders(raw)))
+            cases.append((
+                f"fix_mojibake/{variant}/{size}", len(texts),
+                lambda texts=texts: [app_module.fix_mojibake(text) for text in texts],
+            ))
+
+            for framing in ("json", "sse"):
+                sse = framing == "sse"
+                chunks = list(iter_mcp_body(size, sse=sse, mojibake=mojibake))
+                body = b"".join(chunks).decode("utf-8")
+                content_type = "text/event-stream" if sse else "application/json"
+                cases.append((
+                    f"parse_buffered/{framing}/{variant}/{size}", size,
+                    lambda body=body, content_type=content_type: parse_buffered(body, content_type),
+                ))
+                cases.append((
+                    f"parse_stream/{framing}/{variant}/{size}", size,
+                    lambda chunks=chunks, content_type=content_type: loop.run_until_complete(
+                        _consume_stream(chunks, content_type)
+                    ),
+                ))
+
+        if ekap is not None:
+            rows = [make_ekap_row(i) for i in range(size)]
+            with contextlib.redirect_stdout(io.StringIO()):
+                df = ekap.process_data(rows)
+            path = os.path.join(tmpdir, f"ekap_{size}.xlsx")
+            cases.append((f"ekap_process_data/{size}", size, lambda rows=rows: _quiet(ekap.process_data, rows)))
+            cases.append((f"ekap_save_to_excel/{size}", len(df), lambda df=df, path=path: _quiet(ekap.save_to_excel, df, path)))
+
+    return cases
+
+
+async def _consume_stream(chunks: List[bytes], content_type: str) -> int:
+    async def source():
+        for chunk in chunks:
+            yield chunk
+
+    count = 0
+    async for _ in iter_mcp_items(source(), content_type):
+        count += 1
+    return count
+
+
+def _quiet(fn: Callable[..., Any], *args: Any) -> Any:
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args)
+
+
+def git_revision() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        dirty = bool(subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT, capture_output=True, text=True,
+        ).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+    return {"commit": commit, "dirty": dirty}
+
+
+def run_suite(args: argparse.Namespace) -> Dict[str, Any]:
+    sizes = tuple(int(x) for x in args.sizes.split(","))
+    loop = asyncio.new_event_loop()
+    results: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cases = build_cases(sizes, loop, tmpdir)
+        for name, items, fn in cases:
+            if args.filter and not any(f in name for f in args.filter):
+                continue
+            timings = measure(fn, args.min_time, args.min_repeats, args.max_repeats)
+            median = statistics.median(timings)
+            results[name] = {
+                "items": items,
+                "repeats": len(timings),
+                "median_s": median,
+                "min_s": min(timings),
+                "mean_s": statistics.fmean(timings),
+                "stdev_s": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+                "per_item_us": median / items * 1e6 if items else None,
+            }
+            print(f"{name:<45} {median * 1e3:>10.3f}ms  {results[name]['per_item_us'] or 0:>9.3f}µs/öğe  x{len(timings)}")
+    loop.close()
+    if ekap is None:
+        print("ekap import edilemedi (playwright/pandas yok): ekap benchmark'ları atlandı")
+
+    return {
+        "schema": SCHEMA_VERSION,
+        "meta": dict(
+            git_revision(),
+            created_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            python=platform.python_version(),
+            platform=platform.platform(),
+            sizes=list(sizes),
+        ),
+        "results": results,
+    }
+
+
+def compare(base: Dict[str, Any], current: Dict[str, Any], threshold: float) -> int:
+    """Her iki ölçüt (median ve min) de eşikten fazla yavaşladıysa regresyon sayılır."""
+    print(f"\nkarşılaştırma: {base['meta'].get('commit')} → {current['meta'].get('commit')} (eşik %{threshold * 100:.0f})")
+    print(f"{'durum':<45} {'önce ms':>10} {'sonra ms':>10} {'değişim':>9}")
+    regressions = 0
+    for name, now in current["results"].items():
+        before = base["results"].get(name)
+        if before is None:
+            print(f"{name:<45} {'-':>10} {now['median_s'] * 1e3:>10.3f} {'yeni':>9}")
+            continue
+        change = now["median_s"] / before["median_s"] - 1
+        min_change = now["min_s"] / before["min_s"] - 1
+        flag = ""
+        if change > threshold and min_change > threshold:
+            flag = "  YAVAŞLADI"
+            regressions += 1
+        elif change < -threshold and min_change < -threshold:
+            flag = "  hızlandı"
+        print(f"{name:<45} {before['median_s'] * 1e3:>10.3f} {now['median_s'] * 1e3:>10.3f} {change * 100:>+8.1f}%{flag}")
+    missing = base["results"].keys() - current["results"].keys()
+    if missing:
+        print(f"({len(missing)} durum bu çalıştırmada ölçülmedi)")
+    print(f"\n{regressions} regresyon")
+    return regressions
+
+
+def load(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("schema") != SCHEMA_VERSION:
+        raise SystemExit(f"{path}: desteklenmeyen şema sürümü {data.get('schema')}")
+    return data
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES))
+    parser.add_argument("--filter", action="append", help="yalnızca adında bu metin geçen durumlar (tekrarlanabilir)")
+    parser.add_argument("--min-time", type=float, default=0.5, help="durum başına en az ölçüm süresi (s)")
+    parser.add_argument("--min-repeats", type=int, default=5)
+    parser.add_argument("--max-repeats", type=int, default=200)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--compare", metavar="BASE_JSON", help="bu sonuç dosyasına göre regresyon kontrolü")
+    parser.add_argument("--against", metavar="NEW_JSON", help="çalıştırmadan, iki dosyayı karşılaştır")
+    parser.add_argument("--threshold", type=float, default=0.10, help="regresyon eşiği (0.10 = %%10)")
+    args = parser.parse_args()
+
+    if args.against:
+        if not args.compare:
+            parser.error("--against için --compare gerekli")
+        return 1 if compare(load(args.compare), load(args.against), args.threshold) else 0
+
+    current = run_suite(args)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(current, f, ensure_ascii=False, indent=2)
+    print(f"\nsonuçlar: {args.output}")
+
+    if args.compare:
+        return 1 if compare(load(args.compare), current, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,240 @@
+"""
+Sunucu içi cache'ler.
+
+TranslationCache: doğal dil sorgu → normalize edilmiş MCP argümanları.
+Anahtar, normalize edilmiş sorgu + bugünün tarihidir; prompt'taki göreli tarihler
+("son 1 hafta", "önümüzdeki 10 gün") her gün değiştiği için gece yarısı tüm
+girdiler geçersiz olur.
+
+ResultCache: kanonik MCP argümanları → normalize edilmiş ihale listesi.
+TTL dolduktan sonraki grace süresi boyunca eski sonuç hemen döner ve arka planda
+yenilenir (stale-while-revalidate). Toplam boyut bir bellek bütçesiyle sınırlıdır.
+"""
+
+import asyncio
+import copy
+import json
+import sys
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from turkish import normalize_query_text
+
+
+class TranslationCache:
+    def __init__(self, maxsize: int = 512, today: Callable[[], date] = date.today):
+        self.maxsize = maxsize
+        self._today = today
+        self._day: Optional[str] = None
+        self._data: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        # Miss'lerde ölçülen LLM süresi; hit başına kazanılan süreyi tahmin etmek için
+        self._llm_calls = 0
+        self._llm_seconds = 0.0
+
+    def _key(self, query: str) -> Tuple[str, str]:
+        day = self._today().isoformat()
+        if day != self._day:
+            # Gün dönümü: dünün göreli tarihleri artık yanlış
+            if self._data:
+                self.expirations += len(self._data)
+                self._data.clear()
+            self._day = day
+        return day, normalize_query_text(query)
+
+    def get(self, query: str) -> Optional[Dict[str, Any]]:
+        key = self._key(query)
+        value = self._data.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return copy.deepcopy(value)
+
+    def put(self, query: str, arguments: Dict[str, Any]) -> None:
+        key = self._key(query)
+        self._data[key] = copy.deepcopy(arguments)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def record_llm_latency(self, seconds: float) -> None:
+        self._llm_calls += 1
+        self._llm_seconds += seconds
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        avg_llm = self._llm_seconds / self._llm_calls if self._llm_calls else 0.0
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "llm_calls": self._llm_calls,
+            "avg_llm_seconds": round(avg_llm, 4),
+            "estimated_llm_seconds_saved": round(self.hits * avg_llm, 2),
+        }
+
+
+def canonical_arguments(arguments: Dict[str, Any]) -> str:
+    """Aynı aramayı ifade eden argümanlar için aynı string (sıralı anahtarlar ve listeler)."""
+    canonical = dict(arguments)
+    for key in ("provinces", "tender_types"):
+        if isinstance(canonical.get(key), list):
+            canonical[key] = sorted(canonical[key])
+    return json.dumps(canonical, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+
+
+def estimate_size(value: Any) -> int:
+    """Normalize edilmiş ihale listesinin yaklaşık bellek kullanımı (byte)."""
+    if hasattr(value, "nbytes"):
+        # TenderBatch kendi sütunlarını ölçer
+        return value.nbytes()
+    if isinstance(value, list):
+        total = sys.getsizeof(value)
+        for item in value:
+            total += estimate_size(item)
+        return total
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(sys.getsizeof(v) for v in value.values())
+    return sys.getsizeof(value)
+
+
+class _Entry:
+    __slots__ = ("value", "size", "stored_at")
+
+    def __init__(self, value: Any, size: int, stored_at: float):
+        self.value = value
+        self.size = size
+        self.stored_at = stored_at
+
+
+class ResultCache:
+    def __init__(
+        self,
+        ttl: float = 300.0,
+        stale_grace: float = 600.0,
+        max_bytes: int = 64 * 1024 * 1024,
+        sizeof: Callable[[Any], int] = estimate_size,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.stale_grace = stale_grace
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._clock = clock
+        self._data: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._refreshing: Dict[str, "asyncio.Task[Any]"] = {}
+        self.total_bytes = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+
+    def _remove(self, key: str) -> None:
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry.size
+
+    def put(self, key: str, value: Any) -> None:
+        size = self._sizeof(value)
+        self._remove(key)
+        if size > self.max_bytes:
+            # Tek başına bütçeyi aşan sonuç cache'lenmez
+            return
+        self._data[key] = _Entry(value, size, self._clock())
+        self.total_bytes += size
+        while self.total_bytes > self.max_bytes and self._data:
+            _, evicted = self._data.popitem(last=False)
+            self.total_bytes -= evicted.size
+            self.evictions += 1
+
+    def peek(self, key: str) -> Optional[Any]:
+        """Yaş kontrolü yapmadan (süresi dolmuş olsa bile) değeri döner; istatistiği etkilemez."""
+        entry = self._data.get(key)
+        return entry.value if entry is not None else None
+
+    def get(self, key: str, refresh: Optional[Callable[[], Awaitable[Any]]] = None) -> Optional[Any]:
+        """
+        Taze ya da grace süresindeki değeri döner, yoksa None.
+        Eski değer dönerken refresh verilmişse arka planda yenileme başlatılır.
+        """
+        entry = self._data.get(key)
+        if entry is not None:
+            age = self._clock() - entry.stored_at
+            if age <= self.ttl:
+                self.hits += 1
+                self._data.move_to_end(key)
+                return entry.value
+            if age <= self.ttl + self.stale_grace:
+                self.stale_hits += 1
+                self._data.move_to_end(key)
+                if refresh is not None:
+                    self._schedule_refresh(key, refresh)
+                return entry.value
+            # Süresi tamamen dolan girdi silinmez: upstream sağlıksızken peek ile son çare
+            # olarak sunulabilir; LRU bütçesi dolunca zaten ilk çıkarılanlardandır
+
+        self.misses += 1
+        return None
+
+    async def get_or_fetch(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        value = self.get(key, fetch)
+        if value is not None:
+            return value
+        value = await fetch()
+        self.put(key, value)
+        return value
+
+    def _schedule_refresh(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> None:
+        if key in self._refreshing:
+            return
+        self._refreshing[key] = asyncio.create_task(self._refresh(key, fetch))
+
+    async def _refresh(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            value = await fetch()
+            self.put(key, value)
+            self.refreshes += 1
+        except Exception:
+            # Yenileme başarısızsa eski değer grace süresi sonuna kadar kullanılmaya devam eder
+            self.refresh_errors += 1
+        finally:
+            self._refreshing.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.stale_hits + self.misses
+        return {
+            "entries": len(self._data),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl,
+            "stale_grace_seconds": self.stale_grace,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.hits + self.stale_hits) / total, 4) if total else 0.0,
+            "evictions": self.evictions,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+            "refreshing": len(self._refreshing),
+        }
@@ -3,13 +3,25 @@ EKAP İhale Arama Scraper
 https://ekapv2.kik.gov.tr/ekap/search
 
 Tüm ihaleleri çeker, bugünden itibaren 1 hafta içindekileri ve "Katılıma Açık" olanları filtreler.
-Kullanım: python ekap_scraper.py
+
+İki mod vardır:
+- capture (varsayılan): arama bir kez arayüzden yapılır, sayfanın backend'e attığı
+  arama isteği (XHR) yakalanır; sonraki sayfalar aynı istek farklı offset'lerle
+  tekrarlanarak doğrudan JSON olarak alınır. İstek yakalanamazsa dom moduna düşer.
+- dom: sonuç listesi sayfa sayfa tıklanarak ihale-liste-item elementlerinden okunur.
+
+Kullanım: python ekap.py [--mode capture|dom] [--max-pages N] [--page-size N] [--headless]
 Gerekli: pip install playwright pandas openpyxl
          playwright install chromium
 """
 
-from playwright.sync_api import sync_playwright
+from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
 import pandas as pd
+import argparse
+import json
+import os
+import re
+import time
 from datetime import datetime, timedelta
 
 
@@ -20,21 +32,63 @@ def get_date_range():
     return today.strftime('%d.%m.%Y'), one_week_later.strftime('%d.%m.%Y')
 
 
+# DevExtreme widget'ı görünür olsa da disabled/readonly iken tıklamaları yutar
+WIDGET_READY_JS = """
+(el) => {
+    const widget = el.closest('.dx-widget') || el;
+    return el.isConnected && el.getClientRects().length > 0
+        && !widget.classList.contains('dx-state-disabled')
+        && !widget.classList.contains('dx-state-readonly');
+}
+"""
+
+# Liste yenilendi mi: ilk ihalenin İKN'si sayfa değişmeden önceki değerden farklı olmalı
+LIST_CHANGED_JS = """
+(previous) => {
+    const ikn = document.querySelector('ihale-liste-item span.ikn');
+    return ikn !== null && ikn.textContent.trim() !== previous;
+}
+"""
+
+READY_TIMEOUT = 15000
+# SEARCH_API_PATH tahmini tutmazsa DOM modu bu kadar bekleyip listenin değişmesine bakar
+SEARCH_RESPONSE_TIMEOUT = 15000
+SEARCH_TIMEOUT = 60000
+
+
+def wait_interactive(locator, timeout=READY_TIMEOUT):
+    """Locator görünür olana ve DevExtreme widget'ı etkileşime açılana kadar bekler."""
+    locator.wait_for(state='visible', timeout=timeout)
+    locator.page.wait_for_function(WIDGET_READY_JS, arg=locator.element_handle(), timeout=timeout)
+    return locator
+
+
+def is_search_response(response):
+    """Sonuç listesini dolduran arama XHR'ının cevabı mı"""
+    return SEARCH_API_PATH in response.url and response.request.method == 'POST'
+
+
+def first_ikn(page):
+    """Listede görünen ilk ihalenin İKN'si (liste boşsa '')"""
+    return page.evaluate("""() => {
+        const ikn = document.querySelector('ihale-liste-item span.ikn');
+        return ikn ? ikn.textContent.trim() : '';
+    }""")
+
+
 def setup_filters(page):
     """
     Sayfa filtrelerini ayarlar:
     - Tarih tipi: İhale Tarihi seçer
     - Tarih aralığı: bugün - 1 hafta sonra
-    - Arama butonuna tıklar
+    - Arama butonuna tıklar ve arama XHR'ının cevabını bekler
+    
+    Sabit beklemeler yerine her adımda bir sonraki widget'ın etkileşime açılması beklenir.
     """
     start_date, end_date = get_date_range()
     print(f"\nFiltreler ayarlanıyor...")
     print(f"  Tarih aralığı: {start_date} - {end_date}")
     
-    # Sayfanın tam yüklenmesini bekle
-    page.wait_for_load_state('networkidle')
-    page.wait_for_timeout(3000)
-    
     try:
         # 1. Detaylı arama butonuna tıkla (scroll into view + force click)
         print("  [1/6] Detaylı arama açılıyor...")
@@ -42,53 +96,66 @@ def setup_filters(page):
         if detail_button.count() == 0:
             # Alternatif selector dene
             detail_button = page.locator('dx-button.btn.btn--light.btn--large.btn--with-icon')
+        wait_interactive(detail_button.first)
         detail_button.first.scroll_into_view_if_needed()
-        page.wait_for_timeout(500)
         detail_button.first.click(force=True)
-        page.wait_for_timeout(1500)
         
-        # 2. İhale Tarihi radio butonuna tıkla
+        # 2. İhale Tarihi radio butonuna tıkla (detaylı arama paneli açılınca görünür)
         print("  [2/6] İhale Tarihi seçiliyor...")
+        try:
+            wait_interactive(page.locator('div.dx-radiogroup').first)
+        except PlaywrightTimeoutError:
+            print("    ⚠ Tarih tipi seçenekleri görünmedi, varsayılan tarih tipiyle devam ediliyor")
         radio_buttons = page.locator('div.dx-radiobutton-icon')
         if radio_buttons.count() > 1:
             radio_buttons.nth(1).scroll_into_view_if_needed()
-            page.wait_for_timeout(300)
             radio_buttons.nth(1).click(force=True)
-        page.wait_for_timeout(500)
         
         # 3. Tarih aralığı dropdown'ını aç
         print("  [3/6] Tarih aralığı açılıyor...")
         date_dropdown = page.locator('div.dx-dropdowneditor-icon').first
+        wait_interactive(date_dropdown)
         date_dropdown.scroll_into_view_if_needed()
-        page.wait_for_timeout(300)
         date_dropdown.click(force=True)
-        page.wait_for_timeout(500)
         
-        # 4. Başlangıç tarihini gir
+        # 4. Başlangıç tarihini gir (dropdown açılınca görünür)
         print(f"  [4/6] Başlangıç tarihi: {start_date}")
         start_input = page.locator('div.dx-start-datebox input.dx-texteditor-input')
+        wait_interactive(start_input)
         start_input.click(force=True)
         start_input.fill('')
         start_input.type(start_date, delay=30)
         page.keyboard.press('Enter')
-        page.wait_for_timeout(500)
         
         # 5. Bitiş tarihini gir
         print(f"  [5/6] Bitiş tarihi: {end_date}")
         end_input = page.locator('div.dx-end-datebox input.dx-texteditor-input')
+        wait_interactive(end_input)
         end_input.click(force=True)
         end_input.fill('')
         end_input.type(end_date, delay=30)
         page.keyboard.press('Enter')
-        page.wait_for_timeout(500)
         
-        # 6. Arama butonuna tıkla
+        # 6. Arama butonuna tıkla ve sonuçları getiren isteğin tamamlanmasını bekle
         print("  [6/6] Arama yapılıyor...")
         search_button = page.locator('#search-ihale')
+        wait_interactive(search_button)
         search_button.scroll_into_view_if_needed()
-        page.wait_for_timeout(300)
-        search_button.click(force=True)
-        page.wait_for_timeout(3000)  # Sonuçların yüklenmesini bekle
+        previous_ikn = first_ikn(page)
+        t0 = time.perf_counter()
+        try:
+            with page.expect_response(is_search_response, timeout=SEARCH_RESPONSE_TIMEOUT) as response_info:
+                search_button.click(force=True)
+            response = response_info.value
+            print(f"  Arama cevabı: HTTP {response.status}, {(time.perf_counter() - t0) * 1000:.0f} ms")
+        except PlaywrightTimeoutError:
+            # Arama isteğinin yolu tahmin; tutmazsa sonuç listesinin yenilenmesi beklenir
+            print(f"  ⚠ {SEARCH_API_PATH} yoluna arama cevabı gelmedi, sonuç listesi bekleniyor")
+            try:
+                page.wait_for_function(LIST_CHANGED_JS, arg=previous_ikn, timeout=SEARCH_TIMEOUT)
+                print(f"  Sonuç listesi yenilendi: {(time.perf_counter() - t0) * 1000:.0f} ms")
+            except PlaywrightTimeoutError:
+                print("  ⚠ Sonuç listesi değişmedi, mevcut listeyle devam ediliyor")
         
         print("✓ Filtreler başarıyla uygulandı")
         
@@ -111,7 +178,10 @@ def scrape_ihaleler(page, max_pages=None):
         Liste içinde dict'ler (her ihale bir dict)
     """
     all_ihaleler = []
+    page_latencies = []
     current_page = 1
+    # Sayfanın hazır olması için geçen süre önceki sayfanın tıklanmasından itibaren ölçülür
+    t0 = time.perf_counter()
     
     while True:
         print(f"\n{'='*50}")
@@ -128,20 +198,20 @@ def scrape_ihaleler(page, max_pages=None):
         except:
             print("İhale bulunamadı, çıkılıyor...")
             break
-            
-        page.wait_for_timeout(2000)  # Ekstra bekleme (dinamik içerik için)
         
-        # Tüm ihale-liste-item elementlerini bul
-        items = page.locator('ihale-liste-item').all()
-        print(f"Bu sayfada {len(items)} ihale bulundu")
+        # Tüm ihale-liste-item elementlerini tek seferde oku
+        try:
+            items = extract_page_items(page)
+        except Exception as e:
+            print(f"Sayfa okunamadı: {e}")
+            break
+        latency = time.perf_counter() - t0
+        page_latencies.append(latency)
+        print(f"Bu sayfada {len(items)} ihale bulundu ({latency * 1000:.0f} ms)")
         
-        for i, item in enumerate(items):
-            try:
-                ihale = extract_ihale_data(item)
-                all_ihaleler.append(ihale)
-                print(f"  [{i+1}] {ihale.get('ikn', 'N/A')} - {ihale.get('ihale_turu', 'N/A')} - {ihale.get('ihale', 'N/A')[:40]}...")
-            except Exception as e:
-                print(f"  [{i+1}] Hata: {e}")
+        for i, ihale in enumerate(items):
+            all_ihaleler.append(ihale)
+            print(f"  [{i+1}] {ihale.get('ikn', 'N/A')} - {ihale.get('ihale_turu', 'N/A')} - {ihale.get('ihale', 'N/A')[:40]}...")
         
         # Sonraki sayfa kontrolü
         if max_pages and current_page >= max_pages:
@@ -155,9 +225,14 @@ def scrape_ihaleler(page, max_pages=None):
             try:
                 # Butonun tıklanabilir olup olmadığını kontrol et
                 parent_button = next_button.first.locator('xpath=ancestor::dx-button')
-                if parent_button.count() > 0 and not parent_button.is_disabled():
+                disabled = parent_button.count() == 0 or parent_button.is_disabled() \
+                    or 'dx-state-disabled' in (parent_button.first.get_attribute('class') or '')
+                if not disabled:
+                    previous_ikn = first_ikn(page)
+                    t0 = time.perf_counter()
                     next_button.first.click()
-                    page.wait_for_timeout(2000)
+                    # Yeni sayfanın ihaleleri listeye gelene kadar bekle
+                    page.wait_for_function(LIST_CHANGED_JS, arg=previous_ikn, timeout=SEARCH_TIMEOUT)
                     current_page += 1
                 else:
                     print("\nSon sayfaya ulaşıldı.")
@@ -169,88 +244,325 @@ def scrape_ihaleler(page, max_pages=None):
             print("\nSon sayfaya ulaşıldı.")
             break
     
+    print_latency_summary("Sayfa", page_latencies)
     return all_ihaleler
 
 
-def extract_ihale_data(item):
+def print_latency_summary(label, latencies):
+    """Sayfa / istek başına gecikmenin özetini yazdırır."""
+    if not latencies:
+        return
+    ordered = sorted(latencies)
+    median = ordered[len(ordered) // 2]
+    print(f"\n{label} gecikmesi ({len(ordered)} adet): ort {sum(ordered) / len(ordered) * 1000:.0f} ms, "
+          f"medyan {median * 1000:.0f} ms, max {ordered[-1] * 1000:.0f} ms")
+
+
+IHALE_TURLERI = ['Hizmet', 'Mal', 'Yapım', 'Danışmanlık']
+
+# Bir ihale-liste-item'dan alanları okur; sayfadaki tüm ihaleler tek çağrıda döner.
+# ihale_turu: önce badge--large, yoksa herhangi bir badge içinde IHALE_TURLERI'nden biri
+EXTRACT_PAGE_JS = """
+(types) => Array.from(document.querySelectorAll('ihale-liste-item'), (item) => {
+    const text = (el) => el ? (el.textContent || '').trim() : '';
+    const first = (selector) => text(item.querySelector(selector));
+    const badges = Array.from(item.querySelectorAll('span.badge'), text);
+    const large = Array.from(item.querySelectorAll('span.badge.badge--large'), text);
+    return {
+        ihale: first('span.ihale'),
+        ikn: first('span.ikn'),
+        il_saat: first('span.il-saat'),
+        ihale_turu: large.find((t) => types.includes(t)) || badges.find((t) => types.includes(t)) || '',
+        katilim_durumu: first('span.badge.badge--success'),
+        tum_badgeler: badges.filter(Boolean).join(' | '),
+    };
+})
+"""
+
+
+def extract_page_items(page):
     """
-    Tek bir ihale-liste-item elementinden verileri çıkarır.
+    Sayfadaki tüm ihale-liste-item elementlerini tek bir page.evaluate çağrısıyla okur.
+    
+    Alan başına locator sorgusu yerine sayfa başına tek gidiş-dönüş yapılır
+    (karşılaştırma: benchmarks/bench_ekap_extract.py).
     
     Args:
-        item: Playwright locator (ihale-liste-item elementi)
+        page: Playwright page nesnesi
     
     Returns:
-        Dict: İhale verileri
+        Liste içinde dict'ler (ihale, ikn, il_saat, ihale_turu, katilim_durumu, tum_badgeler)
     """
-    data = {}
-    
-    # İhale adı
-    ihale_loc = item.locator('span.ihale')
-    data['ihale'] = safe_get_text(ihale_loc)
-    
-    # IKN (İhale Kayıt Numarası)
-    ikn_loc = item.locator('span.ikn')
-    data['ikn'] = safe_get_text(ikn_loc)
-    
-    # İl ve Saat bilgisi
-    il_saat_loc = item.locator('span.il-saat')
-    data['il_saat'] = safe_get_text(il_saat_loc)
-    
-    # İhale Türü - TÜM badge'leri kontrol et (Hizmet, Mal, Yapım, Danışmanlık)
-    # badge--danger genelde ihale türünü gösterir
-    # Tüm span.badge elementlerini kontrol ediyoruz
-    ihale_turu = ''
-    
-    # Önce badge--large olanları dene (bunlar genelde tür bilgisi)
-    badge_large_locs = item.locator('span.badge.badge--large')
-    if badge_large_locs.count() > 0:
-        for i in range(badge_large_locs.count()):
-            badge_text = safe_get_text(badge_large_locs.nth(i))
-            # İhale türlerini kontrol et
-            if badge_text in ['Hizmet', 'Mal', 'Yapım', 'Danışmanlık']:
-                ihale_turu = badge_text
-                break
-    
-    # Eğer bulunamadıysa tüm badge'lere bak
-    if not ihale_turu:
-        all_badges = item.locator('span.badge')
-        if all_badges.count() > 0:
-            for i in range(all_badges.count()):
-                badge_text = safe_get_text(all_badges.nth(i))
-                if badge_text in ['Hizmet', 'Mal', 'Yapım', 'Danışmanlık']:
-                    ihale_turu = badge_text
-                    break
-    
-    data['ihale_turu'] = ihale_turu
-    
-    # Katılım durumu (badge--success olanlar genelde katılım bilgisi)
-    badge_success_loc = item.locator('span.badge.badge--success')
-    data['katilim_durumu'] = safe_get_text(badge_success_loc)
-    
-    # Tüm badge metinlerini de kaydedelim (debug için)
-    all_badges = item.locator('span.badge')
-    badge_texts = []
-    if all_badges.count() > 0:
-        for i in range(all_badges.count()):
-            text = safe_get_text(all_badges.nth(i))
-            if text:
-                badge_texts.append(text)
-    data['tum_badgeler'] = ' | '.join(badge_texts)
-    
-    return data
+    return page.evaluate(EXTRACT_PAGE_JS, IHALE_TURLERI)
+
+
+# --- Ağ yakalama (capture) modu ---
+
+# Arama sonuçlarını taşıyan XHR'ların yolu; yine de cevabın içeriğine bakılarak doğrulanır
+SEARCH_API_PATH = '/b_ihalearama/api/'
+
+# API alan adları belgelenmediği için her alan için aday anahtarlar (büyük/küçük harf duyarsız)
+FIELD_KEYS = {
+    'ikn': ('ikn', 'ihaleKayitNo', 'ihaleKayitNumarasi'),
+    'ihale': ('ihaleAdi', 'ihaleAd', 'adi'),
+    'il': ('ihaleIlAdi', 'ilAdi', 'il', 'ihaleYeri'),
+    'tarih': ('ihaleTarihSaat', 'ihaleTarihi', 'tarih'),
+    'ihale_turu': ('ihaleTipAciklama', 'ihaleTuruAciklama', 'ihaleTipi', 'ihaleTuru'),
+    'ihale_usulu': ('ihaleUsulAciklama', 'ihaleUsulu', 'usul'),
+    'ihale_durumu': ('ihaleDurumAciklama', 'ihaleDurumu', 'durum'),
+    'katilim_durumu': ('katilimDurumu', 'katilimDurumAciklama'),
+    'idare': ('idareAdi', 'idare'),
+    'ilan_tarihi': ('ilanTarihi', 'yayinTarihi'),
+    'dokuman_sayisi': ('dokumanSayisi',),
+    'ekap_id': ('id', 'ihaleId'),
+}
+
+TOTAL_KEYS = ('totalCount', 'toplamKayitSayisi', 'total', 'count')
+
+# Sayfalama alanları: offset (skip) ve sayfa boyutu (take)
+OFFSET_KEY_RE = re.compile(r'skip|offset|start', re.IGNORECASE)
+SIZE_KEY_RE = re.compile(r'take|size|limit|length', re.IGNORECASE)
 
 
-def safe_get_text(locator):
+def _pick(raw, keys):
+    """raw dict'inden adaylardan ilk dolu değeri döner (anahtarlar büyük/küçük harf duyarsız)."""
+    lowered = {str(k).lower(): v for k, v in raw.items()}
+    for key in keys:
+        value = lowered.get(key.lower())
+        if value not in (None, ''):
+            return value
+    return None
+
+
+def find_tender_list(payload):
     """
-    Locator'dan güvenli şekilde text alır.
-    Element yoksa boş string döner.
+    JSON cevabında ihale listesini arar.
+
+    Returns:
+        (liste, toplam kayıt sayısı ya da None) veya ihale listesi yoksa None
     """
+    queue = [payload]
+    while queue:
+        node = queue.pop(0)
+        if isinstance(node, dict):
+            for value in node.values():
+                if isinstance(value, list) and value and isinstance(value[0], dict) \
+                        and _pick(value[0], FIELD_KEYS['ikn']) is not None:
+                    total = _pick(node, TOTAL_KEYS)
+                    return value, int(total) if isinstance(total, (int, float)) else None
+                if isinstance(value, (dict, list)):
+                    queue.append(value)
+        elif isinstance(node, list):
+            if node and isinstance(node[0], dict) and _pick(node[0], FIELD_KEYS['ikn']) is not None:
+                return node, None
+            queue.extend(v for v in node if isinstance(v, (dict, list)))
+    return None
+
+
+def format_ekap_datetime(value):
+    """ISO tarih-saati ("2025-07-01T10:30:00") DOM'daki "01.07.2025 10:30" biçimine çevirir."""
+    if not value:
+        return ''
+    text = str(value).strip()
     try:
-        if locator.count() > 0:
-            return (locator.first.text_content() or '').strip()
-    except:
-        pass
-    return ''
+        parsed = datetime.fromisoformat(text.replace('Z', '+00:00'))
+    except ValueError:
+        return text
+    return parsed.strftime('%d.%m.%Y %H:%M')
+
+
+def decode_tender(raw):
+    """
+    API'deki bir ihale kaydını extract_page_items ile aynı alanlara (ihale, ikn, il_saat,
+    ihale_turu, katilim_durumu, tum_badgeler) ve DOM'da görünmeyen ek alanlara çevirir.
+    """
+    data = {key: _pick(raw, keys) for key, keys in FIELD_KEYS.items()}
+    il = str(data.pop('il') or '').strip()
+    tarih = format_ekap_datetime(data.pop('tarih'))
+    usul = str(data['ihale_usulu'] or '').strip()
+    durum = str(data['ihale_durumu'] or '').strip()
+
+    record = {
+        'ihale': str(data['ihale'] or '').strip(),
+        'ikn': str(data['ikn'] or '').strip(),
+        'il_saat': f"{il}, {tarih}" if tarih else il,
+        'ihale_turu': str(data['ihale_turu'] or '').strip(),
+        # Listedeki yeşil badge "<usul>, <durum>" biçimindedir ("Açık İhale, Katılıma Açık")
+        'katilim_durumu': str(data['katilim_durumu'] or '').strip() or ', '.join(x for x in (usul, durum) if x),
+    }
+    record['tum_badgeler'] = ' | '.join(x for x in (record['ihale_turu'], record['katilim_durumu']) if x)
+    record.update(
+        idare=str(data['idare'] or '').strip(),
+        ihale_usulu=usul,
+        ihale_durumu=durum,
+        ilan_tarihi=format_ekap_datetime(data['ilan_tarihi']),
+        dokuman_sayisi=data['dokuman_sayisi'],
+        ekap_id=data['ekap_id'],
+    )
+    return record
+
+
+def paging_keys(body):
+    """
+    İstek gövdesindeki offset ve sayfa boyutu alanlarının yollarını bulur.
+
+    Returns:
+        (offset_yolu, boyut_yolu); her yol anahtar tuple'ıdır, bulunamayan None
+    """
+    offset_path = size_path = None
+    candidates = [((), body)]
+    while candidates:
+        prefix, node = candidates.pop(0)
+        for key, value in node.items():
+            path = prefix + (key,)
+            if isinstance(value, dict):
+                candidates.append((path, value))
+            elif isinstance(value, int) and not isinstance(value, bool):
+                if offset_path is None and OFFSET_KEY_RE.search(key):
+                    offset_path = path
+                elif size_path is None and SIZE_KEY_RE.search(key):
+                    size_path = path
+    return offset_path, size_path
+
+
+def _set_path(body, path, value):
+    for key in path[:-1]:
+        body = body[key]
+    body[path[-1]] = value
+
+
+def _get_path(body, path):
+    for key in path:
+        body = body[key]
+    return body
+
+
+class SearchCapture:
+    """page.on('response') ile arama XHR'ını ve ilk sayfanın ihalelerini yakalar."""
+
+    def __init__(self):
+        self.url = None
+        self.headers = {}
+        self.body = None
+        self.tenders = []
+        self.total = None
+        self.seen = 0
+
+    @property
+    def captured(self):
+        return self.body is not None
+
+    def on_response(self, response):
+        request = response.request
+        if request.method != 'POST' or request.resource_type not in ('xhr', 'fetch'):
+            return
+        if SEARCH_API_PATH not in response.url or not response.ok:
+            return
+        self.seen += 1
+        try:
+            payload = response.json()
+            body = request.post_data_json
+        except Exception:
+            return
+        found = find_tender_list(payload)
+        if found is None or not isinstance(body, dict):
+            return
+        # Filtreler değiştikçe gelen en son arama geçerlidir
+        self.url = response.url
+        self.headers = {
+            k: v for k, v in request.headers.items()
+            if not k.startswith(':') and k.lower() not in ('content-length', 'host', 'cookie')
+        }
+        self.body = body
+        self.tenders, self.total = found
+
+
+def replay_search(capture, post, page_size=None, max_pages=None):
+    """
+    Yakalanan arama isteğini artan offset'lerle tekrarlayıp tüm sonuçları toplar.
+
+    Args:
+        capture: SearchCapture (captured olmalı)
+        post: post(url, body) -> JSON cevabı; Playwright dışında test edilebilsin diye ayrı
+        page_size: sayfa boyutu (None = yakalanan istekteki değer)
+        max_pages: en fazla istek sayısı (None = tümü)
+
+    Returns:
+        decode_tender biçiminde ihale listesi (İKN'ye göre tekil)
+    """
+    offset_path, size_path = paging_keys(capture.body)
+    if offset_path is None:
+        print("⚠ İstekte offset alanı bulunamadı, yalnızca ilk sayfa alınıyor")
+        return [decode_tender(t) for t in capture.tenders]
+
+    body = json.loads(json.dumps(capture.body))
+    size = page_size or (_get_path(body, size_path) if size_path else len(capture.tenders)) or 1
+    if size_path:
+        _set_path(body, size_path, size)
+
+    ihaleler = []
+    seen = set()
+    offset = 0
+    requests = 0
+    latencies = []
+    total = capture.total
+    while max_pages is None or requests < max_pages:
+        if offset == 0 and not page_size and capture.tenders:
+            # İlk sayfa arayüzden zaten geldi
+            raw_list = capture.tenders
+        else:
+            _set_path(body, offset_path, offset)
+            t0 = time.perf_counter()
+            found = find_tender_list(post(capture.url, body))
+            latencies.append(time.perf_counter() - t0)
+            raw_list, found_total = found if found else ([], None)
+            total = found_total if found_total is not None else total
+            requests += 1
+        for raw in raw_list:
+            record = decode_tender(raw)
+            if record['ikn'] in seen:
+                continue
+            seen.add(record['ikn'])
+            ihaleler.append(record)
+        print(f"  offset {offset}: {len(raw_list)} kayıt (toplam {len(ihaleler)}{f' / {total}' if total else ''})")
+        offset += len(raw_list)
+        if len(raw_list) < size or (total is not None and offset >= total):
+            break
+    print_latency_summary("API isteği", latencies)
+    return ihaleler
+
+
+def playwright_post(page, headers):
+    """Tarayıcının çerezlerini paylaşan page.request ile JSON POST yapan fonksiyon döner."""
+
+    def post(url, body):
+        response = page.request.post(url, data=json.dumps(body), headers=headers)
+        if not response.ok:
+            raise RuntimeError(f"EKAP API hatası: HTTP {response.status}")
+        return response.json()
+
+    return post
+
+
+def scrape_via_api(page, page_size=None, max_pages=None):
+    """
+    capture modu: filtreler arayüzden uygulanırken arama XHR'ı yakalanır, sayfalar
+    istek tekrarlanarak alınır. İstek yakalanamazsa None döner.
+    """
+    capture = SearchCapture()
+    page.on('response', capture.on_response)
+    try:
+        # setup_filters arama cevabı gelene kadar bekler; dinleyici o sırada yakalar
+        setup_filters(page)
+    finally:
+        page.remove_listener('response', capture.on_response)
+
+    if not capture.captured:
+        print(f"⚠ Arama isteği yakalanamadı ({capture.seen} aday cevap)")
+        return None
+
+    print(f"\nArama isteği yakalandı: {capture.url}")
+    return replay_search(capture, playwright_post(page, capture.headers), page_size, max_pages)
 
 
 def process_data(ihaleler):
@@ -315,7 +627,9 @@ def process_data(ihaleler):
         print(f"✓ Katılım filtresi uygulandı: {before_filter} -> {len(df)} kayıt (sadece 'Katılıma Açık')")
     
     # Sütun sırasını düzenle
-    column_order = ['ikn', 'ihale', 'ihale_turu', 'il', 'tarih', 'katilim_durumu']
+    # idare ve sonrası yalnızca capture modunda bulunur
+    column_order = ['ikn', 'ihale', 'ihale_turu', 'il', 'tarih', 'katilim_durumu',
+                    'idare', 'ihale_usulu', 'ilan_tarihi', 'dokuman_sayisi']
     existing_columns = [col for col in column_order if col in df.columns]
     df = df[existing_columns]
     
@@ -335,6 +649,26 @@ def save_to_csv(df, filename=None):
     return filename
 
 
+def save_to_db(df, path=None):
+    """
+    Verileri app.py ile ortak SQLite ihale deposuna (tender_store) yazar.
+    path verilmezse TENDER_DB_PATH env değişkeni kullanılır; o da yoksa atlanır.
+    """
+    path = path or os.getenv('TENDER_DB_PATH')
+    if not path:
+        return None
+
+    from tender_store import TenderStore
+
+    store = TenderStore(path)
+    try:
+        count = store.upsert_dataframe(df)
+    finally:
+        store.close()
+    print(f"\n✓ Depoya yazıldı: {path} ({count} kayıt)")
+    return path
+
+
 def save_to_excel(df, filename=None):
     """Verileri Excel dosyasına kaydeder."""
     if not filename:
@@ -368,22 +702,32 @@ def get_column_letter(col_idx):
     return result
 
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="EKAP İhale Scraper")
+    parser.add_argument('--mode', choices=('capture', 'dom'), default='capture',
+                        help="capture: arama XHR'ını tekrarla, dom: sonuç listesini tıklayarak oku")
+    parser.add_argument('--max-pages', type=int, help="en fazla sayfa / API isteği")
+    parser.add_argument('--page-size', type=int, help="capture modunda istek başına kayıt (varsayılan: sayfanınki)")
+    parser.add_argument('--headless', action='store_true')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """Ana fonksiyon"""
+    args = parse_args(argv)
     url = "https://ekapv2.kik.gov.tr/ekap/search"
+    started = time.perf_counter()
     
     print("="*60)
     print("EKAP İhale Scraper")
     print("="*60)
     print(f"URL: {url}")
+    print(f"Mod: {args.mode}")
     print(f"Başlangıç: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
     with sync_playwright() as p:
         # Tarayıcıyı başlat
-        browser = p.chromium.launch(
-            headless=False,  # True yaparsanız tarayıcı görünmez
-            slow_mo=100      # Hareketleri yavaşlat (debug için)
-        )
+        browser = p.chromium.launch(headless=args.headless)
         
         # Yeni sayfa aç
         page = browser.new_page()
@@ -394,11 +738,19 @@ def main():
             print(f"\nSayfa yükleniyor: {url}")
             page.goto(url, wait_until='networkidle')
             
-            # Filtreleri ayarla (tarih aralığı)
-            setup_filters(page)
-            
-            # İhaleleri scrape et (max_pages=None tüm sayfalar için)
-            ihaleler = scrape_ihaleler(page, max_pages=None)
+            ihaleler = None
+            if args.mode == 'capture':
+                # Filtreler uygulanırken arama isteği yakalanır, sayfalar API'den alınır
+                ihaleler = scrape_via_api(page, args.page_size, args.max_pages)
+                if ihaleler is None:
+                    print("DOM moduna geçiliyor...")
+            else:
+                # Filtreleri ayarla (tarih aralığı)
+                setup_filters(page)
+
+            if ihaleler is None:
+                # İhaleleri scrape et (max_pages=None tüm sayfalar için)
+                ihaleler = scrape_ihaleler(page, max_pages=args.max_pages)
             
             if ihaleler:
                 print(f"\n{'='*60}")
@@ -412,6 +764,7 @@ def main():
                     # Verileri kaydet
                     csv_file = save_to_csv(df)
                     excel_file = save_to_excel(df)
+                    save_to_db(df)
                     
                     # İhale türü dağılımı
                     print(f"\nİhale Türü Dağılımı:")
@@ -437,6 +790,7 @@ def main():
             browser.close()
     
     print(f"\nBitiş: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"Toplam süre: {time.perf_counter() - started:.1f} s")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,140 @@
+"""
+Geniş MCP aramaları için paralel, parçalı (sharded) çalıştırma.
+
+"tüm Türkiye, önümüzdeki 3 ay" gibi bir sorgu tek bir büyük search_tenders
+çağrısı olarak gittiğinde süre en yavaş cevaba bağlıdır. shard_arguments
+normalize edilmiş argümanları tarih alt pencerelerine, ihale türlerine ya da
+illere böler; iter_shard_results parçaları sınırlı eşzamanlılıkla çalıştırır,
+sonuçları tamamlanma sırasıyla İKN'ye göre tekilleştirerek üretir.
+fetch_all_pages bir parçayı dolu sayfa geldiği sürece skip ile sonuna kadar okur;
+fan-out cevabı devam cursor'ı taşımadığı için parçalar kesilmeden tamamlanmalıdır.
+"""
+
+import asyncio
+from datetime import date, timedelta
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Tarih penceresi bu günden kısa parçalara bölünmez
+MIN_WINDOW_DAYS = 3
+
+_DATE_RANGES = (
+    ("tender_date_filter", "tender_date_start", "tender_date_end"),
+    ("announcement_date_filter", "announcement_date_start", "announcement_date_end"),
+)
+
+
+def _split_dates(start: date, end: date, parts: int) -> List[Tuple[date, date]]:
+    days = (end - start).days + 1
+    parts = max(1, min(parts, days // MIN_WINDOW_DAYS))
+    step = -(-days // parts)
+    windows = []
+    cursor = start
+    while cursor <= end:
+        window_end = min(end, cursor + timedelta(days=step - 1))
+        windows.append((cursor, window_end))
+        cursor = window_end + timedelta(days=1)
+    return windows
+
+
+def _date_shards(args: Dict[str, Any], max_shards: int) -> Optional[List[Dict[str, Any]]]:
+    for filter_key, start_key, end_key in _DATE_RANGES:
+        if args.get(filter_key) != "date_range" or not args.get(start_key) or not args.get(end_key):
+            continue
+        try:
+            start = date.fromisoformat(args[start_key])
+            end = date.fromisoformat(args[end_key])
+        except ValueError:
+            return None
+        windows = _split_dates(start, end, max_shards)
+        if len(windows) < 2:
+            return None
+        return [dict(args, **{start_key: s.isoformat(), end_key: e.isoformat()}) for s, e in windows]
+    return None
+
+
+def _list_shards(args: Dict[str, Any], key: str, max_shards: int) -> Optional[List[Dict[str, Any]]]:
+    values = args.get(key) or []
+    if len(values) < 2:
+        return None
+    groups = [values[i::max_shards] for i in range(min(max_shards, len(values)))]
+    return [dict(args, **{key: sorted(group)}) for group in groups]
+
+
+def shard_arguments(args: Dict[str, Any], max_shards: int = 8) -> List[Dict[str, Any]]:
+    """
+    Argümanları birbiriyle kesişmeyen parçalara böler; bölünemiyorsa [args] döner.
+    Sıra: tarih alt pencereleri, birden çok ihale türü, birden çok il.
+    İKN ile doğrudan arama ve skip'li (devam sayfası) argümanlar bölünmez.
+    """
+    if max_shards < 2 or args.get("skip") or args.get("ikn_number"):
+        return [args]
+    for shards in (
+        _date_shards(args, max_shards),
+        _list_shards(args, "tender_types", max_shards),
+        _list_shards(args, "provinces", max_shards),
+    ):
+        if shards:
+            return shards
+    return [args]
+
+
+async def fetch_all_pages(
+    args: Dict[str, Any],
+    fetch: Callable[[Dict[str, Any]], Awaitable[Iterable[Dict[str, Any]]]],
+    page_size: int,
+    max_pages: int,
+) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    args'ı page_size'lık sayfalarla, kısa sayfa gelene kadar okur.
+    (satırlar, tamamlandı mı) döner; max_pages sayfadan sonra hâlâ dolu sayfa
+    geliyorsa okuma durur ve ikinci değer False olur.
+    """
+    rows: List[Dict[str, Any]] = []
+    for page in range(max(1, max_pages)):
+        page_args = dict(args, limit=page_size)
+        if page:
+            page_args["skip"] = page * page_size
+        else:
+            page_args.pop("skip", None)
+        fetched = list(await fetch(page_args))
+        rows.extend(fetched)
+        if len(fetched) < page_size:
+            return rows, True
+    return rows, False
+
+
+async def iter_shard_results(
+    shards: Iterable[Dict[str, Any]],
+    fetch: Callable[[Dict[str, Any]], Awaitable[Iterable[Dict[str, Any]]]],
+    concurrency: int = 4,
+    key: Callable[[Dict[str, Any]], Any] = lambda t: t.get("ikn") or t.get("id"),
+) -> AsyncIterator[Tuple[Dict[str, Any], int, List[Dict[str, Any]]]]:
+    """
+    Parçaları en fazla concurrency eşzamanlı çağrıyla çalıştırır. Her parça bittiğinde
+    (parça argümanları, parçanın döndürdüğü satır sayısı, daha önce görülmemiş satırlar)
+    üretilir. Bir parça hata verirse kalanlar iptal edilir ve hata yükselir.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(shard: Dict[str, Any]):
+        async with semaphore:
+            return shard, await fetch(shard)
+
+    tasks = [asyncio.ensure_future(run(shard)) for shard in shards]
+    seen = set()
+    try:
+        for done in asyncio.as_completed(tasks):
+            shard, tenders = await done
+            fetched = 0
+            fresh = []
+            for t in tenders:
+                fetched += 1
+                k = key(t)
+                if k in seen:
+                    continue
+                seen.add(k)
+                fresh.append(t)
+            yield shard, fetched, fresh
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -5,7 +5,7 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
-MCP_URL = "https://ihalemcp.fastmcp.app/mcp"
+MCP_URL = os.getenv("MCP_URL", "https://ihalemcp.fastmcp.app/mcp")
 
 def list_tools():
     payload = {
@@ -0,0 +1,249 @@
+"""
+/api/run için uçtan uca yük üreteci.
+
+Sorgu kaydı (--queries) sırayla, bittiğinde baştan tekrar oynatılır. Dosya düz
+metin (satır başına bir sorgu, # ile başlayan satırlar yorum) ya da JSONL
+({"query": ..., "stream": true, "fanout": false}) olabilir.
+
+İki mod vardır:
+- kapalı döngü (varsayılan): --concurrency kadar istemci, her biri cevabı bitince
+  sıradakini gönderir; sistemin ulaşabildiği verimi ölçer.
+- açık döngü (--rate): istekler cevap beklenmeden saniyede --rate hızında
+  (Poisson varışlarla) gönderilir; yük altında gecikmenin nasıl büyüdüğünü ölçer.
+
+Rapor: verim (istek/s), durum kodları, gecikme p50/p95/p99/max; akış
+isteklerinde ilk satıra kadar geçen süre (TTFB) ayrıca verilir.
+
+Kullanım:
+  python loadtest/loadgen.py --url http://127.0.0.1:8000 --concurrency 32 --duration 60
+  python loadtest/loadgen.py --rate 50 --requests 3000 --stream-ratio 0.5 --output run.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from support import percentile
+
+DEFAULT_QUERIES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "queries.txt")
+
+
+def load_queries(path: str) -> List[Dict[str, Any]]:
+    entries: List[Dict[str, Any]] = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("{"):
+                entry = json.loads(line)
+                if entry.get("query"):
+                    entries.append(entry)
+            else:
+                entries.append({"query": line})
+    if not entries:
+        raise SystemExit(f"{path}: sorgu bulunamadı")
+    return entries
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.ttfb: List[float] = []
+        self.statuses: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.tenders = 0
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+
+    def report(self) -> Dict[str, Any]:
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        done = len(self.latencies)
+
+        def summary(values: List[float]) -> Dict[str, Any]:
+            return {
+                "count": len(values),
+                "p50_ms": round(percentile(values, 50) * 1e3, 1),
+                "p95_ms": round(percentile(values, 95) * 1e3, 1),
+                "p99_ms": round(percentile(values, 99) * 1e3, 1),
+                "max_ms": round(max(values) * 1e3, 1) if values else 0.0,
+            }
+
+        return {
+            "duration_s": round(elapsed, 2),
+            "requests": done,
+            "throughput_rps": round(done / elapsed, 2) if elapsed > 0 else 0.0,
+            "tenders_per_s": round(self.tenders / elapsed, 1) if elapsed > 0 else 0.0,
+            "statuses": {str(k): v for k, v in sorted(self.statuses.items(), key=lambda kv: str(kv[0]))},
+            "errors": dict(self.errors),
+            "latency": summary(self.latencies),
+            "stream_ttfb": summary(self.ttfb),
+        }
+
+
+async def send(http: httpx.AsyncClient, entry: Dict[str, Any], stream: bool, recorder: Optional[Recorder]) -> None:
+    body = {"query": entry["query"]}
+    if entry.get("fanout"):
+        body["fanout"] = True
+    t0 = time.perf_counter()
+    try:
+        if stream:
+            body["stream"] = True
+            first: Optional[float] = None
+            last = ""
+            async with http.stream("POST", "/api/run", json=body) as resp:
+                async for line in resp.aiter_lines():
+                    if first is None:
+                        first = time.perf_counter() - t0
+                    if line:
+                        last = line
+                status = resp.status_code
+            # Akış hatası 200 içinde son olay olarak gelir; sayı "end" olayında
+            event = json.loads(last) if status == 200 and last else {}
+            tenders = event.get("count") or 0
+            if event.get("type") == "error":
+                status = "stream_error"
+        else:
+            resp = await http.post("/api/run", json=body)
+            status = resp.status_code
+            tenders = len(resp.json().get("tenders") or ()) if status == 200 else 0
+    except (httpx.HTTPError, ValueError) as e:
+        if recorder is not None:
+            recorder.errors[type(e).__name__] += 1
+            recorder.statuses["error"] += 1
+            recorder.latencies.append(time.perf_counter() - t0)
+        return
+
+    if recorder is None:
+        return
+    recorder.latencies.append(time.perf_counter() - t0)
+    recorder.statuses[status] += 1
+    recorder.tenders += tenders
+    if stream and first is not None:
+        recorder.ttfb.append(first)
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    queries = load_queries(args.queries)
+    rng = random.Random(args.seed)
+    if args.shuffle:
+        rng.shuffle(queries)
+
+    position = 0
+
+    def next_entry() -> Dict[str, Any]:
+        nonlocal position
+        entry = queries[position % len(queries)]
+        position += 1
+        return entry
+
+    def is_stream(entry: Dict[str, Any]) -> bool:
+        if "stream" in entry:
+            return bool(entry["stream"])
+        return rng.random() < args.stream_ratio
+
+    limits = httpx.Limits(max_connections=args.connections, max_keepalive_connections=args.connections)
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits) as http:
+        if args.warmup:
+            print(f"ısınma: {args.warmup} istek")
+            await asyncio.gather(*(send(http, e, is_stream(e), None) for e in (next_entry() for _ in range(args.warmup))))
+
+        recorder = Recorder()
+        deadline = recorder.started + args.duration if args.duration else None
+        budget = args.requests
+
+        def more() -> bool:
+            nonlocal budget
+            if deadline is not None and time.perf_counter() >= deadline:
+                return False
+            if budget is not None:
+                if budget <= 0:
+                    return False
+                budget -= 1
+            return True
+
+        if args.rate:
+            tasks = set()
+            next_at = time.perf_counter()
+            while more():
+                delay = next_at - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                entry = next_entry()
+                task = asyncio.ensure_future(send(http, entry, is_stream(entry), recorder))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                next_at += rng.expovariate(args.rate)
+            if tasks:
+                await asyncio.wait(tasks)
+        else:
+            async def worker():
+                while more():
+                    entry = next_entry()
+                    await send(http, entry, is_stream(entry), recorder)
+
+            await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+
+        recorder.finished = time.perf_counter()
+
+    report = recorder.report()
+    report["config"] = {
+        "url": args.url,
+        "mode": f"open rate={args.rate}/s" if args.rate else f"closed concurrency={args.concurrency}",
+        "queries": args.queries,
+        "stream_ratio": args.stream_ratio,
+    }
+    return report
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(f"\n{report['config']['mode']}  süre={report['duration_s']}s  istek={report['requests']}")
+    print(f"verim: {report['throughput_rps']} istek/s, {report['tenders_per_s']} ihale/s")
+    print("durumlar: " + ", ".join(f"{k}={v}" for k, v in report["statuses"].items()))
+    if report["errors"]:
+        print("istemci hataları: " + ", ".join(f"{k}={v}" for k, v in report["errors"].items()))
+    print(f"{'':<14}{'adet':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for label, key in (("gecikme", "latency"), ("akış TTFB", "stream_ttfb")):
+        s = report[key]
+        if s["count"]:
+            print(f"{label:<14}{s['count']:>7}{s['p50_ms']:>10}{s['p95_ms']:>10}{s['p99_ms']:>10}{s['max_ms']:>10}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--queries", default=DEFAULT_QUERIES)
+    parser.add_argument("--concurrency", type=int, default=16, help="kapalı döngüde eş istemci sayısı")
+    parser.add_argument("--rate", type=float, help="açık döngü: saniyedeki istek sayısı")
+    parser.add_argument("--duration", type=float, help="saniye (--requests ile birlikte önce dolan durdurur)")
+    parser.add_argument("--requests", type=int, help="toplam istek sayısı")
+    parser.add_argument("--warmup", type=int, default=0, help="rapora girmeyen ısınma istekleri")
+    parser.add_argument("--stream-ratio", type=float, default=0.0, help="NDJSON akışıyla gönderilecek istek oranı")
+    parser.add_argument("--shuffle", action="store_true")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--connections", type=int, default=256)
+    parser.add_argument("--output", help="raporu JSON olarak bu dosyaya da yaz")
+    args = parser.parse_args()
+    if not args.duration and not args.requests:
+        args.duration = 30.0
+
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"rapor: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,261 @@
+"""
+ihalemcp.fastmcp.app yerine geçen yerel MCP sunucusu (yük testi için).
+
+JSON-RPC 2.0 üzerinden initialize, tools/list ve tools/call (search_tenders)
+desteklenir. Cevap gerçek sunucudaki gibi Accept başlığına göre text/event-stream
+ya da düz JSON olarak döner (--format ile sabitlenebilir); result hem
+structuredContent.tenders hem de content[0].text (kaçışlı JSON) içerir.
+
+İhaleler sentetik (--pool) ya da kaydedilmiş bir cevaptan (--recorded) gelir;
+search_text / provinces / tender_types ve ihale / ilan tarihi filtreleriyle süzülür,
+skip / limit ile sayfalanır. İlan tarihi olmayan (kaydedilmiş) kayıtlar ilan tarihi
+filtresinden geçer.
+Her ihalenin JSON'u açılışta bir kez üretilir, istek başına yalnızca birleştirilir.
+
+Kullanım:
+  python loadtest/mcp_stub.py --port 9001 --latency 0.2 --jitter 0.1 --error-rate 0.02
+  MCP_URL=http://127.0.0.1:9001/mcp uvicorn app:app
+"""
+
+import argparse
+import json
+from collections import Counter
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+from support import Fault, load_recorded_tenders, synthetic_tenders
+
+from query_parser import province_code
+from turkish import ascii_fold
+
+BODY_CHUNK_SIZE = 64 * 1024
+
+SEARCH_TENDERS_TOOL = {
+    "name": "search_tenders",
+    "description": "EKAP ihalelerinde arama (yerel taklit)",
+    "inputSchema": {
+        "type": "object",
+        "properties": {
+            "search_text": {"type": "string"},
+            "ikn_year": {"type": "integer"},
+            "ikn_number": {"type": "integer"},
+            "tender_types": {"type": "array", "items": {"type": "integer"}},
+            "provinces": {"type": "array", "items": {"type": "integer"}},
+            "tender_date_filter": {"type": "string", "enum": ["from_today", "date_range"]},
+            "tender_date_start": {"type": "string"},
+            "tender_date_end": {"type": "string"},
+            "announcement_date_filter": {"type": "string", "enum": ["today", "date_range"]},
+            "announcement_date_start": {"type": "string"},
+            "announcement_date_end": {"type": "string"},
+            "limit": {"type": "integer"},
+            "skip": {"type": "integer"},
+        },
+    },
+}
+
+
+def parse_day(value: Any) -> Optional[date]:
+    """"dd.mm.yyyy[ HH:MM]" ya da ISO tarihi date'e çevirir."""
+    text = str(value or "").strip()
+    if not text:
+        return None
+    try:
+        return datetime.strptime(text[:10], "%d.%m.%Y").date()
+    except ValueError:
+        pass
+    try:
+        return date.fromisoformat(text[:10])
+    except ValueError:
+        return None
+
+
+def date_bounds(arguments: Dict[str, Any], prefix: str) -> Optional[Tuple[Optional[date], Optional[date]]]:
+    """<prefix>_date_filter argümanlarını [başlangıç, bitiş] aralığına çevirir; filtre yoksa None."""
+    mode = arguments.get(f"{prefix}_date_filter")
+    today = date.today()
+    if mode == "today":
+        return today, today
+    if mode == "from_today":
+        return today, None
+    if mode == "date_range":
+        return parse_day(arguments.get(f"{prefix}_date_start")), parse_day(arguments.get(f"{prefix}_date_end"))
+    return None
+
+
+def in_bounds(day: Optional[date], bounds: Tuple[Optional[date], Optional[date]]) -> bool:
+    start, end = bounds
+    if day is None:
+        return False
+    return (start is None or day >= start) and (end is None or day <= end)
+
+
+class TenderPool:
+    def __init__(self, tenders: List[Dict[str, Any]]):
+        self.encoded = [json.dumps(t, ensure_ascii=False) for t in tenders]
+        self.names = [ascii_fold(str(t.get("name") or "")) for t in tenders]
+        self.provinces = [province_code(str(t.get("province") or "")) for t in tenders]
+        self.types = [(t.get("type") or {}).get("code") for t in tenders]
+        self.tender_days = [parse_day(t.get("tender_datetime")) for t in tenders]
+        self.announcement_days = [parse_day(t.get("announcement_date")) for t in tenders]
+
+    def __len__(self) -> int:
+        return len(self.encoded)
+
+    def search(self, arguments: Dict[str, Any]) -> List[str]:
+        words = ascii_fold(arguments.get("search_text") or "").split()
+        provinces = set(arguments.get("provinces") or ())
+        types = set(arguments.get("tender_types") or ())
+        tender_bounds = date_bounds(arguments, "tender")
+        announcement_bounds = date_bounds(arguments, "announcement")
+        skip = int(arguments.get("skip") or 0)
+        limit = int(arguments.get("limit") or 100)
+
+        matched: List[str] = []
+        seen = 0
+        for i, encoded in enumerate(self.encoded):
+            if provinces and self.provinces[i] not in provinces:
+                continue
+            if types and self.types[i] not in types:
+                continue
+            if tender_bounds and not in_bounds(self.tender_days[i], tender_bounds):
+                continue
+            if announcement_bounds and self.announcement_days[i] is not None \
+                    and not in_bounds(self.announcement_days[i], announcement_bounds):
+                continue
+            if words and not all(w in self.names[i] for w in words):
+                continue
+            seen += 1
+            if seen <= skip:
+                continue
+            matched.append(encoded)
+            if len(matched) >= limit:
+                break
+        return matched
+
+
+def tool_result_body(rpc_id: Any, encoded: List[str], with_content: bool) -> str:
+    tenders = "[" + ", ".join(encoded) + "]"
+    result = '"structuredContent": {"tenders": ' + tenders + "}"
+    if with_content:
+        text = json.dumps('{"tenders": ' + tenders + "}", ensure_ascii=False)
+        result = '"content": [{"type": "text", "text": ' + text + "}], " + result
+    return '{"jsonrpc": "2.0", "id": ' + json.dumps(rpc_id) + ', "result": {' + result + "}}"
+
+
+def create_app(
+    pool: TenderPool,
+    fault: Fault,
+    fmt: str = "auto",
+    rpc_error_rate: float = 0.0,
+    with_content: bool = True,
+) -> FastAPI:
+    app = FastAPI(title="MCP taklidi")
+    stats: Counter = Counter()
+
+    def rpc_response(request: Request, body: str) -> Response:
+        use_sse = fmt == "sse" or (fmt == "auto" and "text/event-stream" in request.headers.get("accept", ""))
+        if not use_sse:
+            return Response(body, media_type="application/json")
+
+        payload = ("event: message\ndata: " + body + "\n\n").encode("utf-8")
+
+        async def chunks():
+            for start in range(0, len(payload), BODY_CHUNK_SIZE):
+                yield payload[start:start + BODY_CHUNK_SIZE]
+
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+
+    def rpc_error(rpc_id: Any, code: int, message: str) -> str:
+        return json.dumps({"jsonrpc": "2.0", "id": rpc_id, "error": {"code": code, "message": message}})
+
+    @app.post("/mcp")
+    async def mcp(request: Request):
+        try:
+            message = await request.json()
+        except ValueError:
+            stats["bad_request"] += 1
+            return JSONResponse({"error": "geçersiz JSON"}, status_code=400)
+        method = message.get("method")
+        rpc_id = message.get("id")
+        stats[f"method:{method}"] += 1
+
+        if rpc_id is None:
+            # Bildirimlere (notifications/initialized vb.) cevap gövdesi yok
+            return Response(status_code=202)
+
+        if method == "initialize":
+            return rpc_response(request, json.dumps({
+                "jsonrpc": "2.0",
+                "id": rpc_id,
+                "result": {
+                    "protocolVersion": (message.get("params") or {}).get("protocolVersion", "2025-03-26"),
+                    "capabilities": {"tools": {"listChanged": False}},
+                    "serverInfo": {"name": "ihale-mcp-stub", "version": "0.1"},
+                },
+            }))
+        if method == "tools/list":
+            return rpc_response(request, json.dumps({"jsonrpc": "2.0", "id": rpc_id, "result": {"tools": [SEARCH_TENDERS_TOOL]}}))
+        if method != "tools/call":
+            return rpc_response(request, rpc_error(rpc_id, -32601, f"bilinmeyen method: {method}"))
+
+        params = message.get("params") or {}
+        if params.get("name") != SEARCH_TENDERS_TOOL["name"]:
+            return rpc_response(request, rpc_error(rpc_id, -32602, f"bilinmeyen tool: {params.get('name')}"))
+
+        await fault.wait()
+        if fault.should_fail():
+            stats["injected_http_errors"] += 1
+            return JSONResponse({"error": "yapay hata"}, status_code=503)
+        if fault.roll(rpc_error_rate):
+            stats["injected_rpc_errors"] += 1
+            return rpc_response(request, rpc_error(rpc_id, -32000, "yapay tool hatası"))
+
+        encoded = pool.search(params.get("arguments") or {})
+        stats["tenders_served"] += len(encoded)
+        return rpc_response(request, tool_result_body(rpc_id, encoded, with_content))
+
+    @app.get("/stats")
+    async def get_stats():
+        return dict(stats, pool_size=len(pool))
+
+    @app.post("/stats/reset")
+    async def reset_stats():
+        stats.clear()
+        return {"ok": True}
+
+    return app
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9001)
+    parser.add_argument("--pool", type=int, default=5000, help="sentetik ihale sayısı")
+    parser.add_argument("--recorded", help="kaydedilmiş MCP cevabı (JSON); verilirse sentetik yerine kullanılır")
+    parser.add_argument("--format", choices=("auto", "json", "sse"), default="auto")
+    parser.add_argument("--no-content", action="store_true", help="content[0].text kopyasını gönderme")
+    parser.add_argument("--latency", type=float, default=0.2, help="sabit gecikme (s)")
+    parser.add_argument("--jitter", type=float, default=0.1, help="üstel ek gecikmenin ortalaması (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="503 dönen tools/call oranı")
+    parser.add_argument("--rpc-error-rate", type=float, default=0.0, help="JSON-RPC error dönen tools/call oranı")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    tenders = load_recorded_tenders(args.recorded) if args.recorded else synthetic_tenders(args.pool, args.seed)
+    app = create_app(
+        TenderPool(tenders),
+        Fault(args.latency, args.jitter, args.error_rate, args.seed),
+        fmt=args.format,
+        rpc_error_rate=args.rpc_error_rate,
+        with_content=not args.no_content,
+    )
+    uvicorn.run(app, host=args.host, port=args.port, ws="none", log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+OpenAI chat completions API'sinin yerel taklidi (yük testi için).
+
+POST /v1/chat/completions son kullanıcı mesajını kelime kelime MCP argümanlarına
+çevirir: il adları provinces'a, ihale türleri tender_types'a, kalan kelimeler
+search_text'e gider. Cevap OpenAI şemasındadır; openai SDK'sı ile çalışır.
+
+Kullanım:
+  python loadtest/openai_stub.py --port 9002 --latency 0.6 --jitter 0.3 --rate-limit-rate 0.01
+  OPENAI_BASE_URL=http://127.0.0.1:9002/v1 uvicorn app:app
+"""
+
+import argparse
+import json
+import time
+import uuid
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from support import Fault
+
+from query_parser import province_code, tender_type_code
+
+
+def arguments_for(user_query: str) -> Dict[str, Any]:
+    provinces: List[int] = []
+    tender_types: List[int] = []
+    words: List[str] = []
+    for word in user_query.split():
+        code = province_code(word)
+        if code:
+            if code not in provinces:
+                provinces.append(code)
+            continue
+        type_code = tender_type_code(word)
+        if type_code:
+            if type_code not in tender_types:
+                tender_types.append(type_code)
+            continue
+        words.append(word)
+    return {"search_text": " ".join(words), "tender_types": tender_types, "provinces": provinces}
+
+
+def openai_error(status_code: int, message: str, error_type: str) -> JSONResponse:
+    return JSONResponse(
+        {"error": {"message": message, "type": error_type, "param": None, "code": None}},
+        status_code=status_code,
+    )
+
+
+def create_app(fault: Fault, rate_limit_rate: float = 0.0) -> FastAPI:
+    app = FastAPI(title="OpenAI taklidi")
+    stats: Counter = Counter()
+
+    @app.post("/v1/chat/completions")
+    @app.post("/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        stats["calls"] += 1
+        messages = body.get("messages") or []
+        user_query = next((m.get("content") or "" for m in reversed(messages) if m.get("role") == "user"), "")
+
+        await fault.wait()
+        if fault.roll(rate_limit_rate):
+            stats["injected_rate_limits"] += 1
+            return openai_error(429, "Rate limit reached (yapay)", "rate_limit_error")
+        if fault.should_fail():
+            stats["injected_errors"] += 1
+            return openai_error(500, "The server had an error (yapay)", "server_error")
+
+        content = json.dumps(arguments_for(user_query), ensure_ascii=False)
+        prompt_tokens = sum(len(str(m.get("content") or "")) for m in messages) // 4
+        completion_tokens = len(content) // 4
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "gpt-4o"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "logprobs": None,
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    @app.get("/stats")
+    async def get_stats():
+        return dict(stats)
+
+    @app.post("/stats/reset")
+    async def reset_stats():
+        stats.clear()
+        return {"ok": True}
+
+    return app
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9002)
+    parser.add_argument("--latency", type=float, default=0.6, help="sabit gecikme (s)")
+    parser.add_argument("--jitter", type=float, default=0.3, help="üstel ek gecikmenin ortalaması (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="500 dönen istek oranı")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="429 dönen istek oranı")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    app = create_app(Fault(args.latency, args.jitter, args.error_rate, args.seed), args.rate_limit_rate)
+    uvicorn.run(app, host=args.host, port=args.port, ws="none", log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+MCP taklidi, OpenAI taklidi ve uygulamayı birlikte yerelde başlatır.
+
+Uygulama MCP_URL / OPENAI_BASE_URL ile taklit sunuculara yönlendirilir; hiçbir
+istek ihalemcp.fastmcp.app'e ya da OpenAI'a gitmez. Ctrl+C hepsini kapatır.
+"--" sonrasındaki argümanlar olduğu gibi mcp_stub.py'ye geçer.
+
+Kullanım:
+  python loadtest/stack.py --workers 2 -- --latency 0.3 --error-rate 0.01
+  python loadtest/loadgen.py --concurrency 32 --duration 60   # başka bir terminalde
+"""
+
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+from typing import List
+
+import httpx
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+
+
+def wait_ready(url: str, proc: subprocess.Popen, timeout: float = 20.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise SystemExit(f"{url} açılamadı (süreç {proc.returncode} koduyla çıktı)")
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise SystemExit(f"{url} {timeout:.0f}s içinde açılmadı")
+
+
+def main() -> int:
+    argv = sys.argv[1:]
+    mcp_args: List[str] = []
+    if "--" in argv:
+        split = argv.index("--")
+        argv, mcp_args = argv[:split], argv[split + 1:]
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--mcp-port", type=int, default=9001)
+    parser.add_argument("--openai-port", type=int, default=9002)
+    parser.add_argument("--llm-latency", type=float, default=0.6)
+    parser.add_argument("--llm-jitter", type=float, default=0.3)
+    args = parser.parse_args(argv)
+
+    env = dict(
+        os.environ,
+        MCP_URL=f"http://{args.host}:{args.mcp_port}/mcp",
+        OPENAI_BASE_URL=f"http://{args.host}:{args.openai_port}/v1",
+        OPENAI_API_KEY=os.environ.get("OPENAI_API_KEY", "loadtest"),
+    )
+    commands = [
+        [sys.executable, os.path.join(HERE, "mcp_stub.py"), "--host", args.host, "--port", str(args.mcp_port), *mcp_args],
+        [sys.executable, os.path.join(HERE, "openai_stub.py"), "--host", args.host, "--port", str(args.openai_port),
+         "--latency", str(args.llm_latency), "--jitter", str(args.llm_jitter)],
+        [sys.executable, "-m", "uvicorn", "app:app", "--host", args.host, "--port", str(args.port),
+         "--workers", str(args.workers), "--ws", "none", "--log-level", "warning"],
+    ]
+
+    procs = []
+    try:
+        for command in commands[:2]:
+            procs.append(subprocess.Popen(command, cwd=ROOT, env=env))
+        wait_ready(f"http://{args.host}:{args.mcp_port}/stats", procs[0])
+        wait_ready(f"http://{args.host}:{args.openai_port}/stats", procs[1])
+        procs.append(subprocess.Popen(commands[2], cwd=ROOT, env=env))
+        wait_ready(f"http://{args.host}:{args.port}/api/stats", procs[2])
+        print(f"hazır: uygulama http://{args.host}:{args.port}  MCP {env['MCP_URL']}  OpenAI {env['OPENAI_BASE_URL']}")
+        while all(p.poll() is None for p in procs):
+            time.sleep(0.5)
+        return 1
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        for p in procs:
+            if p.poll() is None:
+                p.send_signal(signal.SIGINT)
+        for p in procs:
+            try:
+                p.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                p.kill()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""
+Yük testi araçları için ortak yardımcılar.
+
+Taklit sunucular gerçek servislerin gecikme ve hata davranışını Fault ile
+taklit eder; sentetik ihale kayıtları benchmarks/common.py ile aynı şemadadır.
+"""
+
+import asyncio
+import json
+import os
+import random
+import sys
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ROOT, os.path.join(ROOT, "benchmarks")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from common import PROVINCES as MAJOR_PROVINCES, STATUSES, make_raw_tender, percentile  # noqa: E402,F401
+
+from query_parser import PROVINCES, TENDER_TYPES  # noqa: E402
+
+# Konu ve ihale türü birbirine bağlıdır (asfalt işi Yapım'dır); il ve tarih bağımsız çekilir
+SUBJECTS = [
+    ("Tıbbi Sarf Malzemesi Alımı", 1),
+    ("Asfalt Yama ve Kaplama Yapım İşi", 2),
+    ("Temizlik Hizmeti Alımı", 3),
+    ("Özel Güvenlik Hizmeti Alımı", 3),
+    ("Bilgisayar ve Çevre Birimleri Alımı", 1),
+    ("Akaryakıt Alımı", 1),
+    ("Okul Binası Onarım İşi", 2),
+    ("Yemek Hizmeti Alımı", 3),
+    ("Laboratuvar Kiti Alımı", 1),
+    ("Proje Müşavirlik Hizmeti", 4),
+]
+
+# İhalelerin bu kadarı büyük illerde (queries.txt'deki iller), kalanı 81 ile yayılır
+MAJOR_PROVINCE_SHARE = 0.6
+# İlan tarihi bugünden en fazla bu kadar gün önce; ihale tarihi ilandan 7-60 gün sonra
+ANNOUNCEMENT_DAYS = 45
+
+
+class Fault:
+    """
+    Taklit sunucunun gecikme / hata profili.
+    latency sabit gecikme, jitter ortalaması bu olan üstel ek gecikmedir (kuyruk
+    gecikmesi üretir); error_rate isteklerin hangi oranda 5xx ile döneceğidir.
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0, seed: Optional[int] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+
+    def delay(self) -> float:
+        extra = self._random.expovariate(1.0 / self.jitter) if self.jitter > 0 else 0.0
+        return self.latency + extra
+
+    async def wait(self) -> None:
+        seconds = self.delay()
+        if seconds > 0:
+            await asyncio.sleep(seconds)
+
+    def roll(self, rate: float) -> bool:
+        return rate > 0 and self._random.random() < rate
+
+    def should_fail(self) -> bool:
+        return self.roll(self.error_rate)
+
+
+def synthetic_tenders(n: int, seed: Optional[int] = None, today: Optional[date] = None) -> List[Dict[str, Any]]:
+    """
+    Sentetik ihaleler. Konu, il, durum ve tarihler birbirinden bağımsız çekilir; böylece
+    il + tür gibi birleşik filtrelerin hepsi eşleşebilir, tarih filtreleri de anlamlıdır.
+    Taklit sunucunun süzebilmesi için ilan tarihi announcement_date alanında tutulur.
+    """
+    rng = random.Random(seed)
+    today = today or date.today()
+    all_provinces = list(PROVINCES.values())
+    tenders = []
+    for i in range(n):
+        subject, type_code = SUBJECTS[rng.randrange(len(SUBJECTS))]
+        if rng.random() < MAJOR_PROVINCE_SHARE:
+            province = rng.choice(MAJOR_PROVINCES)
+        else:
+            province = rng.choice(all_provinces)
+        announced = today - timedelta(days=rng.randint(0, ANNOUNCEMENT_DAYS))
+        tender_day = announced + timedelta(days=rng.randint(7, 60))
+
+        tender = make_raw_tender(i)
+        tender.update(
+            name=f"{subject} ({i})",
+            type={"code": type_code, "description": TENDER_TYPES[type_code]},
+            status={"code": 1, "description": rng.choice(STATUSES)},
+            province=province,
+            tender_datetime=f"{tender_day.strftime('%d.%m.%Y')} {rng.randint(9, 16):02d}:{rng.choice((0, 30)):02d}",
+            announcement_date=announced.strftime("%d.%m.%Y"),
+        )
+        tenders.append(tender)
+    return tenders
+
+
+def load_recorded_tenders(path: str) -> List[Dict[str, Any]]:
+    """
+    Kaydedilmiş bir MCP cevabından ihaleleri okur. Dosya tam JSON-RPC cevabı,
+    {"tenders": [...]} ya da doğrudan bir liste olabilir.
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("result", data)
+        data = data.get("structuredContent", data)
+        data = data.get("tenders")
+    if not isinstance(data, list):
+        raise ValueError(f"{path}: ihale listesi bulunamadı")
+    return data
+
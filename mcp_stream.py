@@ -0,0 +1,333 @@
+"""
+MCP cevapları için artımlı (streaming) ayrıştırıcı.
+
+search_tenders cevabı tek bir JSON-RPC mesajıdır; ya düz JSON ya da SSE
+(text/event-stream) içinde "data:" satırları olarak gelir. Gövdenin tamamını
+belleğe almak yerine byte parçaları geldikçe:
+
+1. SSEDecoder olay sınırlarını ve çok satırlı "data:" alanlarını çözer,
+2. JSONItemScanner JSON yapısını yalnızca izler (değerleri saklamadan) ve
+   result.structuredContent.tenders dizisinin elemanlarını tek tek üretir.
+   result sarmalayıcısı olmayan gövdelerde structuredContent.tenders de kabul
+   edilir; ikisi de yoksa cevap sessizce boş sayılmaz, ValueError yükselir.
+
+Böylece bellekte aynı anda en fazla bir okuma parçası ve bir ihale kaydı bulunur;
+tepe bellek kullanımı limit'ten bağımsızdır.
+"""
+
+import codecs
+import json
+import re
+import time
+from typing import Any, AsyncIterator, Iterable, List, Optional, Tuple
+
+TENDERS_PATH = ("result", "structuredContent", "tenders")
+
+_STRUCTURAL_RE = re.compile(r'[{}\[\]",:]')
+_STRING_BODY_RE = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*')
+_WS_COMMA_RE = re.compile(r"[\s,]*")
+_WS_RE = re.compile(r"\s*")
+_SSE_FIELD_END_RE = re.compile(r"[:\r\n]")
+_SSE_LINE_END_RE = re.compile(r"[\r\n]")
+
+_decoder = json.JSONDecoder()
+
+
+class _Frame:
+    __slots__ = ("is_object", "key", "expect_key")
+
+    def __init__(self, is_object: bool):
+        self.is_object = is_object
+        self.key: Optional[str] = None
+        self.expect_key = is_object
+
+
+class JSONItemScanner:
+    """
+    JSON metnini parça parça okur, verilen yoldaki dizinin elemanlarını döner.
+    En üst seviyedeki "error" alanı (JSON-RPC hatası) ayrıca yakalanır.
+    """
+
+    def __init__(self, path: Tuple[str, ...] = TENDERS_PATH):
+        self.path = list(path)
+        # JSON-RPC sarmalayıcısı olmadan gelen gövdeler için ("result" yoksa) aynı yol
+        self._paths = [self.path]
+        if len(self.path) > 1 and self.path[0] == "result":
+            self._paths.append(self.path[1:])
+        self.error: Any = None
+        self.found = False
+        self.started = False
+        self._buf = ""
+        self._stack: List[_Frame] = []
+        self._in_string = False
+        self._string_is_key = False
+        self._key_parts: List[str] = []
+        self._in_items = False
+        self._capture_error = False
+
+    def _at_target(self) -> bool:
+        for path in self._paths:
+            if len(self._stack) == len(path) and all(
+                f.is_object and f.key == k for f, k in zip(self._stack, path)
+            ):
+                return True
+        return False
+
+    def feed(self, text: str) -> List[Any]:
+        items: List[Any] = []
+        buf = self._buf + text if self._buf else text
+        pos = 0
+        n = len(buf)
+
+        while pos < n:
+            if self._in_string:
+                end = _STRING_BODY_RE.match(buf, pos).end()
+                if end < n and buf[end] == '"':
+                    if self._string_is_key:
+                        self._key_parts.append(buf[pos:end])
+                        frame = self._stack[-1]
+                        frame.key = json.loads('"' + "".join(self._key_parts) + '"')
+                        frame.expect_key = False
+                        self._key_parts = []
+                    self._in_string = False
+                    pos = end + 1
+                    continue
+                # String bu parçada bitmedi; yarım kaçış dizisi (\) varsa sonraki parçaya bırak
+                if self._string_is_key:
+                    self._key_parts.append(buf[pos:end])
+                pos = end
+                break
+
+            if self._in_items or self._capture_error:
+                pos = (_WS_COMMA_RE if self._in_items else _WS_RE).match(buf, pos).end()
+                if pos >= n:
+                    break
+                if self._in_items and buf[pos] == "]":
+                    self._in_items = False
+                    pos += 1
+                    continue
+                try:
+                    value, end = _decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    # Eleman henüz tamamlanmadı
+                    break
+                pos = end
+                if self._in_items:
+                    items.append(value)
+                else:
+                    self.error = value
+                    self._capture_error = False
+                continue
+
+            m = _STRUCTURAL_RE.search(buf, pos)
+            if not m:
+                pos = n
+                break
+            c = m.group()
+            pos = m.end()
+            top = self._stack[-1] if self._stack else None
+
+            if c == '"':
+                self._in_string = True
+                self._string_is_key = top is not None and top.is_object and top.expect_key
+            elif c == "{":
+                self.started = True
+                self._stack.append(_Frame(True))
+            elif c == "[":
+                self.started = True
+                if self._at_target():
+                    self.found = True
+                    self._in_items = True
+                else:
+                    self._stack.append(_Frame(False))
+            elif c in "}]":
+                if self._stack:
+                    self._stack.pop()
+            elif c == ",":
+                if top is not None and top.is_object:
+                    top.expect_key = True
+            elif c == ":":
+                if len(self._stack) == 1 and top.key == "error":
+                    self._capture_error = True
+
+        self._buf = buf[pos:]
+        return items
+
+    def close(self) -> None:
+        if self._in_items or self._capture_error or self._in_string or self._stack:
+            raise ValueError("MCP JSON parse hatası: cevap yarıda kesildi")
+        if self._buf.strip():
+            raise ValueError(f"MCP JSON parse hatası: beklenmeyen veri {self._buf[:100]!r}")
+
+
+class SSEDecoder:
+    """
+    text/event-stream çözücüsü. feed() şu olayları sırayla döner:
+      ("data", parça)  - aktif olayın data alanından bir parça (satırlar arası "\\n" dahil)
+      ("dispatch", ad) - boş satır: olay tamamlandı
+    Uzun bir "data:" satırı tamponlanmadan parça parça iletilir.
+    """
+
+    def __init__(self):
+        self._field: Optional[str] = None
+        self._name_parts: List[str] = []
+        self._strip_space = False
+        self._skip_lf = False
+        self._data_lines = 0
+        self._event_name = ""
+
+    def feed(self, text: str) -> List[Tuple[str, str]]:
+        out: List[Tuple[str, str]] = []
+        i = 0
+        n = len(text)
+        while i < n:
+            if self._skip_lf:
+                self._skip_lf = False
+                if text[i] == "\n":
+                    i += 1
+                    continue
+
+            if self._field is None:
+                m = _SSE_FIELD_END_RE.search(text, i)
+                if not m:
+                    self._name_parts.append(text[i:])
+                    break
+                self._name_parts.append(text[i:m.start()])
+                name = "".join(self._name_parts)
+                self._name_parts = []
+                i = m.end()
+                if m.group() == ":":
+                    self._field = name or "comment"
+                    self._strip_space = True
+                    self._start_field(name, out)
+                    continue
+                # Satır sonu
+                self._skip_lf = m.group() == "\r"
+                if name == "":
+                    self._dispatch(out)
+                else:
+                    self._start_field(name, out)
+                continue
+
+            if self._strip_space:
+                self._strip_space = False
+                if text[i] == " ":
+                    i += 1
+                    continue
+
+            m = _SSE_LINE_END_RE.search(text, i)
+            segment = text[i:m.start() if m else n]
+            if segment:
+                if self._field == "data":
+                    out.append(("data", segment))
+                elif self._field == "event":
+                    self._event_name += segment
+            if not m:
+                break
+            self._field = None
+            self._skip_lf = m.group() == "\r"
+            i = m.end()
+        return out
+
+    def _start_field(self, name: str, out: List[Tuple[str, str]]) -> None:
+        if name == "data":
+            if self._data_lines:
+                out.append(("data", "\n"))
+            self._data_lines += 1
+
+    def _dispatch(self, out: List[Tuple[str, str]]) -> None:
+        if self._data_lines:
+            out.append(("dispatch", self._event_name or "message"))
+        self._data_lines = 0
+        self._event_name = ""
+
+    def close(self) -> List[Tuple[str, str]]:
+        # Son olaydan sonra boş satır gelmediyse yine de tamamla
+        out: List[Tuple[str, str]] = []
+        self._field = None
+        self._dispatch(out)
+        return out
+
+
+def parse_sse_messages(text: str) -> List[str]:
+    """SSE gövdesindeki her olayın data içeriğini (çok satırlı data birleştirilmiş) döner."""
+    decoder = SSEDecoder()
+    messages: List[str] = []
+    parts: List[str] = []
+    for kind, value in decoder.feed(text) + decoder.close():
+        if kind == "data":
+            parts.append(value)
+        else:
+            messages.append("".join(parts))
+            parts = []
+    return messages
+
+
+async def iter_mcp_items(
+    chunks: AsyncIterator[bytes],
+    content_type: str,
+    path: Tuple[str, ...] = TENDERS_PATH,
+    timer: Optional[Any] = None,
+) -> AsyncIterator[Any]:
+    """
+    MCP HTTP gövdesini byte parçaları halinde okur, path'teki dizinin elemanlarını üretir.
+    JSON-RPC hatası RuntimeError, bozuk gövde ya da path'i içermeyen cevap ValueError
+    olarak yükselir.
+    timer verilirse parça başına ayrıştırma süresi timer.total'a eklenir.
+    """
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    is_sse = "text/event-stream" in content_type
+    sse = SSEDecoder() if is_sse else None
+    scanner = JSONItemScanner(path)
+    saw_message = False
+    found = False
+
+    def finish(current: JSONItemScanner) -> None:
+        nonlocal found
+        current.close()
+        if current.error is not None:
+            raise RuntimeError(f"MCP error: {current.error}")
+        found = found or current.found
+
+    def missing() -> ValueError:
+        return ValueError(f"MCP cevabında {'.'.join(path)} bulunamadı")
+
+    def consume(text: str) -> Iterable[Any]:
+        nonlocal scanner, saw_message
+        if sse is None:
+            return scanner.feed(text)
+        items: List[Any] = []
+        for kind, value in sse.feed(text) if text is not None else sse.close():
+            if kind == "data":
+                items.extend(scanner.feed(value))
+            else:
+                saw_message = True
+                finish(scanner)
+                scanner = JSONItemScanner(path)
+        return items
+
+    async for chunk in chunks:
+        if timer is None:
+            items = consume(text_decoder.decode(chunk))
+        else:
+            t0 = time.perf_counter()
+            items = consume(text_decoder.decode(chunk))
+            timer.total += time.perf_counter() - t0
+        for item in items:
+            yield item
+
+    for item in consume(text_decoder.decode(b"", final=True)):
+        yield item
+
+    if sse is None:
+        if not scanner.started:
+            raise ValueError("MCP JSON parse hatası: boş cevap")
+        finish(scanner)
+    else:
+        for item in consume(None):
+            yield item
+        if not saw_message:
+            raise ValueError("SSE formatı ama data yok")
+    # Bildirim olayları tenders taşımaz; ama hiçbir mesajda yoksa cevap beklenen biçimde değil
+    if not found:
+        raise missing()
@@ -0,0 +1,365 @@
+"""
+Prometheus metin formatında (text exposition 0.0.4) hafif metrikler.
+
+prometheus_client bağımlılığı yerine yalnızca ihtiyaç duyulan parçalar:
+Counter, Gauge, Histogram ve değerini render anında bir fonksiyondan okuyan
+CallbackMetric. Sıcak yoldaki maliyet bir dict araması ve bisect'tir; etiketli
+alt metrikler (labels(...)) modül seviyesinde bir kez bağlanıp tekrar kullanılır.
+
+Mevcut sayaçlar (cache, single-flight, devre kesici istatistikleri) kopyalanmaz;
+CallbackMetric ile /metrics isteği geldiğinde okunur.
+
+Stage, aşama histogramına yazarken aynı süreyi o anki isteğin aşama toplamlarına da
+ekler (request_timings); bu toplamlar Server-Timing başlığına dönüşür.
+"""
+
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Saniye cinsinden gecikmeler için varsayılan kovalar (1ms .. 60s)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+
+    def _new_child(self) -> Any:
+        raise NotImplementedError
+
+    def labels(self, *values: Any) -> Any:
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name}: {len(self.labelnames)} etiket bekleniyordu")
+            child = self._children[key] = self._new_child()
+        return child
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for key, child in self._children.items():
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.value)}")
+        return lines
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.labels().dec(amount)
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+
+class _HistogramChild:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        # Son eleman +Inf kovası
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def time(self) -> "_Timer":
+        return _Timer(self)
+
+
+class _Timer:
+    __slots__ = ("child", "start")
+
+    def __init__(self, child: _HistogramChild):
+        self.child = child
+
+    def __enter__(self) -> "_Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.child.observe(time.perf_counter() - self.start)
+
+
+# O anki isteğin aşama süreleri (saniye); istek dışında None
+_request_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_timings", default=None)
+
+
+class Stage:
+    """Bir aşama: histogram gözlemi + o anki isteğin Server-Timing toplamı."""
+
+    __slots__ = ("name", "child")
+
+    def __init__(self, name: str, child: _HistogramChild):
+        self.name = name
+        self.child = child
+
+    def observe(self, seconds: float) -> None:
+        self.child.observe(seconds)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings[self.name] = timings.get(self.name, 0.0) + seconds
+
+    def time(self) -> _Timer:
+        return _Timer(self)
+
+
+@contextmanager
+def request_timings() -> Iterator[Dict[str, float]]:
+    """Blok içindeki Stage gözlemlerini (başlatılan görevler dahil) bir dict'te toplar."""
+    timings: Dict[str, float] = {}
+    token = _request_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        try:
+            _request_timings.reset(token)
+        except ValueError:
+            # Async generator başka bir context'te kapatıldı
+            pass
+
+
+def server_timing_header(timings: Dict[str, float], total: Optional[float] = None) -> str:
+    """Server-Timing değeri: "llm;dur=812.4, mcp;dur=301.0, total;dur=1130.2" (milisaniye)."""
+    parts = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in timings.items()]
+    if total is not None:
+        parts.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(parts)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for key, child in self._children.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), child.counts):
+                cumulative += count
+                le = 'le="' + _format_value(float(bound)) + '"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(child.sum)}")
+            lines.append(f"{self.name}_count{labels} {child.count}")
+        return lines
+
+
+class CallbackMetric(_Metric):
+    """
+    Değerleri render anında fn()'den okunan counter / gauge.
+    fn ya tek bir sayı ya da {etiket değerleri tuple'ı: sayı} döner.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        fn: Callable[[], Any],
+        labelnames: Iterable[str] = (),
+        kind: str = "gauge",
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.fn = fn
+        self.kind = kind
+
+    def render(self) -> List[str]:
+        values = self.fn()
+        if not isinstance(values, dict):
+            values = {(): values}
+        lines = self.header()
+        for key, value in values.items():
+            if value is None:
+                continue
+            key = key if isinstance(key, tuple) else (key,)
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(float(value))}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> Any:
+        if metric.name in self._metrics:
+            raise ValueError(f"{metric.name} zaten kayıtlı")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def callback(
+        self,
+        name: str,
+        documentation: str,
+        fn: Callable[[], Any],
+        labelnames: Iterable[str] = (),
+        kind: str = "gauge",
+    ) -> CallbackMetric:
+        return self.register(CallbackMetric(name, documentation, fn, labelnames, kind))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class Stopwatch:
+    """timed_aiter ile biriken bekleme süresi."""
+
+    __slots__ = ("total",)
+
+    def __init__(self):
+        self.total = 0.0
+
+
+async def timed_aiter(source: AsyncIterator[Any], watch: Stopwatch) -> AsyncIterator[Any]:
+    """source'un her elemanı için beklenen süreyi watch.total'a ekleyerek aynı elemanları üretir."""
+    iterator = source.__aiter__()
+    clock = time.perf_counter
+    while True:
+        t0 = clock()
+        try:
+            item = await iterator.__anext__()
+        except StopAsyncIteration:
+            watch.total += clock() - t0
+            return
+        watch.total += clock() - t0
+        yield item
+
+
+class MetricsMiddleware:
+    """
+    Saf ASGI middleware: uçuştaki istek sayısı ve yol/durum bazında istek süresi.
+    Akış cevaplarında süre gövdenin son parçası gönderilene kadar ölçülür.
+    Bilinmeyen yollar etiket patlamasını önlemek için "other" olarak sayılır.
+    """
+
+    def __init__(self, app: Any, in_flight: Gauge, duration: Histogram, paths: Optional[Callable[[], Iterable[str]]] = None):
+        self.app = app
+        self.in_flight = in_flight.labels()
+        self.duration = duration
+        self._paths = paths
+        self._known: Optional[frozenset] = None
+
+    def _path_label(self, path: str) -> str:
+        if self._known is None:
+            self._known = frozenset(self._paths()) if self._paths is not None else frozenset()
+        return path if path in self._known else "other"
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = [500]
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        self.in_flight.inc()
+        t0 = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.in_flight.dec()
+            self.duration.labels(scope["method"], self._path_label(scope["path"]), status[0]).observe(
+                time.perf_counter() - t0
+            )
@@ -0,0 +1,142 @@
+"""
+Yönetici için tek bir isteğin cProfile ile profillenmesi.
+
+ADMIN_TOKEN tanımlıyken "X-Profile: 1" ve "Authorization: Bearer <ADMIN_TOKEN>"
+başlıklarıyla gelen istek profillenir; cevapta X-Profile-Id döner. Profil
+/api/admin/profiles/{id} adresinden .prof (pstats, snakeviz vb. ile açılır) ya da
+metin özeti olarak indirilir. uvicorn'u yeniden başlatmak gerekmez.
+
+cProfile event loop thread'inde çalışan her şeyi ölçer: profil sırasında aynı
+worker'da işlenen diğer isteklerin işi de profile girebilir. Aynı anda yalnızca bir
+profil alınır; meşgulse istek profilsiz işlenir.
+"""
+
+import cProfile
+import hmac
+import io
+import marshal
+import pstats
+import secrets
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from starlette.requests import Request
+
+
+def is_admin(request: Request, token: Optional[str]) -> bool:
+    if not token:
+        return False
+    supplied = request.headers.get("authorization", "")
+    if supplied.lower().startswith("bearer "):
+        supplied = supplied[7:].strip()
+    else:
+        supplied = request.headers.get("x-admin-token", "")
+    return hmac.compare_digest(supplied.encode("utf-8"), token.encode("utf-8"))
+
+
+def wants_profile(request: Request, token: Optional[str]) -> bool:
+    return request.headers.get("x-profile", "") in ("1", "true") and is_admin(request, token)
+
+
+class ProfileStore:
+    def __init__(self, max_profiles: int = 20):
+        self.max_profiles = max_profiles
+        self._profiles: "OrderedDict[str, Tuple[Dict[str, Any], Optional[cProfile.Profile]]]" = OrderedDict()
+        self._active: Optional[str] = None
+        self.busy = 0
+
+    def new_id(self, meta: Dict[str, Any]) -> str:
+        pid = secrets.token_hex(8)
+        self._profiles[pid] = (dict(meta, id=pid, status="pending", started_at=time.time()), None)
+        while len(self._profiles) > self.max_profiles:
+            self._profiles.popitem(last=False)
+        return pid
+
+    def begin(self, pid: str) -> Optional[cProfile.Profile]:
+        if self._active is not None:
+            self.busy += 1
+            self._set_status(pid, "busy")
+            return None
+        profiler = cProfile.Profile()
+        self._active = pid
+        return profiler
+
+    def finish(self, pid: str, profiler: cProfile.Profile, seconds: float) -> None:
+        self._active = None
+        profiler.create_stats()
+        entry = self._profiles.get(pid)
+        if entry is None:
+            return
+        meta = dict(entry[0], status="ready", duration_ms=round(seconds * 1000, 1))
+        self._profiles[pid] = (meta, profiler)
+
+    def _set_status(self, pid: str, status: str) -> None:
+        entry = self._profiles.get(pid)
+        if entry is not None:
+            self._profiles[pid] = (dict(entry[0], status=status), entry[1])
+
+    def meta(self, pid: str) -> Optional[Dict[str, Any]]:
+        entry = self._profiles.get(pid)
+        return entry[0] if entry is not None else None
+
+    def dump(self, pid: str) -> Optional[bytes]:
+        """pstats'in okuduğu .prof biçimi (cProfile.Profile.dump_stats ile aynı)."""
+        entry = self._profiles.get(pid)
+        if entry is None or entry[1] is None:
+            return None
+        return marshal.dumps(entry[1].stats)
+
+    def text(self, pid: str, sort: str = "cumulative", limit: int = 60) -> Optional[str]:
+        entry = self._profiles.get(pid)
+        if entry is None or entry[1] is None:
+            return None
+        out = io.StringIO()
+        stats = pstats.Stats(entry[1], stream=out)
+        stats.sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+    def list(self) -> List[Dict[str, Any]]:
+        return [meta for meta, _ in reversed(self._profiles.values())]
+
+
+@contextmanager
+def profiled(store: ProfileStore, pid: Optional[str]) -> Iterator[None]:
+    profiler = store.begin(pid) if pid is not None else None
+    if profiler is None:
+        yield
+        return
+    t0 = time.perf_counter()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        store.finish(pid, profiler, time.perf_counter() - t0)
+
+
+async def profiled_chunks(chunks: AsyncIterator[Any], store: ProfileStore, pid: str) -> AsyncIterator[Any]:
+    """
+    Akış cevabı için: profil yalnızca bir sonraki parçanın üretilmesi sırasında açıktır,
+    parçanın istemciye yazılması profile girmez.
+    """
+    profiler = store.begin(pid)
+    if profiler is None:
+        async for chunk in chunks:
+            yield chunk
+        return
+    iterator = chunks.__aiter__()
+    t0 = time.perf_counter()
+    try:
+        while True:
+            profiler.enable()
+            try:
+                chunk = await iterator.__anext__()
+            except StopAsyncIteration:
+                break
+            finally:
+                profiler.disable()
+            yield chunk
+    finally:
+        store.finish(pid, profiler, time.perf_counter() - t0)
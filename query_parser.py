@@ -0,0 +1,249 @@
+"""
+Kural tabanlı Türkçe sorgu çözümleyici.
+
+build_mcp_arguments_with_gpt prompt'undaki sabit kuralların (göreli tarih ifadeleri,
+ihale türü kodları, il plaka kodları) yerel karşılığıdır. Sorgudaki her kelime
+tanınırsa normalize_mcp_arguments ile uyumlu bir dict döner; tanınmayan bir kelime
+kalırsa None döner ve çağıran taraf LLM'e düşer.
+"""
+
+import re
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from turkish import ascii_fold
+
+PROVINCES: Dict[int, str] = {
+    1: "Adana", 2: "Adıyaman", 3: "Afyonkarahisar", 4: "Ağrı", 5: "Amasya",
+    6: "Ankara", 7: "Antalya", 8: "Artvin", 9: "Aydın", 10: "Balıkesir",
+    11: "Bilecik", 12: "Bingöl", 13: "Bitlis", 14: "Bolu", 15: "Burdur",
+    16: "Bursa", 17: "Çanakkale", 18: "Çankırı", 19: "Çorum", 20: "Denizli",
+    21: "Diyarbakır", 22: "Edirne", 23: "Elazığ", 24: "Erzincan", 25: "Erzurum",
+    26: "Eskişehir", 27: "Gaziantep", 28: "Giresun", 29: "Gümüşhane", 30: "Hakkari",
+    31: "Hatay", 32: "Isparta", 33: "Mersin", 34: "İstanbul", 35: "İzmir",
+    36: "Kars", 37: "Kastamonu", 38: "Kayseri", 39: "Kırklareli", 40: "Kırşehir",
+    41: "Kocaeli", 42: "Konya", 43: "Kütahya", 44: "Malatya", 45: "Manisa",
+    46: "Kahramanmaraş", 47: "Mardin", 48: "Muğla", 49: "Muş", 50: "Nevşehir",
+    51: "Niğde", 52: "Ordu", 53: "Rize", 54: "Sakarya", 55: "Samsun",
+    56: "Siirt", 57: "Sinop", 58: "Sivas", 59: "Tekirdağ", 60: "Tokat",
+    61: "Trabzon", 62: "Tunceli", 63: "Şanlıurfa", 64: "Uşak", 65: "Van",
+    66: "Yozgat", 67: "Zonguldak", 68: "Aksaray", 69: "Bayburt", 70: "Karaman",
+    71: "Kırıkkale", 72: "Batman", 73: "Şırnak", 74: "Bartın", 75: "Ardahan",
+    76: "Iğdır", 77: "Yalova", 78: "Karabük", 79: "Kilis", 80: "Osmaniye",
+    81: "Düzce",
+}
+
+# Günlük kullanımda sık geçen kısa/eski adlar
+PROVINCE_ALIASES: Dict[str, int] = {
+    "Afyon": 3, "Antep": 27, "İçel": 33, "Maraş": 46, "Urfa": 63, "İzmit": 41, "Adapazarı": 54,
+}
+
+TENDER_TYPES: Dict[int, str] = {1: "Mal", 2: "Yapım", 3: "Hizmet", 4: "Danışmanlık"}
+
+_TYPE_KEYWORDS: Dict[str, int] = {
+    "mal": 1, "mallar": 1,
+    "yapim": 2, "insaat": 2,
+    "hizmet": 3, "hizmetler": 3,
+    "danismanlik": 4,
+}
+
+# Apostrofsuz yazılan il eklerini ("Ankarada", "İstanbuldaki") tanımak için.
+# Tek harfli ekler ("Vana", "Musa") yanlış eşleşmeye açık olduğundan yalnızca apostrofla kabul edilir.
+_PROVINCE_SUFFIXES = (
+    "ndaki", "ndeki", "daki", "deki", "taki", "teki",
+    "ndan", "nden", "nda", "nde",
+    "dan", "den", "tan", "ten", "da", "de", "ta", "te",
+    "lilar", "liler", "li",
+)
+
+_STOPWORDS = {
+    "ihale", "ihaleler", "ihaleleri", "ihalesi", "ihalelerin", "ihalelerini", "ihaleye",
+    "ilan", "ilanlar", "ilanlari", "ilani", "ilanlarini",
+    "ve", "ile", "veya", "ya", "da", "de",
+    "il", "ili", "ilinde", "ilindeki", "illeri", "illerinde",
+    "sehir", "sehri", "sehrinde", "sehirler", "sehirlerde", "sehirlerdeki",
+    "tum", "butun", "hepsi", "turkiye", "turkiyede", "turkiyedeki", "genelinde", "geneli",
+    "alim", "alimi", "alimlari", "alimlar", "is", "isi", "isleri", "islerine",
+    "olan", "goster", "listele", "bul", "getir", "ara", "lutfen", "neler", "hangi",
+    "icin", "tarihli", "turu", "turundeki", "turunde",
+    "yayinlanan", "yayimlanan", "yayinlanmis", "edilen", "cikan",
+}
+
+_NUMBER_WORDS = {
+    "bir": 1, "iki": 2, "uc": 3, "dort": 4, "bes": 5,
+    "alti": 6, "yedi": 7, "sekiz": 8, "dokuz": 9, "on": 10,
+}
+
+_NUM = r"(\d{1,3}|bir|iki|uc|dort|bes|alti|yedi|sekiz|dokuz|on)"
+_UNIT = r"(gun|hafta|ay)[a-z]*"
+_UNIT_DAYS = {"gun": 1, "hafta": 7, "ay": 30}
+_MAX_DAYS = 366
+
+_APOSTROPHE_RE = re.compile(r"([a-z0-9]+)['’`´][a-z]*")
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+_PAST_RE = re.compile(rf"\bson\s+{_NUM}\s+{_UNIT}\b")
+_FUTURE_RE = re.compile(rf"\b(?:onumuzdeki|gelecek|sonraki)\s+{_NUM}\s+{_UNIT}\b")
+_WITHIN_RE = re.compile(rf"\b{_NUM}\s+(gun|hafta|ay)(?:\s+(?:icinde|icindeki|boyunca)|luk|lik)\b")
+_THIS_PERIOD_RE = re.compile(r"\b(?:bu|gelecek|onumuzdeki|sonraki)\s+(hafta|ay)[a-z]*\b")
+_ANNOUNCED_TODAY_RE = re.compile(
+    r"\bbugun(?:ku|un)?\s+(?:yayinlanan|yayimlanan|ilan\s+edilen|ilanlar[a-z]*|cikan)\b"
+)
+_TENDER_TODAY_RE = re.compile(r"\bbugun(?:ku|un)?\s+(?:ihaleler[a-z]*|yapilacak|yapilan)\b")
+_UPCOMING_RE = re.compile(r"\b(?:gelecek|yaklasan|ileri\s+tarihli)\s+ihaleler[a-z]*\b")
+_CLOSED_RE = re.compile(r"\b(?:gecmis|kapanmis|bitmis)\s+ihaleler[a-z]*\b")
+
+
+def _build_province_lookup() -> Dict[str, int]:
+    lookup = {ascii_fold(name): code for code, name in PROVINCES.items()}
+    for name, code in PROVINCE_ALIASES.items():
+        lookup[ascii_fold(name)] = code
+    return lookup
+
+
+_PROVINCE_LOOKUP = _build_province_lookup()
+
+
+def province_code(name: str) -> Optional[int]:
+    """İl adını (ekli ya da ekisiz, Türkçe ya da ASCII) plaka koduna çevirir."""
+    token = ascii_fold(name).strip()
+    token = _APOSTROPHE_RE.sub(r"\1", token)
+    if token in _PROVINCE_LOOKUP:
+        return _PROVINCE_LOOKUP[token]
+    for suffix in _PROVINCE_SUFFIXES:
+        if token.endswith(suffix):
+            code = _PROVINCE_LOOKUP.get(token[: -len(suffix)])
+            if code:
+                return code
+    return None
+
+
+def tender_type_code(name: str) -> Optional[int]:
+    """İhale türü adını ("Yapım", "Hizmet Alımı", "mal") MCP tür koduna çevirir."""
+    for token in ascii_fold(name).split():
+        code = _TYPE_KEYWORDS.get(token)
+        if code:
+            return code
+    return None
+
+
+def _parse_number(text: str) -> int:
+    return int(text) if text.isdigit() else _NUMBER_WORDS[text]
+
+
+def _days(num: str, unit: str) -> Optional[int]:
+    days = _parse_number(num) * _UNIT_DAYS[unit]
+    if days <= 0 or days > _MAX_DAYS:
+        return None
+    return days
+
+
+def _extract_dates(text: str, today: date) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """
+    Tarih ifadelerini çözer ve metinden siler.
+    Çelişkili (aynı tarih alanı için birden fazla) ifade varsa None döner.
+    """
+    today_str = today.isoformat()
+    args: Dict[str, Any] = {}
+    tender_set = False
+    announcement_set = False
+
+    def set_tender(values: Dict[str, Any]) -> bool:
+        nonlocal tender_set
+        if tender_set:
+            return False
+        tender_set = True
+        args.update(values)
+        return True
+
+    def set_announcement(values: Dict[str, Any]) -> bool:
+        nonlocal announcement_set
+        if announcement_set:
+            return False
+        announcement_set = True
+        args.update(values)
+        return True
+
+    def future(days: int) -> Dict[str, Any]:
+        return {
+            "tender_date_filter": "date_range",
+            "tender_date_start": today_str,
+            "tender_date_end": (today + timedelta(days=days)).isoformat(),
+        }
+
+    def past(m) -> bool:
+        days = _days(m.group(1), m.group(2))
+        return days is not None and set_announcement({
+            "announcement_date_filter": "date_range",
+            "announcement_date_start": (today - timedelta(days=days)).isoformat(),
+            "announcement_date_end": today_str,
+        })
+
+    def upcoming(m) -> bool:
+        days = _days(m.group(1), m.group(2))
+        return days is not None and set_tender(future(days))
+
+    rules = [
+        (_ANNOUNCED_TODAY_RE, lambda m: set_announcement({"announcement_date_filter": "today"})),
+        (_TENDER_TODAY_RE, lambda m: set_tender({
+            "tender_date_filter": "date_range",
+            "tender_date_start": today_str,
+            "tender_date_end": today_str,
+        })),
+        (_PAST_RE, past),
+        (_FUTURE_RE, upcoming),
+        (_WITHIN_RE, upcoming),
+        (_THIS_PERIOD_RE, lambda m: set_tender(future(7 if m.group(1) == "hafta" else 30))),
+        (_UPCOMING_RE, lambda m: set_tender({"tender_date_filter": "from_today"})),
+        (_CLOSED_RE, lambda m: set_tender({"tender_date_filter": "date_range", "tender_date_end": today_str})),
+    ]
+
+    for pattern, apply in rules:
+        while True:
+            m = pattern.search(text)
+            if not m:
+                break
+            if not apply(m):
+                return None
+            text = text[: m.start()] + " " + text[m.end():]
+
+    return text, args
+
+
+def parse_query(user_query: str, today: Optional[date] = None) -> Optional[Dict[str, Any]]:
+    """
+    Sorguyu MCP argümanlarına çevirir. Emin olunamazsa None döner.
+
+    >>> parse_query("İzmir'deki yapım ihaleleri önümüzdeki 1 hafta", date(2025, 1, 1))["provinces"]
+    [35]
+    """
+    today = today or date.today()
+    text = _APOSTROPHE_RE.sub(r"\1", ascii_fold(user_query))
+    if not _TOKEN_RE.search(text):
+        return None
+
+    extracted = _extract_dates(text, today)
+    if extracted is None:
+        return None
+    text, arguments = extracted
+
+    provinces: List[int] = []
+    tender_types: List[int] = []
+    for token in _TOKEN_RE.findall(text):
+        if token in _STOPWORDS:
+            continue
+        type_code = _TYPE_KEYWORDS.get(token)
+        if type_code:
+            if type_code not in tender_types:
+                tender_types.append(type_code)
+            continue
+        code = province_code(token)
+        if code:
+            if code not in provinces:
+                provinces.append(code)
+            continue
+        # Tanınmayan kelime: serbest metin araması olabilir, LLM'e bırak
+        return None
+
+    arguments.update({"search_text": "", "tender_types": tender_types, "provinces": provinces})
+    return arguments
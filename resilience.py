@@ -0,0 +1,436 @@
+"""
+Upstream (MCP / OpenAI) çağrıları için dayanıklılık yardımcıları.
+
+- Deadline: isteğin uçtan uca zaman bütçesi bir contextvar içinde taşınır;
+  her upstream çağrısının zaman aşımı kalan bütçeyle sınırlanır, akışlarda
+  (deadline_aiter) her parça için ayrıca kontrol edilir.
+- RetryPolicy: geçici hatalarda bütçe içinde jitter'lı üstel bekleme ile tekrar.
+- Hedger: idempotent çağrı p95 süresini aşarsa aynı çağrının ikinci bir kopyasını
+  başlatır, ilk biten kazanır, diğeri iptal edilir. Akışlarda (Hedger.stream) yarış
+  ilk elemana kadardır; ilk elemanı üreten akış devam eder, diğeri kapatılır.
+- CircuitBreaker: art arda hatalardan sonra upstream'e gitmeden hemen CircuitOpen
+  yükseltir; çağıran cache'teki eski sonucu sunabilir. reset_timeout sonunda tek bir
+  deneme çağrısına izin verilir (half-open).
+"""
+
+import asyncio
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional
+
+import httpx
+
+
+class DeadlineExceeded(Exception):
+    """İsteğin zaman bütçesi doldu."""
+
+
+class CircuitOpen(Exception):
+    """Upstream sağlıksız; çağrı yapılmadan reddedildi."""
+
+
+class UpstreamHTTPError(RuntimeError):
+    def __init__(self, status_code: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+# Mutlak bitiş zamanı (time.monotonic); None ise bütçe yok
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[None]:
+    """Bu blok içindeki çağrılar için bütçe belirler; dıştaki bütçe daha sıkıysa o kalır."""
+    current = _deadline.get()
+    new = time.monotonic() + seconds if seconds and seconds > 0 else None
+    if current is not None and (new is None or current < new):
+        new = current
+    token = _deadline.set(new)
+    try:
+        yield
+    finally:
+        try:
+            _deadline.reset(token)
+        except ValueError:
+            # Async generator başka bir context'te kapatıldı (ör. GC sırasında aclose)
+            pass
+
+
+def remaining() -> Optional[float]:
+    """Kalan bütçe (saniye) ya da bütçe yoksa None."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def call_timeout(cap: float) -> float:
+    """Tek bir upstream çağrısının zaman aşımı: cap ile kalan bütçenin küçüğü."""
+    left = remaining()
+    if left is None:
+        return cap
+    if left <= 0:
+        raise DeadlineExceeded("istek zaman bütçesi doldu")
+    return min(cap, left)
+
+
+async def deadline_aiter(source: AsyncIterator[Any]) -> AsyncIterator[Any]:
+    """
+    source'un elemanlarını bütçe içinde üretir. httpx'in zaman aşımı okuma başınadır;
+    parçaları yavaş yavaş gönderen bir upstream bütçeyi aşarsa DeadlineExceeded yükselir.
+    """
+    iterator = source.__aiter__()
+    while True:
+        left = remaining()
+        try:
+            if left is None:
+                item = await iterator.__anext__()
+            elif left <= 0:
+                raise DeadlineExceeded("istek zaman bütçesi doldu")
+            else:
+                item = await asyncio.wait_for(iterator.__anext__(), left)
+        except StopAsyncIteration:
+            return
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded("istek zaman bütçesi doldu")
+        yield item
+
+
+def is_transient_http_error(exc: BaseException) -> bool:
+    """Bağlantı / zaman aşımı hataları ve 5xx / 429 cevapları tekrar denenebilir."""
+    if isinstance(exc, UpstreamHTTPError):
+        return exc.status_code >= 500 or exc.status_code == 429
+    return isinstance(exc, (httpx.TransportError, asyncio.TimeoutError, DeadlineExceeded))
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self.state = "closed"
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self.rejected = 0
+        self.opened = 0
+
+    def before_call(self) -> None:
+        if self.state == "closed":
+            return
+        if self.state == "open" and self._clock() - self._opened_at >= self.reset_timeout:
+            self.state = "half_open"
+            self._probing = False
+        if self.state == "half_open" and not self._probing:
+            # Upstream'in düzelip düzelmediğini tek bir çağrı dener
+            self._probing = True
+            return
+        self.rejected += 1
+        raise CircuitOpen(f"{self.name} geçici olarak devre dışı (art arda hata)")
+
+    def on_success(self) -> None:
+        self.state = "closed"
+        self.failures = 0
+        self._probing = False
+
+    def on_failure(self) -> None:
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                self.opened += 1
+            self.state = "open"
+            self._opened_at = self._clock()
+            self._probing = False
+
+    def on_abort(self) -> None:
+        # Deneme çağrısı sonuçlanmadan iptal edildi; sıradaki çağrı tekrar deneyebilir
+        self._probing = False
+
+    def retry_after(self) -> float:
+        if self.state != "open":
+            return 0.0
+        return max(0.0, self.reset_timeout - (self._clock() - self._opened_at))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
+
+
+class RetryPolicy:
+    def __init__(
+        self,
+        attempts: int = 3,
+        base_delay: float = 0.2,
+        max_delay: float = 2.0,
+        retry_if: Callable[[BaseException], bool] = is_transient_http_error,
+    ):
+        self.attempts = max(1, attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_if = retry_if
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+
+    def backoff(self, attempt: int) -> float:
+        # Full jitter: eş zamanlı tekrarlar aynı anda upstream'e yüklenmesin
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def _record(self, breaker: Optional[CircuitBreaker], exc: BaseException) -> None:
+        if breaker is None:
+            return
+        if isinstance(exc, DeadlineExceeded):
+            # Kendi istek bütçemiz doldu; upstream hakkında bilgi vermez, devreyi açmamalı
+            breaker.on_abort()
+            return
+        if self.retry_if(exc):
+            breaker.on_failure()
+        else:
+            # Kalıcı hata (ör. 4xx) upstream'in cevap verdiğini gösterir
+            breaker.on_success()
+
+    async def _wait_before_retry(self, attempt: int, exc: BaseException) -> None:
+        if not self.retry_if(exc) or attempt + 1 >= self.attempts:
+            raise exc
+        delay = self.backoff(attempt)
+        left = remaining()
+        if left is not None and delay >= left:
+            # Bekleme bütçeyi aşacaksa tekrar denemenin anlamı yok
+            raise exc
+        self.retries += 1
+        await asyncio.sleep(delay)
+
+    async def run(self, fn: Callable[[], Awaitable[Any]], breaker: Optional[CircuitBreaker] = None) -> Any:
+        self.calls += 1
+        attempt = 0
+        while True:
+            left = remaining()
+            if left is not None and left <= 0:
+                self.failures += 1
+                raise DeadlineExceeded("istek zaman bütçesi doldu")
+            if breaker is not None:
+                breaker.before_call()
+            try:
+                if left is None:
+                    result = await fn()
+                else:
+                    try:
+                        result = await asyncio.wait_for(fn(), left)
+                    except asyncio.TimeoutError:
+                        raise DeadlineExceeded("istek zaman bütçesi doldu")
+            except Exception as e:
+                self._record(breaker, e)
+                try:
+                    await self._wait_before_retry(attempt, e)
+                except Exception:
+                    self.failures += 1
+                    raise
+                attempt += 1
+                continue
+            except BaseException:
+                if breaker is not None:
+                    breaker.on_abort()
+                raise
+            if breaker is not None:
+                breaker.on_success()
+            return result
+
+    async def stream(
+        self,
+        open_stream: Callable[[], AsyncIterator[Any]],
+        breaker: Optional[CircuitBreaker] = None,
+    ) -> AsyncIterator[Any]:
+        """
+        Akışı açar ve elemanlarını üretir. İlk eleman gelmeden oluşan geçici hatalarda
+        akış baştan açılır; eleman üretildikten sonraki hatalar olduğu gibi yükselir.
+        """
+        self.calls += 1
+        attempt = 0
+        while True:
+            left = remaining()
+            if left is not None and left <= 0:
+                self.failures += 1
+                raise DeadlineExceeded("istek zaman bütçesi doldu")
+            if breaker is not None:
+                breaker.before_call()
+            started = False
+            try:
+                async for item in open_stream():
+                    started = True
+                    yield item
+            except Exception as e:
+                self._record(breaker, e)
+                if started:
+                    self.failures += 1
+                    raise
+                try:
+                    await self._wait_before_retry(attempt, e)
+                except Exception:
+                    self.failures += 1
+                    raise
+                attempt += 1
+                continue
+            except BaseException:
+                if breaker is not None:
+                    breaker.on_abort()
+                raise
+            if breaker is not None:
+                breaker.on_success()
+            return
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "failures": self.failures,
+        }
+
+
+class Hedger:
+    """
+    Son çağrı sürelerinin p95'i kadar beklenip cevap gelmediyse ikinci kopya başlatılır.
+    Yeterli örnek toplanana kadar hedge yapılmaz.
+    """
+
+    def __init__(self, percentile: float = 95.0, window: int = 200, min_samples: int = 20, min_delay: float = 0.05):
+        self.percentile = percentile
+        self.window = window
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self._samples: List[float] = []
+        self._pos = 0
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def observe(self, seconds: float) -> None:
+        if len(self._samples) < self.window:
+            self._samples.append(seconds)
+        else:
+            self._samples[self._pos] = seconds
+            self._pos = (self._pos + 1) % self.window
+
+    def delay(self) -> Optional[float]:
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        idx = min(len(ordered) - 1, int(round(self.percentile / 100.0 * (len(ordered) - 1))))
+        return max(self.min_delay, ordered[idx])
+
+    async def _timed(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        t0 = time.monotonic()
+        result = await fn()
+        self.observe(time.monotonic() - t0)
+        return result
+
+    async def run(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        self.calls += 1
+        delay = self.delay()
+        first = asyncio.ensure_future(self._timed(fn))
+        pending = {first}
+        try:
+            if delay is None:
+                return await first
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if done:
+                return first.result()
+            self.hedged += 1
+            second = asyncio.ensure_future(self._timed(fn))
+            pending.add(second)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is second:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def stream(self, open_stream: Callable[[], AsyncIterator[Any]]) -> AsyncIterator[Any]:
+        """
+        Akışı açar; ilk eleman p95 süresi içinde gelmezse ikinci bir kopya açılır.
+        Örnekler ilk elemana kadar geçen süredir (akışın tamamı değil).
+        """
+        self.calls += 1
+        delay = self.delay()
+        exhausted = object()
+
+        async def first_item(iterator: AsyncIterator[Any]) -> Any:
+            t0 = time.monotonic()
+            try:
+                item = await iterator.__anext__()
+            except StopAsyncIteration:
+                item = exhausted
+            self.observe(time.monotonic() - t0)
+            return item
+
+        first_iter = open_stream().__aiter__()
+        iterators = {asyncio.ensure_future(first_item(first_iter)): first_iter}
+        winner: Optional[AsyncIterator[Any]] = None
+        try:
+            pending = set(iterators)
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if not done:
+                self.hedged += 1
+                second_iter = open_stream().__aiter__()
+                second = asyncio.ensure_future(first_item(second_iter))
+                iterators[second] = second_iter
+                pending.add(second)
+            error: Optional[BaseException] = None
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        winner = iterators[task]
+                        item = task.result()
+                        if winner is not first_iter:
+                            self.hedge_wins += 1
+                        break
+                    error = task.exception()
+            if winner is None:
+                raise error
+            # Kaybeden akış ilk elemanını beklerken iptal edilir, bağlantısı kapanır
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            for iterator in iterators.values():
+                if iterator is not winner:
+                    await iterator.aclose()
+            if item is exhausted:
+                return
+            yield item
+            async for item in winner:
+                yield item
+        finally:
+            # Çalışan __anext__ bitmeden aclose çağrılamaz; önce iptal edilip beklenir
+            for task in iterators:
+                task.cancel()
+            await asyncio.gather(*iterators, return_exceptions=True)
+            for iterator in iterators.values():
+                await iterator.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        delay = self.delay()
+        return {
+            "calls": self.calls,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "hedge_delay_seconds": round(delay, 4) if delay is not None else None,
+        }
@@ -0,0 +1,129 @@
+"""
+Hızlı JSON cevapları: byte'a doğrudan yazan serializer, gzip/brotli sıkıştırma
+ve koşullu istekler için güçlü ETag.
+
+orjson ve brotli isteğe bağlıdır; kurulu değilse stdlib json ve yalnızca gzip kullanılır.
+"""
+
+import gzip
+import hashlib
+import json
+from typing import Any, Dict, Optional
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - isteğe bağlı bağımlılık
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - isteğe bağlı bağımlılık
+    brotli = None
+
+# Bu boyutun altındaki gövdeler sıkıştırılmaz (başlık maliyeti kazancı aşar)
+COMPRESS_MIN_BYTES = 1024
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 5
+
+_ENCODING_SUFFIXES = {"br": "-br", "gzip": "-gz"}
+
+
+def dumps_json(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _accepted_encodings(accept_encoding: str) -> Dict[str, float]:
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[token] = q
+    return accepted
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    accepted = _accepted_encodings(accept_encoding)
+    candidates = (["br"] if brotli is not None else []) + ["gzip"]
+    best, best_q = None, 0.0
+    for name in candidates:
+        q = accepted.get(name, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+def make_etag(seed: str, body: bytes) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(seed.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(body)
+    return '"' + digest.hexdigest() + '"'
+
+
+def _etag_base(tag: str) -> str:
+    tag = tag.strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    tag = tag.strip('"')
+    for suffix in _ENCODING_SUFFIXES.values():
+        if tag.endswith(suffix):
+            return tag[: -len(suffix)]
+    return tag
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    base = _etag_base(etag)
+    return any(_etag_base(tag) == base for tag in if_none_match.split(","))
+
+
+def json_response(
+    request: Request,
+    payload: Any,
+    status_code: int = 200,
+    etag_seed: Optional[str] = None,
+) -> Response:
+    body = dumps_json(payload)
+    headers = {"Vary": "Accept-Encoding"}
+
+    encoding = None
+    if len(body) >= COMPRESS_MIN_BYTES:
+        encoding = choose_encoding(request.headers.get("accept-encoding", ""))
+
+    if etag_seed is not None and status_code == 200:
+        etag = make_etag(etag_seed, body)
+        # Güçlü ETag her temsil için farklı olmalı; sıkıştırma son eki eklenir
+        if encoding:
+            etag = etag[:-1] + _ENCODING_SUFFIXES[encoding] + '"'
+        headers["ETag"] = etag
+        headers["Cache-Control"] = "no-cache"
+        # Koşullu istek: aynı arama aynı sonucu verdiyse gövdesiz 304.
+        # RFC 9110'a göre 304 yalnızca GET/HEAD için; POST istemcileri ETag'i görür ama 304 almaz.
+        if request.method in ("GET", "HEAD") and etag_matches(request.headers.get("if-none-match", ""), etag):
+            return Response(status_code=304, headers=headers)
+
+    if encoding == "br":
+        body = brotli.compress(body, quality=BROTLI_QUALITY)
+    elif encoding == "gzip":
+        body = gzip.compress(body, compresslevel=GZIP_LEVEL)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+
+    return Response(content=body, status_code=status_code, media_type="application/json", headers=headers)
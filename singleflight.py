@@ -0,0 +1,82 @@
+"""
+Eşzamanlı aynı çağrıların tek bir upstream çağrısında birleştirilmesi (single-flight).
+
+Sabah panoyu açan ekip aynı sorguyu saniyeler içinde defalarca gönderdiğinde her
+istek kendi LLM ve MCP çağrısını yapar; cache ancak ilk çağrı bittikten sonra dolar.
+SingleFlight aynı anahtar için uçuşta olan bir çağrı varsa yenisini başlatmaz,
+bekleyenler aynı sonucu paylaşır.
+
+İki kullanım şekli vardır:
+- do(key, fn): çağrı yoksa fn başlatılır, varsa ona katılınır.
+- claim(key): akış halinde okunan bir sonucu üreten çağıran, sonucu kendisi
+  tamamlayacağı bir Future alır (set_result / set_exception). Akış yarıda
+  bırakılırsa FlightAbandoned ile kapatılır ve bekleyenler çağrıyı kendileri yapar.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+
+class FlightAbandoned(Exception):
+    """Lider çağrı sonuç üretmeden bırakıldı (ör. istemci akışı kopardı)."""
+
+
+class SingleFlight:
+    def __init__(self):
+        self._flights: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self.calls = 0
+        self.collapsed = 0
+        self.abandoned = 0
+
+    def _register(self, key: Hashable, future: "asyncio.Future[Any]") -> None:
+        self._flights[key] = future
+        self.calls += 1
+
+        def done(f: "asyncio.Future[Any]") -> None:
+            if self._flights.get(key) is f:
+                del self._flights[key]
+            # Bekleyen kalmadıysa "exception was never retrieved" uyarısını önle
+            if not f.cancelled():
+                f.exception()
+
+        future.add_done_callback(done)
+
+    def join(self, key: Hashable) -> Optional[Awaitable[Any]]:
+        """Uçuşta bir çağrı varsa onun sonucunu bekleyen bir awaitable döner."""
+        future = self._flights.get(key)
+        if future is None or future.done():
+            return None
+        self.collapsed += 1
+        # Bekleyenin iptali (istemci koptu) ortak çağrıyı iptal etmez
+        return asyncio.shield(future)
+
+    def claim(self, key: Hashable) -> "asyncio.Future[Any]":
+        future = asyncio.get_running_loop().create_future()
+        self._register(key, future)
+        return future
+
+    def abandon(self, future: "asyncio.Future[Any]") -> None:
+        if not future.done():
+            self.abandoned += 1
+            future.set_exception(FlightAbandoned())
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        joined = self.join(key)
+        while joined is not None:
+            try:
+                return await joined
+            except FlightAbandoned:
+                joined = self.join(key)
+        task = asyncio.ensure_future(fn())
+        self._register(key, task)
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.calls + self.collapsed
+        return {
+            "upstream_calls": self.calls,
+            "collapsed": self.collapsed,
+            "abandoned": self.abandoned,
+            "in_flight": len(self._flights),
+            "collapse_ratio": round(self.collapsed / total, 4) if total else 0.0,
+        }
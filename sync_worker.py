@@ -0,0 +1,209 @@
+"""
+Yerel ihale deposu için artımlı arka plan senkronizasyonu.
+
+Her turda geniş bir arama ya da tam EKAP taraması yerine yalnızca değişen kısım çekilir:
+
+1. Delta: announcement_date_filter="today" ile bugün ilan edilen ihaleler skip ile
+   sayfalanır. Bir önceki turda nereye kadar okunduğu (high-water mark) sync_state'te
+   tutulur; yeni tur bir sayfa geriden başlar ve kısa sayfa ya da hiç yeni İKN
+   içermeyen sayfa gelince durur. Gün değişince işaret sıfırlanır.
+2. Pencere: daha seyrek olarak bugünden itibaren window_days günlük ihale tarihi
+   aralığı baştan sona çekilir; durum değişiklikleri güncellenir ve aralık
+   tamamlandıysa deponun coverage tablosuna yazılır.
+
+Böylece tipik bir tur birkaç küçük istekten ibarettir. MCP çağrısı (fetch_page) ve
+argümanların /api/run ile aynı biçime getirilmesi (normalize_args; app.py'de
+normalize_mcp_arguments) dışarıdan verilir, bu sayede worker app.py'den bağımsız
+test edilebilir.
+
+Tek başına çalıştırma: TENDER_DB_PATH=ihaleler.db python sync_worker.py
+"""
+
+import asyncio
+import json
+import time
+from datetime import date, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from tender_store import TenderStore
+
+FetchPage = Callable[[Dict[str, Any]], Awaitable[List[Dict[str, Any]]]]
+NormalizeArgs = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+_HWM_KEY = "announcement_hwm"
+
+
+class SyncWorker:
+    def __init__(
+        self,
+        store: TenderStore,
+        fetch_page: FetchPage,
+        normalize_args: NormalizeArgs,
+        interval: float = 300,
+        window_interval: float = 3600,
+        window_days: int = 7,
+        page_size: int = 100,
+        max_pages: int = 20,
+        today: Callable[[], date] = date.today,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.store = store
+        self.fetch_page = fetch_page
+        self.normalize_args = normalize_args
+        self.interval = interval
+        self.window_interval = window_interval
+        self.window_days = window_days
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self._today = today
+        self._clock = clock
+        self._task: Optional[asyncio.Task] = None
+        self._last_window_sync = 0.0
+
+        self.cycles = 0
+        self.requests = 0
+        self.rows_fetched = 0
+        self.rows_new = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+        self.last_success: Optional[float] = None
+        self.last_cycle_seconds = 0.0
+        self.busy_seconds = 0.0
+
+    async def _fetch(self, args: Dict[str, Any]) -> List[Dict[str, Any]]:
+        self.requests += 1
+        tenders = await self.fetch_page(args)
+        self.rows_fetched += len(tenders)
+        return tenders
+
+    async def _ingest(self, tenders: List[Dict[str, Any]]) -> int:
+        # Yeni satır sayısı yazmadan önce ölçülür; upsert mevcut satırları da günceller
+        known = await asyncio.to_thread(self.store.known_ikns, [t.get("ikn") for t in tenders])
+        new = sum(1 for t in tenders if t.get("ikn") and t["ikn"] not in known)
+        await asyncio.to_thread(self.store.upsert_tenders, tenders, "sync")
+        self.rows_new += new
+        return new
+
+    def _load_hwm(self, today: str) -> int:
+        raw = self.store.get_state(_HWM_KEY)
+        if not raw:
+            return 0
+        state = json.loads(raw)
+        return state["skip"] if state.get("day") == today else 0
+
+    async def sync_announcements(self) -> int:
+        """Bugün ilan edilenleri high-water mark'tan itibaren çeker, yeni satır sayısını döner."""
+        today = self._today().isoformat()
+        hwm = await asyncio.to_thread(self._load_hwm, today)
+        # Sıralama kayabileceğinden bir sayfa geriden, örtüşerek başlanır
+        skip = max(0, hwm - self.page_size)
+        new_total = 0
+        for page_no in range(self.max_pages):
+            args = self.normalize_args({"announcement_date_filter": "today", "limit": self.page_size, "skip": skip})
+            page = await self._fetch(args)
+            new = await self._ingest(page)
+            new_total += new
+            skip += len(page)
+            if len(page) < args["limit"] or (page_no > 0 and not new):
+                break
+
+        state = json.dumps({"day": today, "skip": max(hwm, skip)})
+        await asyncio.to_thread(self.store.set_state, _HWM_KEY, state)
+        return new_total
+
+    async def sync_window(self) -> bool:
+        """Önümüzdeki window_days günü baştan sona çeker; tamamlandıysa coverage kaydeder."""
+        start = self._today()
+        end = start + timedelta(days=self.window_days)
+        base = {
+            "tender_date_filter": "date_range",
+            "tender_date_start": start.isoformat(),
+            "tender_date_end": end.isoformat(),
+            "limit": self.page_size,
+        }
+        skip = 0
+        for _ in range(self.max_pages):
+            args = self.normalize_args(dict(base, skip=skip))
+            page = await self._fetch(args)
+            await self._ingest(page)
+            skip += len(page)
+            if len(page) < args["limit"]:
+                await asyncio.to_thread(self.store.record_coverage, args["tender_date_start"], args["tender_date_end"])
+                return True
+        return False
+
+    async def run_cycle(self) -> None:
+        started = self._clock()
+        try:
+            await self.sync_announcements()
+            if started - self._last_window_sync >= self.window_interval:
+                await self.sync_window()
+                self._last_window_sync = started
+            self.last_success = self._clock()
+        except Exception as e:
+            self.errors += 1
+            self.last_error = f"{type(e).__name__}: {e}"
+        finally:
+            self.cycles += 1
+            self.last_cycle_seconds = self._clock() - started
+            self.busy_seconds += self.last_cycle_seconds
+
+    async def run_forever(self) -> None:
+        while True:
+            await self.run_cycle()
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> asyncio.Task:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run_forever())
+        return self._task
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        raw = self.store.get_state(_HWM_KEY)
+        return {
+            "cycles": self.cycles,
+            "requests": self.requests,
+            "rows_fetched": self.rows_fetched,
+            "rows_new": self.rows_new,
+            "errors": self.errors,
+            "last_error": self.last_error,
+            "high_water_mark": json.loads(raw) if raw else None,
+            # Son başarılı turdan bu yana geçen süre: depo en fazla bu kadar geride
+            "lag_seconds": round(self._clock() - self.last_success, 1) if self.last_success else None,
+            "last_cycle_seconds": round(self.last_cycle_seconds, 3),
+            "rows_per_second": round(self.rows_fetched / self.busy_seconds, 1) if self.busy_seconds else 0.0,
+        }
+
+
+async def _main() -> None:
+    # app.py'deki MCP client'ı ve normalize fonksiyonları yeniden kullanılır
+    import app
+
+    if app.tender_store is None:
+        raise SystemExit("TENDER_DB_PATH env değişkeni gerekli.")
+    worker = SyncWorker(
+        app.tender_store,
+        app.fetch_mcp_page,
+        app.normalize_sync_arguments,
+        interval=app.SYNC_INTERVAL or 300,
+        window_days=app.SYNC_WINDOW_DAYS,
+        page_size=app.MCP_PAGE_SIZE,
+    )
+    while True:
+        await worker.run_cycle()
+        print(json.dumps(worker.stats(), ensure_ascii=False))
+        await asyncio.sleep(worker.interval)
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
@@ -0,0 +1,134 @@
+"""
+Cache'lenen sonuç setleri için sıkıştırılmış ihale temsili.
+
+normalize_tender_item her ihale için bir dict üretir; aynı il, tür, durum, idare
+ve tarih metinleri binlerce kez tekrar eder. TenderBatch sütun tabanlıdır
+(struct-of-arrays): az sayıda farklı değeri olan sütunlar sözlük kodlamasıyla
+array içinde tamsayı kodu olarak tutulur, değerin kendisi parti başına bir kez
+saklanır. search_key tutulmaz; dict'e çevrilirken katlanmış sözlük
+değerlerinden yeniden birleştirilir.
+
+Dict'lere dönüşüm tembeldir ve yalnızca kenarda (JSON cevabı, akış parçası)
+yapılır: to_dicts(start, stop).
+"""
+
+import sys
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from turkish import ascii_fold
+
+
+class _DictColumn:
+    """Sözlük kodlamalı sütun: değerler bir kez, satırlar array('I') içinde kod olarak."""
+
+    __slots__ = ("values", "folded", "codes", "_lookup")
+
+    def __init__(self):
+        self.values: List[Any] = []
+        self.folded: List[str] = []
+        self.codes = array("I")
+        self._lookup: Dict[Any, int] = {}
+
+    def append(self, value: Any) -> None:
+        code = self._lookup.get(value)
+        if code is None:
+            code = self._lookup[value] = len(self.values)
+            self.values.append(value)
+            self.folded.append(ascii_fold(value or ""))
+        self.codes.append(code)
+
+    def nbytes(self) -> int:
+        return (
+            sys.getsizeof(self.codes)
+            + sys.getsizeof(self._lookup)
+            + sum(sys.getsizeof(v) for v in self.values)
+            + sum(sys.getsizeof(v) for v in self.folded)
+        )
+
+
+_DICT_FIELDS = ("type", "status", "authority", "province", "tender_datetime")
+
+_NO_ID = -(2 ** 63)
+
+
+class TenderBatch:
+    def __init__(self, tenders: Iterable[Dict[str, Any]] = ()):
+        # id'ler genelde tamsayıdır; değilse sütun listeye döner
+        self._ids: Any = array("q")
+        self._ikns: List[Any] = []
+        self._names: List[str] = []
+        self._name_keys: List[str] = []
+        self._urls: List[Optional[str]] = []
+        self._columns = {field: _DictColumn() for field in _DICT_FIELDS}
+        self.extend(tenders)
+
+    def __len__(self) -> int:
+        return len(self._ikns)
+
+    def _append_id(self, value: Any) -> None:
+        if isinstance(self._ids, array):
+            if value is None:
+                self._ids.append(_NO_ID)
+                return
+            if isinstance(value, int) and not isinstance(value, bool) and _NO_ID < value < 2 ** 63:
+                self._ids.append(value)
+                return
+            self._ids = [None if v == _NO_ID else v for v in self._ids]
+        self._ids.append(value)
+
+    def append(self, tender: Dict[str, Any]) -> None:
+        self._append_id(tender.get("id"))
+        self._ikns.append(tender.get("ikn"))
+        name = tender.get("name") or ""
+        self._names.append(name)
+        name_key = tender.get("name_key")
+        self._name_keys.append(name_key if name_key is not None else ascii_fold(name))
+        self._urls.append(tender.get("document_url"))
+        for field, column in self._columns.items():
+            column.append(tender.get(field) or "")
+
+    def extend(self, tenders: Iterable[Dict[str, Any]]) -> None:
+        for tender in tenders:
+            self.append(tender)
+
+    def row(self, i: int) -> Dict[str, Any]:
+        tender_id = self._ids[i]
+        if tender_id == _NO_ID and isinstance(self._ids, array):
+            tender_id = None
+        ikn = self._ikns[i]
+        c = self._columns
+        t, s, a, p, d = (c[f].codes[i] for f in _DICT_FIELDS)
+        name_key = self._name_keys[i]
+        return {
+            "id": tender_id,
+            "ikn": ikn,
+            "name": self._names[i],
+            "type": c["type"].values[t],
+            "status": c["status"].values[s],
+            "authority": c["authority"].values[a],
+            "province": c["province"].values[p],
+            "tender_datetime": c["tender_datetime"].values[d],
+            "document_url": self._urls[i],
+            "name_key": name_key,
+            "search_key": " ".join((
+                ascii_fold(str(ikn or "")), name_key,
+                c["type"].folded[t], c["status"].folded[s], c["authority"].folded[a], c["province"].folded[p],
+            )),
+        }
+
+    def to_dicts(self, start: int = 0, stop: Optional[int] = None) -> List[Dict[str, Any]]:
+        return [self.row(i) for i in range(*slice(start, stop).indices(len(self)))]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self)):
+            yield self.row(i)
+
+    def nbytes(self) -> int:
+        """Yaklaşık bellek kullanımı (ResultCache bütçesi için)."""
+        total = sys.getsizeof(self) + sys.getsizeof(self._ids)
+        if not isinstance(self._ids, array):
+            total += sum(sys.getsizeof(v) for v in self._ids)
+        for values in (self._ikns, self._names, self._name_keys, self._urls):
+            total += sys.getsizeof(values) + sum(sys.getsizeof(v) for v in values if v is not None)
+        return total + sum(column.nbytes() for column in self._columns.values())
@@ -0,0 +1,279 @@
+"""
+Cache'lenmiş bir sonuç seti üzerinde sunucu tarafı filtreleme.
+
+Arayüzdeki applyFilters her tuşta tüm satırları tarar; burada aynı filtreler
+önceden hesaplanmış indekslerle cevaplanır:
+
+- Tür, il, ihale günü ve doküman varlığı için satır bitmap'leri (Python int).
+  Tarih aralığı, sıralı gün listesinde bisect ile bulunan günlerin bitmap'lerinin OR'udur.
+- Metin için ters indeks: her kelime → bitmap (nadir kelimeler için satır listesi).
+  Sorgudaki her kelime, indeksteki kelimelerin önekiyle eşleşir (sıralı sözlükte bisect).
+
+Filtreler bitmap AND'leriyle birleştirildiğinden 50 bin satırda da sorgu süresi
+mikrosaniyeler mertebesindedir. Yeni sayfalar geldikçe indeks baştan kurulmaz,
+yeni satırlar eklenir.
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+from tender_batch import TenderBatch
+from turkish import ascii_fold
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Bu kadar satırda geçen kelimeler için bitmap tutulur; daha nadir olanlar (İKN, sayılar)
+# satır listesi olarak kalır. Her nadir kelime için n bitlik bir int üretmek kurulumu yavaşlatır.
+_BITMAP_MIN_ROWS = 64
+
+# Arayüzdeki serbest metin aramasının baktığı alanlar
+TEXT_FIELDS = ("ikn", "name", "type", "status", "authority", "province")
+
+
+def tender_search_keys(tender: Dict[str, Any]) -> Dict[str, str]:
+    """
+    İhale başına bir kez hesaplanan arama anahtarları (Türkçe küçük harf + ASCII katlama).
+    Filtreler yalnızca düz substring/kelime karşılaştırması yapar: "ihale" "İHALE"yi,
+    "cagri" "çağrı"yı bulur.
+    """
+    return {
+        "name_key": ascii_fold(tender.get("name") or ""),
+        "search_key": ascii_fold(" ".join(str(tender.get(f) or "") for f in TEXT_FIELDS)),
+    }
+
+
+def tender_iso_date(tender_datetime: Optional[str]) -> str:
+    """"DD.MM.YYYY HH:MM" → "YYYY-MM-DD"; çözülemezse boş string."""
+    if not tender_datetime:
+        return ""
+    parts = tender_datetime.split(" ")[0].split(".")
+    if len(parts) != 3:
+        return ""
+    return f"{parts[2]}-{parts[1]}-{parts[0]}"
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(ascii_fold(text))
+
+
+def tender_key(tender: Dict[str, Any]) -> Any:
+    return tender.get("ikn") or tender.get("id")
+
+
+def _to_mask(row_ids: Iterable[int], nbits: int) -> int:
+    # Satır listesinden bitmap; büyük int'e tek tek OR yapmak her adımda O(n) kopya üretir
+    buf = bytearray((nbits + 7) // 8)
+    for i in row_ids:
+        buf[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(buf, "little")
+
+
+def _merge_masks(masks: Dict[str, int], postings: Dict[str, List[int]], nbits: int, base: int) -> None:
+    for key, ids in postings.items():
+        masks[key] = masks.get(key, 0) | (_to_mask(ids, nbits) << base)
+
+
+class TenderIndex:
+    def __init__(self, tenders: Iterable[Dict[str, Any]] = (), prefix_cache_size: int = 256):
+        # Satırlar sütun tabanlı tutulur; select yalnızca dönen sayfayı dict'e çevirir
+        self.rows = TenderBatch()
+        self.n = 0
+        self.all_mask = 0
+        self._keys = set()
+        self._type_masks: Dict[str, int] = {}
+        self._province_masks: Dict[str, int] = {}
+        self._day_masks: Dict[str, int] = {}
+        self._days: List[str] = []
+        self._undated_mask = 0
+        self._doc_mask = 0
+        self._token_masks: Dict[str, int] = {}
+        self._token_rows: Dict[str, List[int]] = {}
+        self._vocab: List[str] = []
+        self._vocab_dirty = False
+        self._prefix_cache: "OrderedDict[str, int]" = OrderedDict()
+        self._prefix_cache_size = prefix_cache_size
+        self.add(tenders)
+
+    def add(self, tenders: Iterable[Dict[str, Any]]) -> int:
+        """Yeni satırları ekler (İKN'ye göre tekrarlar atlanır), eklenen satır sayısını döner."""
+        base = self.n
+        type_rows: Dict[str, List[int]] = {}
+        province_rows: Dict[str, List[int]] = {}
+        day_rows: Dict[str, List[int]] = {}
+        undated: List[int] = []
+        doc_rows: List[int] = []
+        token_rows: Dict[str, List[int]] = {}
+
+        # Bu partideki satırlar için göreli numaralar (0..k-1); sonra base kadar kaydırılır
+        k = 0
+        for t in tenders:
+            key = tender_key(t)
+            if key in self._keys:
+                continue
+            self._keys.add(key)
+            self.rows.append(t)
+            type_rows.setdefault((t.get("type") or "").strip(), []).append(k)
+            province_rows.setdefault((t.get("province") or "").strip(), []).append(k)
+            day = tender_iso_date(t.get("tender_datetime"))
+            if day:
+                day_rows.setdefault(day, []).append(k)
+            else:
+                undated.append(k)
+            if t.get("document_url"):
+                doc_rows.append(k)
+            key = t.get("search_key")
+            if key is None:
+                key = tender_search_keys(t)["search_key"]
+            for token in set(_TOKEN_RE.findall(key)):
+                token_rows.setdefault(token, []).append(k)
+            k += 1
+
+        if not k:
+            return 0
+
+        self.n += k
+        self.all_mask = (1 << self.n) - 1
+        _merge_masks(self._type_masks, type_rows, k, base)
+        _merge_masks(self._province_masks, province_rows, k, base)
+        _merge_masks(self._day_masks, day_rows, k, base)
+        self._undated_mask |= _to_mask(undated, k) << base
+        self._doc_mask |= _to_mask(doc_rows, k) << base
+        if any(day not in self._days for day in day_rows):
+            self._days = sorted(self._day_masks)
+
+        for token, ids in token_rows.items():
+            if token in self._token_masks:
+                self._token_masks[token] |= _to_mask(ids, k) << base
+                continue
+            existing = self._token_rows.get(token)
+            if existing is None:
+                existing = self._token_rows[token] = []
+                self._vocab_dirty = True
+            existing.extend(base + i for i in ids)
+            if len(existing) >= _BITMAP_MIN_ROWS:
+                self._token_masks[token] = _to_mask(existing, self.n)
+                del self._token_rows[token]
+
+        self._prefix_cache.clear()
+        return k
+
+    def _prefix_mask(self, prefix: str) -> int:
+        mask = self._prefix_cache.get(prefix)
+        if mask is not None:
+            self._prefix_cache.move_to_end(prefix)
+            return mask
+
+        if self._vocab_dirty:
+            self._vocab = sorted(self._token_masks.keys() | self._token_rows.keys())
+            self._vocab_dirty = False
+
+        mask = 0
+        rare: List[int] = []
+        vocab = self._vocab
+        i = bisect_left(vocab, prefix)
+        while i < len(vocab) and vocab[i].startswith(prefix):
+            token = vocab[i]
+            if token in self._token_masks:
+                mask |= self._token_masks[token]
+            else:
+                rare.extend(self._token_rows[token])
+            i += 1
+        if rare:
+            mask |= _to_mask(rare, self.n)
+
+        self._prefix_cache[prefix] = mask
+        if len(self._prefix_cache) > self._prefix_cache_size:
+            self._prefix_cache.popitem(last=False)
+        return mask
+
+    def _date_mask(self, date_start: str, date_end: str) -> int:
+        lo = bisect_left(self._days, date_start) if date_start else 0
+        hi = bisect_right(self._days, date_end) if date_end else len(self._days)
+        mask = 0
+        for day in self._days[lo:hi]:
+            mask |= self._day_masks[day]
+        # Arayüzle aynı: tarihi olmayan satırlar tarih filtresinden elenmez
+        return mask | self._undated_mask
+
+    def filter(
+        self,
+        text: str = "",
+        tender_type: str = "",
+        province: str = "",
+        date_start: str = "",
+        date_end: str = "",
+        document: str = "",
+    ) -> int:
+        mask = self.all_mask
+        if tender_type:
+            mask &= self._type_masks.get(tender_type, 0)
+        if province:
+            mask &= self._province_masks.get(province, 0)
+        if document == "yes":
+            mask &= self._doc_mask
+        elif document == "no":
+            mask &= ~self._doc_mask
+        if date_start or date_end:
+            mask &= self._date_mask(date_start, date_end)
+        for token in tokenize(text):
+            if not mask:
+                break
+            mask &= self._prefix_mask(token)
+        return mask
+
+    def select(self, mask: int, offset: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+        if not mask or limit <= 0:
+            return []
+        # En düşük bit ilk satır; ters çevrilmiş ikili gösterimde str.find ile ilerlenir
+        bits = format(mask, "b")[::-1]
+        out: List[Dict[str, Any]] = []
+        pos = bits.find("1")
+        skipped = 0
+        while pos != -1 and len(out) < limit:
+            if skipped < offset:
+                skipped += 1
+            else:
+                out.append(self.rows.row(pos))
+            pos = bits.find("1", pos + 1)
+        return out
+
+    def facets(self) -> Dict[str, List[str]]:
+        return {
+            "types": sorted(k for k in self._type_masks if k),
+            "provinces": sorted(k for k in self._province_masks if k),
+        }
+
+
+class ResultSetRegistry:
+    """
+    Sorgu başına (limit/skip hariç kanonik argümanlar) getirilen tüm sayfaların
+    birleşimini indeksli olarak tutar. LRU ile sınırlıdır.
+    """
+
+    def __init__(self, max_sets: int = 32):
+        self.max_sets = max_sets
+        self._sets: "OrderedDict[str, TenderIndex]" = OrderedDict()
+
+    def add(self, result_id: str, tenders: Iterable[Dict[str, Any]]) -> None:
+        index = self._sets.get(result_id)
+        if index is None:
+            index = self._sets[result_id] = TenderIndex()
+        index.add(tenders)
+        self._sets.move_to_end(result_id)
+        while len(self._sets) > self.max_sets:
+            self._sets.popitem(last=False)
+
+    def index(self, result_id: str) -> Optional[TenderIndex]:
+        index = self._sets.get(result_id)
+        if index is not None:
+            self._sets.move_to_end(result_id)
+        return index
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sets": len(self._sets),
+            "max_sets": self.max_sets,
+            "rows": sum(index.n for index in self._sets.values()),
+        }
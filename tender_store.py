@@ -0,0 +1,347 @@
+"""
+Yerel SQLite ihale deposu.
+
+İki veri yolunu (app.py'deki MCP aramaları ve ekap.py'deki Playwright scraper'ı)
+İKN anahtarlı tek bir tabloda birleştirir. İhale adı ve idare için FTS5 indeksi
+vardır; Türkçe karakter farklarından etkilenmemek için FTS'e ASCII'ye katlanmış
+metin yazılır ("çağrı" ve "CAGRI" aynı kelimedir).
+
+coverage tablosu, ihale tarihi bakımından eksiksiz alındığı bilinen gün aralıklarını
+ve ne zaman alındıklarını tutar. İstenen tarih penceresi yeterince taze aralıklarla
+kesintisiz örtülüyorsa sorgu uzak MCP sunucusuna gitmeden yerelden cevaplanabilir;
+eskiyen aralıklar sonradan ilan edilen ihaleleri ve durum değişikliklerini kaçırır.
+"""
+
+import re
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from query_parser import province_code, tender_type_code
+from tender_index import tender_iso_date, tender_search_keys
+from turkish import ascii_fold
+
+# FTS5'in unicode61 tokenizer'ı harf/rakam dışındaki her karakterde böler; sorgu da aynı
+# şekilde bölünür ki "hizmet-alımı" ve "2024/123" düşmeden iki ayrı kelime olarak aransın
+_FTS_TOKEN_RE = re.compile(r"[^\W_]+")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tenders (
+    ikn TEXT PRIMARY KEY,
+    tender_id INTEGER,
+    name TEXT,
+    type TEXT,
+    type_code INTEGER,
+    status TEXT,
+    authority TEXT,
+    province TEXT,
+    province_code INTEGER,
+    tender_date TEXT,
+    tender_datetime TEXT,
+    document_url TEXT,
+    participation TEXT,
+    source TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tenders_date ON tenders(tender_date);
+CREATE INDEX IF NOT EXISTS idx_tenders_province_date ON tenders(province_code, tender_date);
+CREATE INDEX IF NOT EXISTS idx_tenders_type_date ON tenders(type_code, tender_date);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS tenders_fts USING fts5(name, authority);
+
+CREATE TABLE IF NOT EXISTS coverage (
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+_MERGED_COLUMNS = (
+    "tender_id", "name", "type", "type_code", "status", "authority", "province",
+    "province_code", "tender_date", "tender_datetime", "document_url", "participation",
+)
+
+# Mevcut değer yeni kayıtta yoksa (ör. EKAP'ta idare/doküman bilgisi yok) korunur.
+# EKAP kaydı MCP'nin ad/tür/durum alanlarını ezmez, yalnızca boş alanları doldurur.
+_UPSERT_SQL = """
+INSERT INTO tenders (
+    ikn, tender_id, name, type, type_code, status, authority, province, province_code,
+    tender_date, tender_datetime, document_url, participation, source, updated_at
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(ikn) DO UPDATE SET
+""" + "".join(
+    f"    {col} = CASE WHEN excluded.source = 'ekap' THEN COALESCE(tenders.{col}, excluded.{col})"
+    f" ELSE COALESCE(excluded.{col}, tenders.{col}) END,\n"
+    for col in _MERGED_COLUMNS
+) + """    source = CASE WHEN excluded.source = 'ekap' THEN tenders.source ELSE excluded.source END,
+    updated_at = excluded.updated_at
+"""
+
+_OUTPUT_COLUMNS = "tender_id, ikn, name, type, status, authority, province, tender_datetime, document_url"
+
+
+def _blank_to_none(value: Any) -> Any:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    return value
+
+
+class TenderStore:
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._migrate()
+        self.local_queries = 0
+
+    def _migrate(self) -> None:
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(tenders)")}
+        if "participation" not in columns:
+            # Eski depolarda EKAP'ın katılım durumu status sütununa yazılıyordu
+            with self._conn:
+                self._conn.execute("ALTER TABLE tenders ADD COLUMN participation TEXT")
+                self._conn.execute("UPDATE tenders SET participation = status, status = NULL WHERE source = 'ekap'")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # --- Yazma ---
+
+    def _upsert_rows(self, rows: Iterable[Tuple[Any, ...]]) -> int:
+        count = 0
+        now = datetime.now().isoformat(timespec="seconds")
+        with self._lock, self._conn:
+            for row in rows:
+                ikn = row[0]
+                if not ikn:
+                    continue
+                self._conn.execute(_UPSERT_SQL, row + (now,))
+                stored = self._conn.execute(
+                    "SELECT rowid, name, authority FROM tenders WHERE ikn = ?", (ikn,)
+                ).fetchone()
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO tenders_fts(rowid, name, authority) VALUES (?, ?, ?)",
+                    (stored["rowid"], ascii_fold(stored["name"] or ""), ascii_fold(stored["authority"] or "")),
+                )
+                count += 1
+        return count
+
+    def upsert_tenders(self, tenders: Iterable[Dict[str, Any]], source: str = "mcp") -> int:
+        """normalize_tender_item çıktısını yazar."""
+
+        def rows():
+            for t in tenders:
+                tender_type = _blank_to_none(t.get("type"))
+                province = _blank_to_none(t.get("province"))
+                tender_datetime = _blank_to_none(t.get("tender_datetime"))
+                yield (
+                    _blank_to_none(t.get("ikn")),
+                    t.get("id"),
+                    _blank_to_none(t.get("name")),
+                    tender_type,
+                    tender_type_code(tender_type) if tender_type else None,
+                    _blank_to_none(t.get("status")),
+                    _blank_to_none(t.get("authority")),
+                    province,
+                    province_code(province) if province else None,
+                    tender_iso_date(tender_datetime) or None,
+                    tender_datetime,
+                    _blank_to_none(t.get("document_url")),
+                    None,
+                    source,
+                )
+
+        return self._upsert_rows(rows())
+
+    def upsert_dataframe(self, df) -> int:
+        """ekap.process_data çıktısını (ikn, ihale, ihale_turu, il, tarih, katilim_durumu[, idare]) yazar."""
+
+        def rows():
+            for rec in df.to_dict("records"):
+                tarih = rec.get("tarih")
+                # pandas NaT da datetime alt sınıfıdır ama strftime desteklemez
+                if isinstance(tarih, datetime) and tarih == tarih:
+                    tender_date = tarih.strftime("%Y-%m-%d")
+                    tender_datetime = tarih.strftime("%d.%m.%Y %H:%M")
+                else:
+                    tender_date = tender_datetime = None
+                tender_type = _blank_to_none(rec.get("ihale_turu"))
+                province = _blank_to_none(rec.get("il"))
+                yield (
+                    _blank_to_none(rec.get("ikn")),
+                    None,
+                    _blank_to_none(rec.get("ihale")),
+                    tender_type,
+                    tender_type_code(tender_type) if tender_type else None,
+                    # "Açık İhale, Katılıma Açık" MCP'nin durum sözlüğünden farklıdır
+                    None,
+                    # idare yalnızca capture modunda gelir
+                    _blank_to_none(rec.get("idare")),
+                    province,
+                    province_code(province) if province else None,
+                    tender_date,
+                    tender_datetime,
+                    None,
+                    _blank_to_none(rec.get("katilim_durumu")),
+                    "ekap",
+                )
+
+        return self._upsert_rows(rows())
+
+    def record_coverage(self, start_date: str, end_date: str) -> None:
+        """
+        [start_date, end_date] ihale günlerinin tamamının şu an depoda olduğunu kaydeder.
+        Yeni aralığın içinde kalan eski kayıtlar silinir; kısmen örtüşenler kendi
+        zamanlarıyla kalır, böylece eski bir aralık yenisiyle birleşip tazelenmiş sayılmaz.
+        """
+        now = datetime.now().isoformat(timespec="seconds")
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM coverage WHERE start_date >= ? AND end_date <= ?",
+                (start_date, end_date),
+            )
+            self._conn.execute(
+                "INSERT INTO coverage (start_date, end_date, updated_at) VALUES (?, ?, ?)",
+                (start_date, end_date, now),
+            )
+
+    # --- Okuma ---
+
+    @staticmethod
+    def requested_window(args: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+        """
+        Yerelden cevaplanabilecek argümanlar için ihale tarihi penceresini döner.
+        İlan tarihi ve İKN filtreleri depoda tutulmadığından bu sorgular hep uzağa gider.
+        """
+        if args.get("announcement_date_filter") or args.get("ikn_year") or args.get("ikn_number"):
+            return None
+        if args.get("tender_date_filter") != "date_range":
+            return None
+        start, end = args.get("tender_date_start"), args.get("tender_date_end")
+        if not start or not end:
+            return None
+        return start, end
+
+    def covers(self, args: Dict[str, Any], max_age: float) -> bool:
+        """İstenen pencere son max_age saniyede kaydedilmiş aralıklarla boşluksuz örtülüyor mu."""
+        window = self.requested_window(args)
+        if window is None:
+            return False
+        start, end = window
+        cutoff = (datetime.now() - timedelta(seconds=max_age)).isoformat(timespec="seconds")
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT start_date, end_date FROM coverage "
+                "WHERE updated_at >= ? AND start_date <= ? AND end_date >= ? ORDER BY start_date",
+                (cutoff, end, start),
+            ).fetchall()
+        # Aralıklar bitişik ya da örtüşük olarak start'tan end'e kadar zincirlenmeli
+        reached = date.fromisoformat(start) - timedelta(days=1)
+        for row in rows:
+            if date.fromisoformat(row["start_date"]) > reached + timedelta(days=1):
+                return False
+            reached = max(reached, date.fromisoformat(row["end_date"]))
+            if reached >= date.fromisoformat(end):
+                return True
+        return False
+
+    def query(self, args: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """normalize_mcp_arguments çıktısını SQL'e çevirir; sonuçlar normalize_tender_item biçimindedir."""
+        window = self.requested_window(args)
+        where = []
+        params: List[Any] = []
+        if window:
+            where.append("t.tender_date BETWEEN ? AND ?")
+            params.extend(window)
+        if args.get("provinces"):
+            where.append(f"t.province_code IN ({','.join('?' * len(args['provinces']))})")
+            params.extend(args["provinces"])
+        if args.get("tender_types"):
+            where.append(f"t.type_code IN ({','.join('?' * len(args['tender_types']))})")
+            params.extend(args["tender_types"])
+
+        search_tokens = _FTS_TOKEN_RE.findall(ascii_fold(args.get("search_text") or ""))
+        if search_tokens:
+            where.append("t.rowid IN (SELECT rowid FROM tenders_fts WHERE tenders_fts MATCH ?)")
+            params.append(" ".join(f'"{tok}"*' for tok in search_tokens))
+
+        sql = f"SELECT {_OUTPUT_COLUMNS} FROM tenders t"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY t.tender_date, t.tender_datetime, t.ikn LIMIT ? OFFSET ?"
+        params.extend([int(args.get("limit") or 100), int(args.get("skip") or 0)])
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+            self.local_queries += 1
+
+        tenders = [
+            {
+                "id": r["tender_id"],
+                "ikn": r["ikn"],
+                "name": r["name"] or "",
+                "type": r["type"] or "",
+                "status": r["status"] or "",
+                "authority": r["authority"] or "",
+                "province": r["province"] or "",
+                "tender_datetime": r["tender_datetime"] or "",
+                "document_url": r["document_url"],
+            }
+            for r in rows
+        ]
+        for t in tenders:
+            t.update(tender_search_keys(t))
+        return tenders
+
+    def known_ikns(self, ikns: Iterable[str]) -> set:
+        ikns = [ikn for ikn in ikns if ikn]
+        if not ikns:
+            return set()
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT ikn FROM tenders WHERE ikn IN ({','.join('?' * len(ikns))})", ikns
+            ).fetchall()
+        return {r["ikn"] for r in rows}
+
+    # --- Durum ---
+
+    def get_state(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+    def set_state(self, key: str, value: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO sync_state (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (key, value),
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM tenders").fetchone()[0]
+            windows = [
+                {"start": r["start_date"], "end": r["end_date"], "updated_at": r["updated_at"]}
+                for r in self._conn.execute("SELECT start_date, end_date, updated_at FROM coverage ORDER BY start_date")
+            ]
+        return {
+            "path": self.path,
+            "tenders": count,
+            "coverage": windows,
+            "local_queries": self.local_queries,
+        }
@@ -0,0 +1,39 @@
+"""
+Türkçe metin yardımcıları.
+
+Python'un str.lower() fonksiyonu "I" harfini "i" yapar ve "İ" harfini "i̇"
+(noktalı birleşik karakter) olarak bırakır; Türkçe için doğru değildir.
+"""
+
+import re
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def turkish_lower(text: str) -> str:
+    if not text:
+        return ""
+    return text.replace("İ", "i").replace("I", "ı").lower()
+
+
+def normalize_query_text(text: str) -> str:
+    """Sorguyu cache anahtarı olarak kullanılabilir hale getirir (küçük harf, tek boşluk)."""
+    return _WHITESPACE_RE.sub(" ", turkish_lower(text)).strip()
+
+
+# str.translate dict tablosuyla karakter başına arama yapar; birkaç str.replace çok daha hızlı
+_ASCII_FOLD_PAIRS = (
+    ("ç", "c"), ("ğ", "g"), ("ı", "i"), ("ö", "o"), ("ş", "s"), ("ü", "u"),
+    ("â", "a"), ("î", "i"), ("û", "u"),
+)
+
+
+def ascii_fold(text: str) -> str:
+    """Türkçe küçük harfe çevirip aksanları atar: "ÇAĞRI" -> "cagri"."""
+    text = turkish_lower(text)
+    if text.isascii():
+        return text
+    for src, dst in _ASCII_FOLD_PAIRS:
+        if src in text:
+            text = text.replace(src, dst)
+    return text